@@ -4,19 +4,34 @@
 # EXERCISE : intro2cs1 ex10 2021
 # DESCRIPTION: Apple class for the ex10 game.
 ##########################################################################################
-from typing import Tuple
-from game_parameters import get_random_apple_data
+import random
+from typing import Tuple, Optional
+from game_parameters import get_random_apple_data, GameConfig
 
 
 class Apple:
     """
     Class that represents an apple.
     """
-    def __init__(self):
+    def __init__(self, rng: Optional[random.Random] = None, config: Optional[GameConfig] = None):
         """
         Constructor fo the Apple class.
+        :param rng: The random generator the apple's data is drawn from, the random module if None.
+        :param config: The parameters of the game, the default parameters if None.
         """
-        self.__x, self.__y, self.__score = get_random_apple_data()
+        self.__x, self.__y, self.__score = get_random_apple_data(rng or random, config)
+
+    @staticmethod
+    def from_data(position: Tuple[int, int], score: int) -> 'Apple':
+        """
+        Creates an apple in a given state.
+        :param position: The x,y coordinates of the apple.
+        :param score: The score of the apple.
+        :return: The new Apple.
+        """
+        apple = Apple.__new__(Apple)
+        (apple.__x, apple.__y), apple.__score = position, score
+        return apple
 
     def apple_position(self) -> Tuple[int, int]:
         """
@@ -24,6 +39,14 @@ class Apple:
         """
         return self.__x, self.__y
 
+    def relocate(self, position: Tuple[int, int]) -> None:
+        """
+        Moves the apple to a different position, keeping its score.
+        :param position: The new x,y coordinates of the apple.
+        :return: None.
+        """
+        self.__x, self.__y = position
+
     @property
     def score(self) -> int:
         return self.__score
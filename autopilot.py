@@ -0,0 +1,189 @@
+##########################################################################################
+# FILE : autopilot.py
+# WRITER : Yonatan Zhenin , Yonatanzh , 208623397, Yahel Uffenheimer, yahelo, 318377751
+# EXERCISE : intro2cs1 ex10 2021
+# DESCRIPTION: Agent that plays the game by following a distance field of the apples.
+##########################################################################################
+from array import array
+from collections import deque
+from typing import Optional, Tuple, List, Deque, Any, Set
+
+from bomb import Bomb, ring_offsets
+from game_manager import GameManager, SNAKE_CELL, BOMB_CELL
+from snake import MOVEMENT_DELTAS, ALLOWED_TURNS
+
+DEFAULT_BUDGET = 2000
+DEFAULT_FIELD_RADIUS = 64
+EXPANSION_CHUNK = 64
+FREE_SPACE_BUDGET = 256
+UNKNOWN_DISTANCE = -1
+
+
+def is_hit_next_tick(bomb: Bomb, position: Tuple[int, int]) -> bool:
+    """
+    Checks if the bomb or its shock wave will be at a position after the next tick.
+    :param bomb: The bomb.
+    :param position: The position to check.
+    :return: True if the position will be hit, False other-wise.
+    """
+    time = bomb.time - 1
+    distance = abs(position[0] - bomb.position[0]) + abs(position[1] - bomb.position[1])
+    if time > 0:
+        return distance == 0
+    return distance == -time <= bomb.radius
+
+
+class Autopilot:
+    """
+    Agent that heads for the apples and avoids the snake, the bomb and its shock wave.
+    The distance field is a breadth first search from the apples, up to field_radius cells away, around the whole
+    area the shock wave of the bomb will cover. It doesn't depend on the snake, so it's kept between ticks until an
+    apple or the bomb changes. Every call expands it by at most budget cells, so a decision never takes long even on
+    large boards. Where the field hasn't reached, the snake heads straight for the closest apple. A move is avoided if
+fewer cells than the length of the snake, or than FREE_SPACE_BUDGET, can be reached from it.
+    """
+    def __init__(self, budget: int = DEFAULT_BUDGET, field_radius: int = DEFAULT_FIELD_RADIUS):
+        """
+        Constructor for the Autopilot class.
+        :param budget: The maximum amount of cells the distance field is expanded by in a single tick.
+        :param field_radius: The maximum distance from an apple the distance field covers.
+        """
+        self.__budget = budget
+        self.__field_radius = field_radius
+        self.__field_key: Optional[Tuple[Any, ...]] = None
+        self.__distances = array('i')
+        self.__known_cells: List[int] = []
+        self.__frontier: Deque[int] = deque()
+        self.__width, self.__height = 0, 0
+        self.__blast = (0, 0, -1)
+        self.__blasted_cells: Set[int] = set()
+
+    def __reset_field(self, game: GameManager) -> None:
+        """
+        Starts a new distance field if the apples or the bomb have changed since it was created. The distances are
+        kept in the same array as long as the size of the board doesn't change, only the cells that were reached are
+        cleared.
+        :param game: The game being played.
+        :return: None.
+        """
+        bomb = game.bomb
+        key = (game.config, tuple(game.apple_positions), bomb.position, bomb.radius)
+        if key == self.__field_key:
+            return None
+        self.__field_key = key
+        self.__width, self.__height = game.config.width, game.config.height
+        self.__blast = (bomb.position[0], bomb.position[1], bomb.radius)
+        self.__blasted_cells = {
+            (bomb.position[1] + dy) * self.__width + bomb.position[0] + dx
+            for radius in range(bomb.radius + 1) for dx, dy in ring_offsets(radius)
+            if self.__is_in_board((bomb.position[0] + dx, bomb.position[1] + dy))}
+        if len(self.__distances) == self.__width * self.__height:
+            for cell in self.__known_cells:
+                self.__distances[cell] = UNKNOWN_DISTANCE
+        else:
+            self.__distances = array('i', [UNKNOWN_DISTANCE]) * (self.__width * self.__height)
+        self.__known_cells = []
+        self.__frontier = deque()
+        for position in game.apple_positions:
+            cell = position[1] * self.__width + position[0]
+            if not self.__is_blasted(position) and self.__distances[cell] == UNKNOWN_DISTANCE:
+                self.__distances[cell] = 0
+                self.__frontier.append(cell)
+                self.__known_cells.append(cell)
+        return None
+
+    def __is_in_board(self, position: Tuple[int, int]) -> bool:
+        """
+        :param position: Position to be checked.
+        :return: True if the position is in the bounds of the board of the field, False other-wise.
+        """
+        return 0 <= position[0] < self.__width and 0 <= position[1] < self.__height
+
+    def __is_blasted(self, position: Tuple[int, int]) -> bool:
+        """
+        :param position: Position on the board.
+        :return: True if the shock wave of the bomb will reach the position, False other-wise.
+        """
+        bx, by, radius = self.__blast
+        return abs(position[0] - bx) + abs(position[1] - by) <= radius
+
+    def __expand_field(self, targets: List[int]) -> None:
+        """
+        Continues the breadth first search of the distance field until the distances of all the targets are known,
+        the whole board is covered or the budget runs out.
+        :param targets: Cells whose distance is needed.
+        :return: None.
+        """
+        distances, frontier, width, known_cells = self.__distances, self.__frontier, self.__width, self.__known_cells
+        cells, blasted_cells, field_radius = len(distances), self.__blasted_cells, self.__field_radius
+        budget = self.__budget
+        while frontier and budget > 0 and any(distances[target] == UNKNOWN_DISTANCE for target in targets):
+            for _ in range(min(EXPANSION_CHUNK, len(frontier), budget)):
+                cell = frontier.popleft()
+                distance = distances[cell] + 1
+                if distance > field_radius:
+                    frontier.clear()
+                    break
+                x = cell % width
+                for neighbour in (cell - 1 if x > 0 else -1, cell + 1 if x < width - 1 else -1,
+                                  cell - width, cell + width):
+                    if 0 <= neighbour < cells and distances[neighbour] == UNKNOWN_DISTANCE and \
+                            neighbour not in blasted_cells:
+                        distances[neighbour] = distance
+                        frontier.append(neighbour)
+                        known_cells.append(neighbour)
+            budget -= EXPANSION_CHUNK
+
+    @staticmethod
+    def __free_space(game: GameManager, position: Tuple[int, int], limit: int) -> int:
+        """
+        Counts the cells that can be reached from a position without crossing the snake or the bomb.
+        :param game: The game being played.
+        :param position: The position to start from.
+        :param limit: The count stops once it reaches this amount.
+        :return: The amount of cells reached, at most limit.
+        """
+        width, height = game.config.width, game.config.height
+        seen = {position}
+        queue = [position]
+        for x, y in queue:
+            if len(seen) >= limit:
+                break
+            for neighbour in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                if neighbour not in seen and 0 <= neighbour[0] < width and 0 <= neighbour[1] < height and \
+                        not game.occupant(neighbour) & (SNAKE_CELL | BOMB_CELL):
+                    seen.add(neighbour)
+                    queue.append(neighbour)
+        return min(len(seen), limit)
+
+    def __call__(self, game: GameManager) -> Optional[str]:
+        """
+        Chooses the key to press this tick.
+        :param game: The game being played.
+        :return: The direction of the safe move that leads to the closest apple, None if there is no safe move.
+        """
+        self.__reset_field(game)
+        width = self.__width
+        x, y = game.head
+        moves = []
+        for direction in ALLOWED_TURNS[game.direction]:
+            dx, dy = MOVEMENT_DELTAS[direction]
+            position = (x + dx, y + dy)
+            if self.__is_in_board(position) and not game.occupant(position) & SNAKE_CELL and \
+                    not is_hit_next_tick(game.bomb, position):
+                moves.append((direction, position))
+        self.__expand_field([p[1] * width + p[0] for _, p in moves if not self.__is_blasted(p)])
+        limit = min(game.length, FREE_SPACE_BUDGET)
+
+        best_direction, best_key = None, None
+        for direction, position in moves:
+            is_trapped = self.__free_space(game, position, limit) < limit
+            distance = self.__distances[position[1] * width + position[0]]
+            is_unknown = distance == UNKNOWN_DISTANCE
+            if is_unknown:
+                distance = min((abs(position[0] - ax) + abs(position[1] - ay) for ax, ay in game.apple_positions),
+                               default=0)
+            key = (is_trapped, self.__is_blasted(position), is_unknown, distance)
+            if best_key is None or key < best_key:
+                best_direction, best_key = direction, key
+        return best_direction
@@ -0,0 +1,300 @@
+##########################################################################################
+# FILE : batch_engine.py
+# WRITER : Yonatan Zhenin , Yonatanzh , 208623397, Yahel Uffenheimer, yahelo, 318377751
+# EXERCISE : intro2cs1 ex10 2021
+# DESCRIPTION: A NumPy engine that plays many games of the ex10 game in lockstep.
+##########################################################################################
+from typing import Optional, Tuple, List
+
+import numpy as np
+
+from game_parameters import GameConfig, DEFAULT_CONFIG
+from bomb import ring_offsets
+from game_manager import EMPTY_CELL, SNAKE_CELL, APPLE_CELL, BOMB_CELL, DeathCause
+
+DIRECTIONS = ('Up', 'Down', 'Left', 'Right')
+NO_ACTION = -1
+DELTA_X = np.array([0, 0, -1, 1])
+DELTA_Y = np.array([1, -1, 0, 0])
+
+DEATH_CAUSES: Tuple[Optional[DeathCause], ...] = (
+    None, 'out_of_bounds', 'bomb', 'shock_wave', 'self_collision', 'board_full')
+ALIVE, OUT_OF_BOUNDS, BOMB, SHOCK_WAVE, SELF_COLLISION, BOARD_FULL = range(len(DEATH_CAUSES))
+
+NOT_SNAKE = np.uint8(~SNAKE_CELL & 0xFF)
+NOT_APPLE = np.uint8(~APPLE_CELL & 0xFF)
+NOT_BOMB = np.uint8(~BOMB_CELL & 0xFF)
+
+
+def _ring_templates(max_radius: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Creates the offsets of every shock wave ring up to max_radius, padded to the size of the largest ring.
+    Radius 0 is the bomb itself.
+    :param max_radius: The largest shock wave radius.
+    :return: x offsets, y offsets and a mask of the valid offsets, each of shape (max_radius + 1, 4 * max_radius).
+    """
+    size = 4 * max_radius
+    offsets_x = np.zeros((max_radius + 1, size), dtype=np.int32)
+    offsets_y = np.zeros((max_radius + 1, size), dtype=np.int32)
+    mask = np.zeros((max_radius + 1, size), dtype=bool)
+    for r in range(max_radius + 1):
+        ring = ring_offsets(r)
+        offsets_x[r, :len(ring)] = [x for x, _ in ring]
+        offsets_y[r, :len(ring)] = [y for _, y in ring]
+        mask[r, :len(ring)] = True
+    return offsets_x, offsets_y, mask
+
+
+class BatchGameManager:
+    """
+    Plays number_of_games games in lockstep, following the same rules as GameManager. The state of every game is
+    kept in NumPy arrays, indexed by the game number in the first axis. Cells are numbered y * width + x.
+    """
+    def __init__(self, number_of_games: int, seed: Optional[int] = None, config: Optional[GameConfig] = None):
+        """
+        Constructor for the class, starts all games.
+        :param number_of_games: The amount of games to play.
+        :param seed: Seed for the random generator of the games, None for an unpredictable seed.
+        :param config: The parameters of the games, DEFAULT_CONFIG if None.
+        """
+        self.config = config or DEFAULT_CONFIG
+        self.__width, self.__height = self.config.width, self.config.height
+        n, cells = number_of_games, self.__width * self.__height
+        self.__rng = np.random.default_rng(seed)
+        self.__capacity = cells + 1
+        self.__wave_x, self.__wave_y, self.__wave_mask = _ring_templates(self.config.bomb_radius_range[1])
+        wave_size = self.__wave_mask.shape[1]
+
+        self.boards = np.zeros((n, cells), dtype=np.uint8)
+        self.snakes = np.zeros((n, self.__capacity), dtype=np.int32)
+        self.tails = np.zeros(n, dtype=np.int32)
+        self.lengths = np.zeros(n, dtype=np.int32)
+        self.target_lengths = np.zeros(n, dtype=np.int32)
+        self.directions = np.zeros(n, dtype=np.int8)
+        self.apples = np.full((n, self.config.number_of_apples), -1, dtype=np.int32)
+        self.apple_scores = np.zeros((n, self.config.number_of_apples), dtype=np.int32)
+        self.bomb_x = np.zeros(n, dtype=np.int32)
+        self.bomb_y = np.zeros(n, dtype=np.int32)
+        self.bomb_radius = np.zeros(n, dtype=np.int32)
+        self.bomb_time = np.zeros(n, dtype=np.int32)
+        self.bomb_cells = np.zeros((n, wave_size), dtype=np.int32)
+        self.bomb_mask = np.zeros((n, wave_size), dtype=bool)
+        self.scores = np.zeros(n, dtype=np.int64)
+        self.alive = np.zeros(n, dtype=bool)
+        self.death_causes = np.zeros(n, dtype=np.int8)
+        self.reset()
+
+    def __len__(self) -> int:
+        return len(self.alive)
+
+    def reset(self, games: Optional[np.ndarray] = None) -> None:
+        """
+        Starts new games in place of the given ones.
+        :param games: Indices or boolean mask of the games to restart, None to restart all of them.
+        :return: None.
+        """
+        if games is None:
+            games = np.arange(len(self))
+        elif np.asarray(games).dtype == bool:
+            games = np.flatnonzero(games)
+        else:
+            games = np.asarray(games, dtype=np.intp)
+        if len(games) == 0:
+            return
+        self.boards[games] = EMPTY_CELL
+        x, y = self.config.initial_position
+        length = self.config.initial_length
+        initial_cells = (y + np.arange(length)) * self.__width + x
+        self.snakes[games, :length] = initial_cells
+        self.boards[games[:, None], initial_cells] |= SNAKE_CELL
+        self.tails[games] = 0
+        self.lengths[games] = length
+        self.target_lengths[games] = length
+        self.directions[games] = DIRECTIONS.index('Up')
+        self.apples[games] = -1
+        self.scores[games] = 0
+        self.alive[games] = True
+        self.death_causes[games] = ALIVE
+        self.bomb_mask[games] = False
+        self.__spawn_bombs(games)
+        self.__check_num_of_apples(games)
+
+    def __random_free_cell(self, game: int) -> int:
+        """
+        Picks a uniformly random empty cell of a single game.
+        :param game: Index of the game.
+        :return: The cell, or -1 if the board is full.
+        """
+        free = np.flatnonzero(self.boards[game] == EMPTY_CELL)
+        if len(free) == 0:
+            return -1
+        return int(free[self.__rng.integers(len(free))])
+
+    def __draw_cells(self, games: np.ndarray) -> np.ndarray:
+        """
+        Draws a random cell for every game, replacing occupied cells with a uniformly random empty cell. This has
+        the same distribution as redrawing until an empty cell is found.
+        :param games: Indices of the games.
+        :return: A cell for every game, -1 for games with a full board.
+        """
+        x = self.__rng.integers(0, self.__width, len(games))
+        y = self.__rng.integers(0, self.__height, len(games))
+        cells = (y * self.__width + x).astype(np.int32)
+        for i in np.flatnonzero(self.boards[games, cells] != EMPTY_CELL):
+            cells[i] = self.__random_free_cell(games[i])
+        return cells
+
+    def __update_bomb_positions(self, games: np.ndarray) -> np.ndarray:
+        """
+        Moves the bomb flags on the boards of the given games to the current bomb or shock wave positions.
+        :param games: Indices of the games.
+        :return: Boolean array, True for games whose shock wave has left the board.
+        """
+        old = self.bomb_mask[games]
+        rows = np.broadcast_to(games[:, None], old.shape)
+        self.boards[rows[old], self.bomb_cells[games][old]] &= NOT_BOMB
+
+        time, radius = self.bomb_time[games], self.bomb_radius[games]
+        finished = radius + time < 0
+        ring = np.clip(-time, 0, radius)
+        x = self.bomb_x[games, None] + self.__wave_x[ring]
+        y = self.bomb_y[games, None] + self.__wave_y[ring]
+        valid = self.__wave_mask[ring] & ~finished[:, None]
+        in_bounds = (x >= 0) & (x < self.__width) & (y >= 0) & (y < self.__height)
+        off_board = np.any(valid & ~in_bounds, axis=1)
+        mask = valid & in_bounds
+        cells = np.where(mask, y * self.__width + x, 0)
+        self.bomb_cells[games] = cells
+        self.bomb_mask[games] = mask
+        self.boards[rows[mask], cells[mask]] |= BOMB_CELL
+        return off_board
+
+    def __spawn_bombs(self, games: np.ndarray) -> None:
+        """
+        Replaces the bombs of the given games with new ones, placed on empty cells.
+        :param games: Indices of the games.
+        :return: None.
+        """
+        if len(games) == 0:
+            return
+        cells = self.__draw_cells(games)
+        radius_range, time_range = self.config.bomb_radius_range, self.config.bomb_time_range
+        self.bomb_x[games], self.bomb_y[games] = cells % self.__width, cells // self.__width
+        self.bomb_radius[games] = self.__rng.integers(radius_range[0], radius_range[1] + 1, len(games))
+        self.bomb_time[games] = self.__rng.integers(time_range[0], time_range[1] + 1, len(games))
+        full = cells < 0
+        self.bomb_time[games[full]] = -self.bomb_radius[games[full]] - 1
+        self.__update_bomb_positions(games)
+
+    def __check_num_of_apples(self, games: np.ndarray) -> None:
+        """
+        Removes apples that were hit by a shock wave and fills every empty apple slot with a new apple.
+        :param games: Indices of the games.
+        :return: None.
+        """
+        for slot in range(self.config.number_of_apples):
+            apples = self.apples[games, slot]
+            hit = (apples >= 0) & (self.boards[games, apples] & BOMB_CELL != 0)
+            self.boards[games[hit], apples[hit]] &= NOT_APPLE
+            self.apples[games[hit], slot] = -1
+        for slot in range(self.config.number_of_apples):
+            empty = games[self.apples[games, slot] < 0]
+            if len(empty) == 0:
+                continue
+            cells = self.__draw_cells(empty)
+            placed = cells >= 0
+            empty, cells = empty[placed], cells[placed]
+            self.apples[empty, slot] = cells
+            self.apple_scores[empty, slot] = self.__rng.integers(
+                self.config.apple_score_range[0], self.config.apple_score_range[1] + 1, len(empty))
+            self.boards[empty, cells] |= APPLE_CELL
+
+    def __eat_apples(self, games: np.ndarray, heads: np.ndarray) -> None:
+        """
+        Lets every snake that reached an apple eat it, enlarging it by the growth length and adding the apples score.
+        :param games: Indices of the games.
+        :param heads: The head cells of the snakes of the games.
+        :return: None.
+        """
+        eating = self.boards[games, heads] & APPLE_CELL != 0
+        games, heads = games[eating], heads[eating]
+        if len(games) == 0:
+            return
+        slots = np.argmax(self.apples[games] == heads[:, None], axis=1)
+        self.scores[games] += self.apple_scores[games, slots]
+        self.target_lengths[games] += self.config.growth_length
+        self.apples[games, slots] = -1
+        self.boards[games, heads] &= NOT_APPLE
+        self.__check_num_of_apples(games)
+
+    def step(self, actions: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Plays one tick of every game that is still alive, the same way GameManager.tick does.
+        :param actions: Index into DIRECTIONS of the key pressed in every game, NO_ACTION for no key. None if no key
+        was pressed in any game.
+        :return: Boolean array, True for the games that can be played another round.
+        """
+        games = np.flatnonzero(self.alive)
+        if actions is None:
+            actions = np.full(len(self), NO_ACTION)
+        actions = np.asarray(actions)[games]
+        directions = self.directions[games]
+        turning = (actions >= 0) & (actions < len(DIRECTIONS)) & ((actions ^ 1) != directions)
+        directions = np.where(turning, actions, directions).astype(np.int8)
+        self.directions[games] = directions
+
+        # move the snakes
+        capacity, width, height = self.__capacity, self.__width, self.__height
+        old_heads = self.snakes[games, (self.tails[games] + self.lengths[games] - 1) % capacity]
+        x = old_heads % width + DELTA_X[directions]
+        y = old_heads // width + DELTA_Y[directions]
+        out_of_bounds = (x < 0) | (x >= width) | (y < 0) | (y >= height)
+        heads = np.where(out_of_bounds, -1, y * width + x).astype(np.int32)
+        growing = self.lengths[games] < self.target_lengths[games]
+        moving = games[~growing]
+        self.boards[moving, self.snakes[moving, self.tails[moving]]] &= NOT_SNAKE
+        self.tails[moving] = (self.tails[moving] + 1) % capacity
+        self.lengths[games[growing]] += 1
+        self.snakes[games, (self.tails[games] + self.lengths[games] - 1) % capacity] = heads
+        inside, inside_heads = games[~out_of_bounds], heads[~out_of_bounds]
+        ate_himself = np.zeros(len(games), dtype=bool)
+        ate_himself[~out_of_bounds] = self.boards[inside, inside_heads] & SNAKE_CELL != 0
+        self.boards[inside, inside_heads] |= SNAKE_CELL
+
+        # tick the bombs
+        self.bomb_time[games] -= 1
+        off_board = self.__update_bomb_positions(games)
+        rows = np.broadcast_to(games[:, None], self.bomb_cells[games].shape)
+        hit = np.any(self.bomb_mask[games] & (self.boards[rows, self.bomb_cells[games]] & SNAKE_CELL != 0), axis=1)
+        exploding = self.bomb_time[games] <= 0
+
+        causes = np.select(
+            [out_of_bounds, hit & ~exploding, hit, ate_himself,
+             self.lengths[games] == width * height - self.config.minimum_length],
+            [OUT_OF_BOUNDS, BOMB, SHOCK_WAVE, SELF_COLLISION, BOARD_FULL], ALIVE)
+        self.death_causes[games] = causes
+        self.alive[games] = causes == ALIVE
+        survived = causes == ALIVE
+        games, heads, off_board = games[survived], heads[survived], off_board[survived]
+
+        self.__eat_apples(games, heads)
+        finished = self.bomb_radius[games] + self.bomb_time[games] < 0
+        self.__spawn_bombs(games[finished | off_board])
+        self.__check_num_of_apples(games)
+        return self.alive.copy()
+
+    def snake_positions(self, game: int) -> List[Tuple[int, int]]:
+        """
+        :param game: Index of the game.
+        :return: Returns a list of all the positions of the snake of a game, from the tail to the head.
+        """
+        indices = (self.tails[game] + np.arange(self.lengths[game])) % self.__capacity
+        return [(int(cell % self.__width), int(cell // self.__width)) for cell in self.snakes[game, indices]
+                if cell >= 0]
+
+    def death_cause(self, game: int) -> Optional[DeathCause]:
+        """
+        :param game: Index of the game.
+        :return: The reason the snake of the game died, None if it is alive.
+        """
+        return DEATH_CAUSES[self.death_causes[game]]
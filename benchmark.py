@@ -0,0 +1,395 @@
+##########################################################################################
+# FILE : benchmark.py
+# WRITER : Yonatan Zhenin , Yonatanzh , 208623397, Yahel Uffenheimer, yahelo, 318377751
+# EXERCISE : intro2cs1 ex10 2021
+# DESCRIPTION: Benchmarks of the hot paths of the game, with a baseline file to compare against.
+##########################################################################################
+import argparse
+import json
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple, Optional, Any
+
+from game_parameters import GameConfig
+from game_manager import GameManager
+from snake import Snake
+from bomb import Bomb
+from headless import serpentine_agent
+
+BASELINE_FILE = 'benchmark_baseline.json'
+DEFAULT_TOLERANCE = 0.25
+# the most a cold import of a module may take, the rules have to start fast for headless runs and tournaments.
+IMPORT_BUDGET_MS: Dict[str, float] = {
+    'game_manager': 60,
+    'headless': 60,
+    'snake_main': 80,
+}
+
+Result = Dict[str, float]
+
+
+class _ScriptedRandom:
+    """
+    Internal: random generator stand-in that returns preset values, used to create bombs with a given radius.
+    """
+    def __init__(self, values: List[int]):
+        self.__values = list(values)
+
+    def randint(self, a: int, b: int) -> int:
+        return self.__values.pop(0)
+
+
+class _StubCanvas:
+    """
+    Internal: canvas stand-in that only hands out item ids, used to benchmark GameDisplay without tkinter.
+    """
+    def __init__(self):
+        self.__next_id = 0
+
+    def create_rectangle(self, *args: Any, **kwargs: Any) -> int:
+        self.__next_id += 1
+        return self.__next_id
+
+    def delete(self, item: int) -> None:
+        pass
+
+    def itemconfigure(self, item: int, **kwargs: Any) -> None:
+        pass
+
+
+def _board_config(width: int, height: int, apples: int, initial_length: int) -> GameConfig:
+    """
+    Internal: creates the config of a benchmarked board. The snake starts at the bottom of the first column heading
+    up, so serpentine_agent keeps it alive.
+    :return: The config.
+    """
+    return GameConfig(width=width, height=height, number_of_apples=apples, initial_position=(0, 1),
+                      initial_length=initial_length)
+
+
+def measure(operation: Callable[[], Any], iterations: int, prepare: Optional[Callable[[], Any]] = None) -> Result:
+    """
+    Runs an operation several times and measures it.
+    :param operation: The operation to measure.
+    :param iterations: The amount of times to run the operation.
+    :param prepare: Called before every run of the operation, outside of the measured time and memory. None if
+    there's nothing to prepare.
+    :return: Dictionary with the operations per second, the 50th and 99th percentiles of the latency in
+    microseconds, and the mean peak of memory allocated by a single operation in bytes.
+    """
+    latencies = []
+    clock = time.perf_counter_ns
+    for _ in range(iterations):
+        if prepare is not None:
+            prepare()
+        start = clock()
+        operation()
+        latencies.append(clock() - start)
+    latencies.sort()
+
+    allocation_runs = max(1, iterations // 10)
+    tracemalloc.start()
+    allocated = 0
+    for _ in range(allocation_runs):
+        if prepare is not None:
+            prepare()
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        operation()
+        allocated += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+
+    return {
+        'ops_per_sec': 1e9 * len(latencies) / sum(latencies) if sum(latencies) else float('inf'),
+        'p50_us': latencies[len(latencies) // 2] / 1000,
+        'p99_us': latencies[min(len(latencies) - 1, len(latencies) * 99 // 100)] / 1000,
+        'alloc_bytes': allocated / allocation_runs,
+    }
+
+
+def bench_tick(width: int, height: int, snake_length: int, apples: int, iterations: int) -> Result:
+    """
+    Benchmarks GameManager.tick, with serpentine_agent choosing the keys. A new game is started whenever the snake
+    dies, outside of the measured time.
+    :return: The measurement.
+    """
+    config = _board_config(width, height, apples, snake_length)
+    games = [GameManager(0, config)]
+
+    def tick() -> None:
+        game = games[0]
+        game.tick(serpentine_agent(game))
+
+    def start_game() -> None:
+        if games[0].death_cause is not None:
+            games[0] = GameManager(games[0].seed + 1, config)
+    return measure(tick, iterations, start_game)
+
+
+def bench_fork(width: int, height: int, snake_length: int, iterations: int) -> Result:
+    """
+    Benchmarks GameManager.fork of a game that has been played for a while.
+    :return: The measurement.
+    """
+    game = GameManager(0, _board_config(width, height, 3, snake_length))
+    for _ in range(2 * snake_length):
+        game.tick(serpentine_agent(game))
+    return measure(game.fork, iterations)
+
+
+def bench_codec(width: int, height: int, snake_length: int, iterations: int, decode: bool) -> Result:
+    """
+    Benchmarks GameManager.encode, or GameManager.decode of its result, of a game that has been played for a while.
+    :return: The measurement.
+    """
+    game = GameManager(0, _board_config(width, height, 3, snake_length))
+    for _ in range(2 * snake_length):
+        game.tick(serpentine_agent(game))
+    data = game.encode()
+    return measure((lambda: GameManager.decode(data)) if decode else game.encode, iterations)
+
+
+def bench_snake_move(length: int, iterations: int) -> Result:
+    """
+    Benchmarks Snake.move of a snake that keeps its length.
+    :return: The measurement.
+    """
+    snake = Snake((0, 0), 'Up', length)
+    return measure(snake.move, iterations)
+
+
+def bench_snake_positions(length: int, iterations: int) -> Result:
+    """
+    Benchmarks Snake.snake_positions.
+    :return: The measurement.
+    """
+    snake = Snake((0, 0), 'Up', length)
+    return measure(snake.snake_positions, iterations)
+
+
+def bench_bomb_positions(radius: int, iterations: int) -> Result:
+    """
+    Benchmarks Bomb.bomb_positions of a bomb whose shock wave is at its full radius.
+    :return: The measurement.
+    """
+    bomb = Bomb(_ScriptedRandom([radius, radius, radius, 0]))
+    for _ in range(radius):
+        bomb.tick()
+    return measure(bomb.bomb_positions, iterations)
+
+
+def _recorded_frames(width: int, height: int, snake_length: int, ticks: int) -> \
+        Tuple[List[Dict[str, List[Tuple[int, int]]]], List[Dict[Tuple[int, int], Any]]]:
+    """
+    Internal: plays a game and records the full colours and the changed cells of every tick.
+    :return: The colours and changed cells of every tick.
+    """
+    config = _board_config(width, height, 3, snake_length)
+    game = GameManager(0, config)
+    frames, changes = [], []
+    for _ in range(ticks):
+        frames.append(game.as_colours())
+        changes.append(game.pop_changed_cells())
+        if not game.tick(serpentine_agent(game)):
+            game = GameManager(game.seed + 1, config)
+    return frames, changes
+
+
+def bench_display(width: int, height: int, snake_length: int, iterations: int, delta: bool) -> Result:
+    """
+    Benchmarks drawing a round on GameDisplay, with a stubbed canvas, either by drawing every cell with draw_cell or
+    by sending only the changed cells with update_cell.
+    :return: The measurement.
+    """
+    import game_display
+    frames, changes = _recorded_frames(width, height, snake_length, iterations + iterations // 10 + 1)
+    display = game_display.GameDisplay.__new__(game_display.GameDisplay)
+    display._config = _board_config(width, height, 3, snake_length)
+    display._canvas = _StubCanvas()
+    display._to_draw, display._already_drawn = [], {}
+    display._cell_changes, display._cell_items = {}, {}
+    rounds = iter(range(len(frames)))
+
+    def draw_round() -> None:
+        i = next(rounds)
+        if delta:
+            for (x, y), colour in changes[i].items():
+                display.update_cell(x, y, colour)
+        else:
+            for colour, positions in frames[i].items():
+                for x, y in positions:
+                    if 0 <= x < width and 0 <= y < height:
+                        display.draw_cell(x, y, colour)
+        display._update_drawing()
+    return measure(draw_round, iterations)
+
+
+def bench_vector_env(number_of_envs: int, iterations: int) -> Result:
+    """
+    Benchmarks a step of a VectorEnv with a worker process for every core. ops_per_sec counts the environment
+    steps, not the calls to step.
+    :return: The measurement.
+    """
+    from vector_env import VectorEnv
+    with VectorEnv(number_of_envs, seed=1, max_ticks=1000) as env:
+        env.reset()
+        result = measure(env.step, iterations)
+    result['ops_per_sec'] *= number_of_envs
+    return result
+
+
+def import_time_us(module: str) -> int:
+    """
+    Measures the time it takes to import a module in a new interpreter, with everything it imports.
+    :param module: The name of the module.
+    :return: The time in microseconds, as reported by python -X importtime.
+    """
+    output = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import ' + module],
+                            capture_output=True, text=True, check=True).stderr
+    for line in output.splitlines():
+        fields = line.split('|')
+        if len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1])
+    raise ValueError("no import time reported for " + module)
+
+
+def bench_import(module: str, iterations: int) -> Result:
+    """
+    Benchmarks a cold import of a module, every iteration in a new interpreter.
+    :return: The measurement, without the allocations which happen in the other interpreter.
+    """
+    latencies = sorted(import_time_us(module) for _ in range(iterations))
+    return {
+        'ops_per_sec': 1e6 * len(latencies) / sum(latencies),
+        'p50_us': latencies[len(latencies) // 2],
+        'p99_us': latencies[min(len(latencies) - 1, len(latencies) * 99 // 100)],
+        'alloc_bytes': 0,
+    }
+
+
+def run_suite(quick: bool = False) -> Dict[str, Result]:
+    """
+    Runs every benchmark.
+    :param quick: Run fewer iterations and skip the largest cases.
+    :return: Dictionary of benchmark names as keys and their measurements as values.
+    """
+    n = 500 if quick else 5000
+    suite: List[Tuple[str, Callable[[], Result]]] = [
+        ('tick/40x30/len3/apples3', lambda: bench_tick(40, 30, 3, 3, n)),
+        ('tick/40x30/len25/apples3', lambda: bench_tick(40, 30, 25, 3, n)),
+        ('tick/40x30/len3/apples50', lambda: bench_tick(40, 30, 3, 50, n)),
+        ('tick/200x200/len150/apples3', lambda: bench_tick(200, 200, 150, 3, n)),
+        ('tick/100x100/len25/apples2000', lambda: bench_tick(100, 100, 25, 2000, n)),
+        ('tick/200x200/len150/apples5000', lambda: bench_tick(200, 200, 150, 5000, n)),
+        ('fork/40x30/len25', lambda: bench_fork(40, 30, 25, n)),
+        ('fork/200x200/len150', lambda: bench_fork(200, 200, 150, n)),
+        ('encode/40x30/len25', lambda: bench_codec(40, 30, 25, n, False)),
+        ('decode/40x30/len25', lambda: bench_codec(40, 30, 25, n, True)),
+        ('encode/200x200/len150', lambda: bench_codec(200, 200, 150, n, False)),
+        ('decode/200x200/len150', lambda: bench_codec(200, 200, 150, n, True)),
+        ('snake.move/len10', lambda: bench_snake_move(10, n)),
+        ('snake.move/len10000', lambda: bench_snake_move(10000, n)),
+        ('snake.positions/len10', lambda: bench_snake_positions(10, n)),
+        ('snake.positions/len10000', lambda: bench_snake_positions(10000, n // 10)),
+        ('bomb.positions/radius2', lambda: bench_bomb_positions(2, n)),
+        ('bomb.positions/radius5', lambda: bench_bomb_positions(5, n)),
+        ('bomb.positions/radius50', lambda: bench_bomb_positions(50, n)),
+        ('display.full/40x30/len25', lambda: bench_display(40, 30, 25, n // 5, False)),
+        ('display.delta/40x30/len25', lambda: bench_display(40, 30, 25, n // 5, True)),
+        ('display.full/200x200/len150', lambda: bench_display(200, 200, 150, n // 5, False)),
+        ('display.delta/200x200/len150', lambda: bench_display(200, 200, 150, n // 5, True)),
+    ]
+    suite.append(('vector_env/64', lambda: bench_vector_env(64, n // 5)))
+    suite += [('import/' + module, lambda module=module: bench_import(module, 5 if quick else 20))
+              for module in IMPORT_BUDGET_MS]
+    if not quick:
+        suite += [
+            ('tick/1000x1000/len900/apples3', lambda: bench_tick(1000, 1000, 900, 3, n)),
+            ('snake.move/len1000000', lambda: bench_snake_move(1000000, n)),
+        ]
+    return {name: bench() for name, bench in suite}
+
+
+def compare(results: Dict[str, Result], baseline: Dict[str, Result], tolerance: float) -> List[str]:
+    """
+    Compares results to a baseline. A benchmark that isn't in the baseline counts as a regression, so new
+    benchmarks can't go unchecked until the baseline is saved again.
+    :param results: The current results.
+    :param baseline: The baseline results.
+    :param tolerance: The fraction of ops_per_sec a benchmark may lose before it counts as a regression.
+    :return: A description of every regression.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            regressions.append("%s: not in the baseline" % name)
+            continue
+        ratio = result['ops_per_sec'] / baseline[name]['ops_per_sec']
+        if ratio < 1 - tolerance:
+            regressions.append("%s: %.0f ops/sec, %.0f%% of the baseline" % (
+                name, result['ops_per_sec'], 100 * ratio))
+    return regressions
+
+
+def over_budget(results: Dict[str, Result]) -> List[str]:
+    """
+    Checks the import times of the results against IMPORT_BUDGET_MS.
+    :param results: The results.
+    :return: A description of every import that took longer than its budget.
+    """
+    return ["%s: %.1f ms, over the budget of %.0f ms" % (name, results[name]['p50_us'] / 1000, budget)
+            for name, budget in (('import/' + module, budget) for module, budget in IMPORT_BUDGET_MS.items())
+            if name in results and results[name]['p50_us'] / 1000 > budget]
+
+
+def format_results(results: Dict[str, Result], baseline: Dict[str, Result]) -> str:
+    """
+    Creates a human readable table of the results.
+    :param results: The results.
+    :param baseline: The baseline results, may be empty.
+    :return: The table as a string.
+    """
+    lines = ["%-32s %12s %10s %10s %12s %9s" % ("benchmark", "ops/sec", "p50 us", "p99 us", "alloc bytes",
+                                              "vs base")]
+    for name, r in results.items():
+        versus = "%8.0f%%" % (100 * r['ops_per_sec'] / baseline[name]['ops_per_sec']) if name in baseline else ""
+        lines.append("%-32s %12.0f %10.2f %10.2f %12.0f %9s" % (
+            name, r['ops_per_sec'], r['p50_us'], r['p99_us'], r['alloc_bytes'], versus))
+    return "\n".join(lines)
+
+
+def main() -> int:
+    """
+    Runs the benchmark suite from the command line.
+    :return: The exit code, 1 if a benchmark regressed compared to the baseline.
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks of the snake game engine.")
+    parser.add_argument('--quick', action='store_true', help="fewer iterations, skip the largest cases")
+    parser.add_argument('--save', metavar='PATH', help="write the results as a new baseline")
+    parser.add_argument('--compare', metavar='PATH', nargs='?', const=BASELINE_FILE,
+                        help="compare against a baseline file (default: %s)" % BASELINE_FILE)
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed ops/sec loss before failing (default: %s)" % DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    baseline: Dict[str, Result] = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    results = run_suite(args.quick)
+    print(format_results(results, baseline))
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    regressions = over_budget(results)
+    if args.compare:
+        regressions = compare(results, baseline, args.tolerance) + regressions
+    for regression in regressions:
+        print("REGRESSION " + regression)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
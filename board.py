@@ -0,0 +1,134 @@
+##########################################################################################
+# FILE : board.py
+# WRITER : Yonatan Zhenin , Yonatanzh , 208623397, Yahel Uffenheimer, yahelo, 318377751
+# EXERCISE : intro2cs1 ex10 2021
+# DESCRIPTION: The cells of the board, with counts of the empty cells for spawning.
+##########################################################################################
+import random
+from array import array
+from typing import List, Tuple
+
+EMPTY_CELL = 0
+SNAKE_CELL = 1
+APPLE_CELL = 2
+BOMB_CELL = 4
+# the empty cells are counted in blocks of 1 << FREE_CELL_BLOCK_BITS cells, the blocks in blocks of as many
+# blocks, and so on until a single level of counts is short enough to look through.
+FREE_CELL_BLOCK_BITS = 6
+FREE_CELL_BLOCK = 1 << FREE_CELL_BLOCK_BITS
+
+
+class Board:
+    """
+    The cells of a board, each holding the owner codes of what occupies it, as y * width + x. The cells are changed
+    only through mark and unmark, which keep count of the empty cells of every block of FREE_CELL_BLOCK cells, of
+    every FREE_CELL_BLOCK blocks and so on, so marking a cell takes a step per level, and a random empty cell is
+    found by looking through at most FREE_CELL_BLOCK counts per level, O(log(width * height)) in total. The cell
+    found depends only on the cells and the random generator, not on the order they were taken in.
+    """
+    def __init__(self, width: int, height: int):
+        """
+        Constructor for the Board class, all the cells are empty.
+        :param width: The width of the board.
+        :param height: The height of the board.
+        """
+        size = width * height
+        self.__width = width
+        self.__cells = bytearray(size)
+        self.__free_count = size
+        # levels[0] counts the empty cells of every block, levels[1] of every FREE_CELL_BLOCK blocks and so on. on
+        # an empty board every count is of a whole block but the last one.
+        self.__levels: List[array] = []
+        span = FREE_CELL_BLOCK
+        while True:
+            counts = -(-size // span)
+            self.__levels.append(array('i', [span]) * (counts - 1) + array('i', [size - (counts - 1) * span]))
+            if counts <= FREE_CELL_BLOCK:
+                break
+            span <<= FREE_CELL_BLOCK_BITS
+
+    def copy(self) -> 'Board':
+        """
+        :return: An independent board with the same cells.
+        """
+        board = Board.__new__(Board)
+        board.__width = self.__width
+        board.__cells = self.__cells[:]
+        board.__free_count = self.__free_count
+        board.__levels = [counts[:] for counts in self.__levels]
+        return board
+
+    def mark(self, cell: int, owner: int) -> None:
+        """
+        Marks a cell as occupied by owner.
+        :param cell: Index of the cell.
+        :param owner: One of SNAKE_CELL, APPLE_CELL, BOMB_CELL.
+        :return: None.
+        """
+        cells = self.__cells
+        if cells[cell] == EMPTY_CELL:
+            self.__free_count -= 1
+            block = cell
+            for counts in self.__levels:
+                block >>= FREE_CELL_BLOCK_BITS
+                counts[block] -= 1
+        cells[cell] |= owner
+
+    def unmark(self, cell: int, owner: int) -> None:
+        """
+        Marks a cell as no longer occupied by owner.
+        :param cell: Index of the cell.
+        :param owner: One of SNAKE_CELL, APPLE_CELL, BOMB_CELL.
+        :return: None.
+        """
+        cells = self.__cells
+        owners = cells[cell]
+        cells[cell] = owners & ~owner
+        if owners != EMPTY_CELL and cells[cell] == EMPTY_CELL:
+            self.__free_count += 1
+            block = cell
+            for counts in self.__levels:
+                block >>= FREE_CELL_BLOCK_BITS
+                counts[block] += 1
+
+    def random_free_cell(self, rng: random.Random) -> int:
+        """
+        Picks a uniformly random empty cell with a single draw from the random generator, there must be one. The
+        k-th empty cell is found from the top level of counts down, skipping whole blocks, and then looked for
+        among the cells of its block.
+        :param rng: The random generator to draw from.
+        :return: Index of the cell.
+        """
+        k = rng.randrange(self.__free_count)
+        start = 0
+        for counts in reversed(self.__levels):
+            block = start
+            while counts[block] <= k:
+                k -= counts[block]
+                block += 1
+            start = block << FREE_CELL_BLOCK_BITS
+        cells = self.__cells
+        cell = cells.index(EMPTY_CELL, start)
+        for _ in range(k):
+            cell = cells.index(EMPTY_CELL, cell + 1)
+        return cell
+
+    def random_free_position(self, rng: random.Random) -> Tuple[int, int]:
+        """
+        Picks a uniformly random empty position, see random_free_cell.
+        :param rng: The random generator to draw from.
+        :return: The x,y coordinates of the position.
+        """
+        cell = self.random_free_cell(rng)
+        return cell % self.__width, cell // self.__width
+
+    @property
+    def cells(self) -> bytearray:
+        return self.__cells
+
+    @property
+    def free_count(self) -> int:
+        return self.__free_count
+
+    def __len__(self) -> int:
+        return len(self.__cells)
@@ -4,18 +4,40 @@
 # EXERCISE : intro2cs1 ex10 2021
 # DESCRIPTION: Bomb class for the ex10 game
 ##########################################################################################
-from typing import Tuple, List
-from game_parameters import get_random_bomb_data
+import random
+from typing import Tuple, List, Optional, Dict
+from game_parameters import get_random_bomb_data, GameConfig
+
+_RING_OFFSETS: Dict[int, List[Tuple[int, int]]] = {}
+
+
+def ring_offsets(radius: int) -> List[Tuple[int, int]]:
+    """
+    Returns the offsets from the bomb of every position of a shock wave with the given radius. The offsets are
+    calculated once per radius and shared by all bombs, so they must not be modified.
+    :param radius: The radius of the shock wave, 0 for the bomb itself.
+    :return: List of x,y offsets.
+    """
+    offsets = _RING_OFFSETS.get(radius)
+    if offsets is None:
+        offsets = [(0, 0)] if radius == 0 else []
+        for i in range(0, radius):
+            offsets += [(i - radius, i), (i, radius - i), (radius - i, -i), (-i, i - radius)]
+        _RING_OFFSETS[radius] = offsets
+    return offsets
+
 
 class Bomb:
     """
     Class that represents a bomb.
     """
-    def __init__(self):
+    def __init__(self, rng: Optional[random.Random] = None, config: Optional[GameConfig] = None):
         """
         Constructor for the Bomb class.
+        :param rng: The random generator the bomb's data is drawn from, the random module if None.
+        :param config: The parameters of the game, the default parameters if None.
         """
-        self.__x, self.__y, self.__radius, self.__time = get_random_bomb_data()
+        self.__x, self.__y, self.__radius, self.__time = get_random_bomb_data(rng or random, config)
 
     def bomb_positions(self) -> List[Tuple[int, int]]:
         """
@@ -32,21 +54,65 @@ class Bomb:
         Calculates the positions of the shock wave created when a bomb explodes.
         :return: Returns a list of the bombs shock waves in current state.
         """
-        if self.__time == 0:
-            return [(self.__x, self.__y)]
-        r = - self.__time
-        point_a, point_b, point_c, point_d = (self.__x - r, self.__y), (self.__x, self.__y + r), \
-                                             (self.__x + r, self.__y), (self.__x, self.__y - r)
-        result = []
-        for i in range(0, r):
-            result += [(point_a[0] + i, point_a[1] + i), (point_b[0] + i, point_b[1] - i),
-                       (point_c[0] - i, point_c[1] - i), (point_d[0] - i, point_d[1] + i)]
-        return result
+        x, y = self.__x, self.__y
+        return [(x + dx, y + dy) for dx, dy in ring_offsets(-self.__time)]
+
+    def clipped_positions(self, width: int, height: int) -> Tuple[List[Tuple[int, int]], bool]:
+        """
+        Returns the current bomb positions that are on a board of the given size.
+        :param width: The width of the board.
+        :param height: The height of the board.
+        :return: A list of the positions on the board, and True if any position was off the board.
+        """
+        positions = self.bomb_positions()
+        r = max(0, -self.__time)
+        if r <= self.__x < width - r and r <= self.__y < height - r:
+            return positions, False
+        on_board = [(x, y) for x, y in positions if 0 <= x < width and 0 <= y < height]
+        return on_board, len(on_board) != len(positions)
+
+    def relocate(self, position: Tuple[int, int]) -> None:
+        """
+        Moves the bomb to a different position, keeping its radius and time.
+        :param position: The new x,y coordinates of the bomb.
+        :return: None.
+        """
+        self.__x, self.__y = position
+
+    @staticmethod
+    def from_data(position: Tuple[int, int], radius: int, time: int) -> 'Bomb':
+        """
+        Creates a bomb in a given state.
+        :param position: The x,y coordinates of the bomb.
+        :param radius: The radius of the shock wave.
+        :param time: The time left until the bomb explodes, zero or negative while it's exploding.
+        :return: The new Bomb.
+        """
+        bomb = Bomb.__new__(Bomb)
+        (bomb.__x, bomb.__y), bomb.__radius, bomb.__time = position, radius, time
+        return bomb
+
+    def copy(self) -> 'Bomb':
+        """
+        Creates an independent bomb in the same state.
+        :return: The new Bomb.
+        """
+        bomb = Bomb.__new__(Bomb)
+        bomb.__x, bomb.__y, bomb.__radius, bomb.__time = self.__x, self.__y, self.__radius, self.__time
+        return bomb
+
+    @property
+    def position(self) -> Tuple[int, int]:
+        return self.__x, self.__y
 
     @property
     def radius(self) -> int:
         return self.__radius
 
+    @property
+    def time(self) -> int:
+        return self.__time
+
     @property
     def finished_exploding(self):
         return (self.__radius + self.__time) < 0
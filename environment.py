@@ -0,0 +1,111 @@
+##########################################################################################
+# FILE : environment.py
+# WRITER : Yonatan Zhenin , Yonatanzh , 208623397, Yahel Uffenheimer, yahelo, 318377751
+# EXERCISE : intro2cs1 ex10 2021
+# DESCRIPTION: Reinforcement learning environment for the ex10 game, with NumPy board observations.
+##########################################################################################
+import random
+from typing import Optional, Tuple, Dict, Any
+
+import numpy as np
+
+from game_parameters import GameConfig, DEFAULT_CONFIG
+from game_manager import GameManager, is_in_bounds, SNAKE_CELL, APPLE_CELL
+from batch_engine import DIRECTIONS, NO_ACTION
+
+BODY_CHANNEL, HEAD_CHANNEL, APPLE_CHANNEL, BOMB_CHANNEL, SHOCK_WAVE_CHANNEL = range(5)
+NUMBER_OF_CHANNELS = 5
+
+
+class SnakeEnv:
+    """
+    Environment with reset and step methods that plays a single GameManager.
+    The observation is a (NUMBER_OF_CHANNELS, height, width) array indexed [channel, y, x], that is allocated once
+    and updated in place with only the cells that changed every tick. Copy it if it needs to outlive the next step.
+    """
+    def __init__(self, seed: Optional[int] = None, max_ticks: Optional[int] = None, death_penalty: float = 0.0,
+                 dtype: Any = np.uint8, config: Optional[GameConfig] = None,
+                 observation: Optional[np.ndarray] = None):
+        """
+        Constructor for the class.
+        :param seed: Seed that the seeds of the games are drawn from, None for an unpredictable seed.
+        :param max_ticks: Maximum amount of ticks per game, None to play until the game ends.
+        :param death_penalty: Value subtracted from the reward of the tick the snake died in.
+        :param dtype: NumPy type of the observation.
+        :param config: The parameters of the games, DEFAULT_CONFIG if None.
+        :param observation: Array of shape (NUMBER_OF_CHANNELS, height, width) to write the observations into, e.g
+        in shared memory. Allocated with dtype if None.
+        """
+        self.__config = config or DEFAULT_CONFIG
+        self.__seeds = random.Random(seed)
+        self.__max_ticks = max_ticks
+        self.__death_penalty = death_penalty
+        shape = (NUMBER_OF_CHANNELS, self.__config.height, self.__config.width)
+        if observation is None:
+            observation = np.zeros(shape, dtype=dtype)
+        elif observation.shape != shape:
+            raise ValueError("observation of shape " + str(observation.shape) + " for a board of " + str(shape))
+        self.__observation = observation
+        self.__game: Optional[GameManager] = None
+        self.__head: Optional[Tuple[int, int]] = None
+        self.__ticks = 0
+
+    def reset(self, seed: Optional[int] = None) -> np.ndarray:
+        """
+        Starts a new game.
+        :param seed: Seed of the game, None to draw one from the seed of the environment.
+        :return: The observation of the first tick.
+        """
+        self.__game = GameManager(self.__seeds.getrandbits(63) if seed is None else seed, self.__config)
+        self.__observation.fill(0)
+        self.__head = None
+        self.__ticks = 0
+        self.__update_observation()
+        return self.__observation
+
+    def __update_observation(self) -> None:
+        """
+        Copies the cells that changed in the last tick into the observation.
+        :return: None.
+        """
+        observation, game = self.__observation, self.__game
+        for (x, y), colour in game.pop_changed_cells().items():
+            owners = game.occupant((x, y))
+            observation[BODY_CHANNEL, y, x] = owners & SNAKE_CELL != 0
+            observation[APPLE_CHANNEL, y, x] = owners & APPLE_CELL != 0
+            observation[BOMB_CHANNEL, y, x] = colour == 'red'
+            observation[SHOCK_WAVE_CHANNEL, y, x] = colour == 'orange'
+        if self.__head is not None:
+            observation[HEAD_CHANNEL, self.__head[1], self.__head[0]] = 0
+        self.__head = game.head if is_in_bounds(game.head, self.__config.width, self.__config.height) else None
+        if self.__head is not None:
+            observation[HEAD_CHANNEL, self.__head[1], self.__head[0]] = 1
+
+    def step(self, action: int) -> Tuple[np.ndarray, float, bool, bool, Dict[str, Any]]:
+        """
+        Plays one tick of the game.
+        :param action: Index into DIRECTIONS of the key pressed, NO_ACTION for no key.
+        :return: The observation, the reward (the score gained this tick), whether the game ended, whether the game
+        was cut short by max_ticks, and a dictionary with the score, ticks and death cause.
+        """
+        if self.__game is None:
+            raise RuntimeError("reset must be called before step")
+        score = self.__game.score
+        key = DIRECTIONS[action] if action != NO_ACTION else None
+        alive = self.__game.tick(key)
+        self.__ticks += 1
+        self.__update_observation()
+        reward = float(self.__game.score - score)
+        if not alive:
+            reward -= self.__death_penalty
+        truncated = alive and self.__max_ticks is not None and self.__ticks >= self.__max_ticks
+        info = {'score': self.__game.score, 'ticks': self.__ticks, 'death_cause': self.__game.death_cause}
+        return self.__observation, reward, not alive, truncated, info
+
+    @property
+    def observation(self) -> np.ndarray:
+        return self.__observation
+
+    @property
+    def game(self) -> Optional[GameManager]:
+        return self.__game
@@ -1,19 +1,22 @@
 import threading
-import time
 import tkinter as tki
 from typing import Any, Optional, List, Tuple, Dict
 
 import game_parameters
+import snake_main
 
 CELL_SIZE = 15
 ROUND_TIME = 0.1
 
 
 class GameDisplay:
-    def __init__(self) -> None:
-        """Creates a new game display object and initializes it"""
-        # placed this import in here to solve circular import issues.
-        import snake_main
+    def __init__(self, config: Optional[game_parameters.GameConfig] = None,
+                 agent: Optional[Any] = None, tick_rate: float = 1 / ROUND_TIME) -> None:
+        """Creates a new game display object and initializes it
+        :param config: the parameters of the game, DEFAULT_CONFIG if None
+        :param agent: agent that plays instead of the keyboard, None to play with the keyboard
+        :param tick_rate: ticks of the game per second"""
+        self._config = config or game_parameters.DEFAULT_CONFIG
         self._round_num = 0
         self._root = tki.Tk()
         self._root.title('Snake')
@@ -24,20 +27,21 @@ class GameDisplay:
         self._init_score_frame()
 
         self._canvas = tki.Canvas(
-            self._root, bg="white", width=game_parameters.WIDTH * CELL_SIZE,
-            height=game_parameters.HEIGHT * CELL_SIZE)
+            self._root, bg="white", width=self._config.width * CELL_SIZE,
+            height=self._config.height * CELL_SIZE)
         self._canvas.pack()
         self._to_draw: List[Tuple[int, int, str]] = list()
         self._already_drawn: Dict[Tuple[int, int, str], int] = dict()
+        self._cell_changes: Dict[Tuple[int, int], Optional[str]] = dict()
+        self._cell_items: Dict[Tuple[int, int], int] = dict()
 
         self._root.resizable(False, False)
         self.key_click: Optional[str] = None
         self._key_click_round: int = 0
 
         self._game_control_thread = threading.Thread(
-            target=snake_main.main_loop, args=(self,))
+            target=snake_main.main_loop, args=(self, config, agent, tick_rate))
         self._game_control_thread.daemon = True
-        self._round_start_time = time.time()
 
     def _init_score_frame(self) -> None:
         """
@@ -84,7 +88,7 @@ class GameDisplay:
         :param e:event
         :return:None
         """
-        if e.keysym in ["Left", "Right", "Up", "Down"]:
+        if e.keysym in ["Left", "Right", "Up", "Down", snake_main.REWIND_KEY]:
             self.key_click = e.keysym
             self._key_click_round = self._round_num
 
@@ -92,7 +96,7 @@ class GameDisplay:
         """
         This method returns which key is clicked
         and also turns off the key clicked FLAG
-        :return: None, or one of 'Left', 'Right', 'Up', 'Down'
+        :return: None, or one of 'Left', 'Right', 'Up', 'Down', 'BackSpace'
         """
         result = self.key_click
         self.key_click = None
@@ -108,6 +112,17 @@ class GameDisplay:
         """
         self._to_draw.append((x, y, color))
 
+    def update_cell(self, x: int, y: int, color: Optional[str]) -> None:
+        """
+        Sets the cell at the given coordinates to change its color. Unlike draw_cell, the cell keeps its color in the
+        next rounds until it is updated again.
+        :param x: coordinate at x
+        :param y: coordinate at y
+        :param color: the color we wish to draw, None to clear the cell
+        :return: None
+        """
+        self._cell_changes[(x, y)] = color
+
     def _buffer_draw_cell(self, x: int, y: int, color: str) -> int:
         """
         Internal: internal method to draw the x,y cell in color
@@ -116,15 +131,15 @@ class GameDisplay:
         :param color: the color we wish to draw
         :return: None
         """
-        if x < 0 or x >= game_parameters.WIDTH or \
-                y < 0 or y >= game_parameters.HEIGHT:
+        if x < 0 or x >= self._config.width or \
+                y < 0 or y >= self._config.height:
             raise ValueError(
                 "cell index out of bounds of the board: " + str((x, y)))
 
         # setting the coordinates of the board correctly,
         # the y axis needs to point up.
         # the following line adjusts this.
-        y = game_parameters.HEIGHT - y
+        y = self._config.height - y
         return self._canvas.create_rectangle(
             x * CELL_SIZE, (y - 1) * CELL_SIZE, (x + 1) * CELL_SIZE,
             y * CELL_SIZE,
@@ -150,18 +165,25 @@ class GameDisplay:
         self._already_drawn = cur_drawn
         self._to_draw = list()
 
+        for (x, y), color in self._cell_changes.items():
+            ind = self._cell_items.get((x, y), None)
+            if ind is None:
+                if color is not None:
+                    self._cell_items[(x, y)] = self._buffer_draw_cell(x, y, color)
+            elif color is None:
+                self._canvas.delete(ind)
+                del self._cell_items[(x, y)]
+            else:
+                self._canvas.itemconfigure(ind, fill=color, outline=color)
+        self._cell_changes = dict()
+
     def end_round(self) -> None:
         """
-        This method ends the current round.
+        This method ends the current round and draws it. The timing of the
+        rounds is kept by the main loop.
         :return:None
         """
         self._update_drawing()
-
-        self._round_start_time += ROUND_TIME
-        now = time.time()
-        while now < self._round_start_time:
-            time.sleep(self._round_start_time - now)
-            now = time.time()
         self._round_num += 1
 
     def show_score(self, val: Any) -> None:
@@ -4,92 +4,267 @@
 # EXERCISE : intro2cs1 ex10 2021
 # DESCRIPTION: The game manager for the the game.
 ##########################################################################################
-from typing import List, Tuple, Optional, Dict, Literal, Set
+import random
+import struct
+import sys
+import time
+from array import array
+from collections import deque
+from typing import List, Tuple, Optional, Dict, Literal, Set, NamedTuple, Deque, get_args
 
-from game_parameters import WIDTH, HEIGHT
+from game_parameters import WIDTH, HEIGHT, GameConfig, DEFAULT_CONFIG
 from snake import Snake
 from apple import Apple
 from bomb import Bomb
+from board import Board, EMPTY_CELL, SNAKE_CELL, APPLE_CELL, BOMB_CELL
+from instrumentation import TickProfiler
 
-INITIAL_POSITION = (10, 8)
-INITIAL_LENGTH = 3
-GROWTH_LENGTH = 3
 INITIAL_DIRECTION: Literal['Up'] = "Up"
-NUMBER_OF_APPLES = 3
-MINIMUM_LENGTH = 4
 
 Colour = Literal['black', 'green', 'red', 'orange']
+DeathCause = Literal['out_of_bounds', 'bomb', 'shock_wave', 'self_collision', 'board_full', 'head_to_head',
+                     'snake_collision']
+DEATH_CAUSES: Tuple[DeathCause, ...] = get_args(DeathCause)
+DIRECTIONS = ('Up', 'Down', 'Left', 'Right')
 
+# the encoded state starts with the magic, the config, the seed, the score, the death cause, the direction, the
+# flags, the length the snake grows to, the amount of ligaments and of apples, and the bomb's x, y, radius and time.
+# after it come the x and then the y coordinates of the ligaments from the tail to the head, the x, y and score of
+# every apple, and the state of the random generator, all as little endian 32 bit integers.
+STATE_MAGIC = b'SNK1'
+STATE_HEADER = struct.Struct('<4s13iqqbBB7i')
+GAUSS_NEXT = struct.Struct('<d')
+ATE_HIMSELF_FLAG, HEAD_HIDDEN_FLAG, GENERATOR_FLAG, GAUSS_NEXT_FLAG = 1, 2, 4, 8
+GENERATOR_STATE_SIZE = 625
 
-def is_in_bounds(position: Tuple[int, int]) -> bool:
+
+def _little_endian(values: array) -> bytes:
+    """
+    Internal: converts an array to the bytes of its values in little endian.
+    :param values: Array of 32 bit integers.
+    :return: The bytes.
+    """
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_little_endian(kind: str, data: memoryview) -> array:
+    """
+    Internal: creates an array from the bytes of its values in little endian.
+    :param kind: The type code of the array, of a 32 bit integer.
+    :param data: The bytes.
+    :return: The array.
+    """
+    values = array(kind)
+    values.frombytes(data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+class TickUndo(NamedTuple):
+    """
+    What a tick changed in a game, to take the tick back. The apples and the bomb positions are shared with the
+    game, which replaces them rather than changes them, so a record has the same size whatever the length of the
+    snake.
+    """
+    direction: str
+    length: int
+    vacated: Optional[Tuple[int, int]]
+    score: int
+    death_cause: Optional[DeathCause]
+    has_ate_himself: bool
+    is_head_hidden: bool
+    apples: Dict[Tuple[int, int], Apple]
+    bomb: Tuple[int, int, int, int]
+    bomb_positions: List[Tuple[int, int]]
+    is_bomb_off_board: bool
+    generator_state: Optional[tuple]
+
+
+def is_in_bounds(position: Tuple[int, int], width: int = WIDTH, height: int = HEIGHT) -> bool:
     """
     Checks if position is in the board bounds.
     :param position: Position to be checked.
+    :param width: The width of the board.
+    :param height: The height of the board.
     :return: True if the position is in bounds False other-wise.
     """
-    if 0 <= position[0] < WIDTH and 0 <= position[1] < HEIGHT:
+    if 0 <= position[0] < width and 0 <= position[1] < height:
         return True
     return False
 
 
+def spawn_apple(rng: random.Random, config: GameConfig, board: Board) -> Tuple[Apple, bool]:
+    """
+    Creates an apple from random data, and moves it to a random empty cell if its position is taken, see
+    Board.random_free_cell. The board must have an empty cell.
+    :param rng: The random generator of the game.
+    :param config: The parameters of the game.
+    :param board: The board of the game, the apple isn't marked on it.
+    :return: The apple, and True if it was moved.
+    """
+    apple = Apple(rng, config)
+    x, y = apple.apple_position()
+    if board.cells[y * config.width + x] == EMPTY_CELL:
+        return apple, False
+    apple.relocate(board.random_free_position(rng))
+    return apple, True
+
+
+def spawn_bomb(rng: random.Random, config: GameConfig, board: Board) -> Tuple[Bomb, bool]:
+    """
+    Creates a bomb from random data, and moves it to a random empty cell if its position is taken, see
+    Board.random_free_cell. The board must have an empty cell.
+    :param rng: The random generator of the game.
+    :param config: The parameters of the game.
+    :param board: The board of the game, the bomb isn't marked on it.
+    :return: The bomb, and True if it was moved.
+    """
+    bomb = Bomb(rng, config)
+    x, y = bomb.position
+    if board.cells[y * config.width + x] == EMPTY_CELL:
+        return bomb, False
+    bomb.relocate(board.random_free_position(rng))
+    return bomb, True
+
+
+def needs_new_bomb(bomb: Optional[Bomb], is_bomb_off_board: bool) -> bool:
+    """
+    Checks if the bomb should be replaced by a new one.
+    :param bomb: The bomb, None if there is none yet.
+    :param is_bomb_off_board: Whether the shock wave of the bomb reached the edges of the board.
+    :return: True if there is no bomb, it finished exploding or its shock wave reached the edges of the board.
+    """
+    return bomb is None or bomb.finished_exploding or is_bomb_off_board
+
+
 class GameManager:
     """
     A class that's responsible for the games rules.
     """
-    def __init__(self):
+    def __init__(self, seed: Optional[int] = None, config: Optional[GameConfig] = None):
         """
         Constructor for the Class
+        :param seed: Seed for the random generator of the game, a random seed is picked if None.
+        :param config: The parameters of the game, DEFAULT_CONFIG if None.
         """
-        self.__snake = Snake(INITIAL_POSITION, INITIAL_DIRECTION, INITIAL_LENGTH)
+        self.__seed = random.getrandbits(63) if seed is None else seed
+        self.__rng: Optional[random.Random] = random.Random(self.__seed)
+        self.__rng_state: Optional[tuple] = None
+        self.__config = config or DEFAULT_CONFIG
+        self.__width, self.__height = self.__config.width, self.__config.height
+        self.__snake = Snake(self.__config.initial_position, INITIAL_DIRECTION, self.__config.initial_length)
         self.__bomb: Optional[Bomb] = None
-        self.__apples: List[Apple] = []
+        self.__apples: Dict[Tuple[int, int], Apple] = {}
+        self.__are_apples_shared = False
         self.__score: int = 0
-        self.__snake_positions: List[Tuple[int, int]] = []
+        self.__death_cause: Optional[DeathCause] = None
+        self.__board = Board(self.__width, self.__height)
+        self.__changed_cells: Dict[Tuple[int, int], None] = {}
+        self.__has_ate_himself = False
+        self.__is_head_hidden = False
+        self.__profiler: Optional[TickProfiler] = None
         self.__bomb_positions: List[Tuple[int, int]] = []
-        self.__apple_positions: List[Tuple[int, int]] = []
-        self.__update_snake_positions()
+        self.__is_bomb_off_board = False
+        self.__apple_positions: Optional[List[Tuple[int, int]]] = []
+        self.__history: Optional[Deque[TickUndo]] = None
+        self.__tick_generator_state: Optional[tuple] = None
+        for position in self.__snake.snake_positions():
+            self.__mark(position, SNAKE_CELL)
         self.__check_bomb()
         self.__check_num_of_apples()
 
-    def __is_placement_empty(self, position: Tuple[int, int]) -> bool:
+    def occupant(self, position: Tuple[int, int]) -> int:
         """
-        Checks if given position is already Occupied by anything else on the board.
-        :param position: Position to be checked.
-        :return: True if the position is empty, False if not.
+        Returns the owner codes of a cell on the board.
+        :param position: Position to be checked, must be in bounds.
+        :return: A combination of SNAKE_CELL, APPLE_CELL and BOMB_CELL, EMPTY_CELL if nothing is there.
         """
-        if position in self.__bomb_positions or position in self.__snake_positions or position in self.__apple_positions:
-            return False
-        return True
+        return self.__board.cells[position[1] * self.__width + position[0]]
+
+    def __mark(self, position: Tuple[int, int], owner: int) -> None:
+        """
+        Marks a position on the board as occupied by owner. Positions out of bounds are ignored.
+        :param position: Position to be marked.
+        :param owner: One of SNAKE_CELL, APPLE_CELL, BOMB_CELL.
+        :return: None.
+        """
+        x, y = position
+        if 0 <= x < self.__width and 0 <= y < self.__height:
+            self.__board.mark(y * self.__width + x, owner)
+            self.__changed_cells[position] = None
+
+    def __unmark(self, position: Tuple[int, int], owner: int) -> None:
+        """
+        Marks a position on the board as no longer occupied by owner. Positions out of bounds are ignored.
+        :param position: Position to be unmarked.
+        :param owner: One of SNAKE_CELL, APPLE_CELL, BOMB_CELL.
+        :return: None.
+        """
+        x, y = position
+        if 0 <= x < self.__width and 0 <= y < self.__height:
+            self.__board.unmark(y * self.__width + x, owner)
+            self.__changed_cells[position] = None
 
-    def __update_apple_positions(self) -> None:
+    def __occupied_positions(self) -> List[Tuple[int, int]]:
+        """
+        :return: The positions of the snake, the apples and the bomb that are on the board, possibly repeated.
         """
-        Updates the lists that keeps track of where all the apples are on the board.
+        positions = self.__snake.snake_positions() + list(self.__apples) + self.__bomb_positions
+        return [(x, y) for x, y in positions if 0 <= x < self.__width and 0 <= y < self.__height]
+
+    def __own_apples(self) -> None:
+        """
+        Makes sure the apples aren't shared with a fork or a saved tick, before they are changed.
         :return: None.
         """
-        self.__apple_positions = [apple.apple_position() for apple in self.__apples]
+        if self.__are_apples_shared:
+            self.__apples = dict(self.__apples)
+            self.__are_apples_shared = False
+        self.__apple_positions = None
+
+    def __remove_apple(self, position: Tuple[int, int]) -> Apple:
+        """
+        Removes an apple from the board.
+        :param position: The position of the apple to be removed.
+        :return: The apple.
+        """
+        self.__own_apples()
+        self.__unmark(position, APPLE_CELL)
+        return self.__apples.pop(position)
 
     def __check_num_of_apples(self) -> None:
         """
-        Checks how many apples are on the board. If the current amount of apples is lower than NUMBER_OF_APPLES, creates
-        a new apple and adds it to the board.
+        Removes the apples the bomb is on. If the current amount of apples is lower than the number of apples, creates
+        new apples and adds them to the board.
         :return: None.
         """
-        for apple in self.__apples:
-            if apple.apple_position() in self.__bomb_positions:
-                self.__apples.remove(apple)
+        if self.__profiler is not None:
+            self.__profiler.count('cells_scanned', len(self.__bomb_positions))
+        for position in [position for position in self.__bomb_positions if position in self.__apples]:
+            self.__remove_apple(position)
 
-        while NUMBER_OF_APPLES > len(self.__apples):
-            new_apple = Apple()
-            if self.__is_placement_empty(new_apple.apple_position()):
-                self.__apples.append(new_apple)
-                self.__update_apple_positions()
+        while self.__config.number_of_apples > len(self.__apples) and self.__board.free_count:
+            new_apple, is_relocated = spawn_apple(self.__generator(), self.__config, self.__board)
+            if is_relocated and self.__profiler is not None:
+                self.__profiler.count('relocations')
+            self.__own_apples()
+            self.__apples[new_apple.apple_position()] = new_apple
+            self.__mark(new_apple.apple_position(), APPLE_CELL)
 
     def __update_bomb_positions(self) -> None:
         """
-        Updates the lists that keeps track of where the bomb is on the board.
+        Updates the lists that keeps track of where the bomb is on the board. Positions of the shock wave that are
+        off the board are left out.
         :return: None.
         """
-        self.__bomb_positions = self.__bomb.bomb_positions()
+        for position in self.__bomb_positions:
+            self.__unmark(position, BOMB_CELL)
+        self.__bomb_positions, self.__is_bomb_off_board = self.__bomb.clipped_positions(self.__width, self.__height)
+        for position in self.__bomb_positions:
+            self.__mark(position, BOMB_CELL)
 
     def __check_bomb(self) -> None:
         """
@@ -97,24 +272,24 @@ class GameManager:
         If the current Bomb shock wave reaches the edges of the board, gets rid of the bomb and creates a new one.
         :return: None.
         """
-        if self.__bomb and not self.__bomb.finished_exploding:
-            in_bounds = all(is_in_bounds(location) for location in self.__bomb_positions)
-            if not in_bounds:
-                self.__bomb = None
+        if needs_new_bomb(self.__bomb, self.__is_bomb_off_board):
+            self.__bomb, is_relocated = spawn_bomb(self.__generator(), self.__config, self.__board)
+            if is_relocated and self.__profiler is not None:
+                self.__profiler.count('relocations')
+            self.__update_bomb_positions()
 
-        while self.__bomb is None or self.__bomb.finished_exploding:
-            new_bomb = Bomb()
-            base_location = new_bomb.bomb_positions()[0]
-            if self.__is_placement_empty(base_location):
-                self.__bomb = new_bomb
-                self.__update_bomb_positions()
-
-    def __update_snake_positions(self) -> None:
+    def __update_snake_positions(self, head: Tuple[int, int], vacated: Optional[Tuple[int, int]]) -> None:
         """
-        Updates the lists that keeps track of where the snake is on the board.
+        Marks the cell the snake has entered and the cell it has left on the board.
+        :param head: The new position of the snakes head.
+        :param vacated: The position the snakes tail has left, None if the snake grew.
         :return: None.
         """
-        self.__snake_positions = self.__snake.snake_positions()
+        if vacated is not None:
+            self.__unmark(vacated, SNAKE_CELL)
+        if is_in_bounds(head, self.__width, self.__height) and self.occupant(head) & SNAKE_CELL:
+            self.__has_ate_himself = True
+        self.__mark(head, SNAKE_CELL)
 
     def __is_snake_alive(self) -> bool:
         """
@@ -122,32 +297,37 @@ class GameManager:
         wave, did not eat one of his own ligaments.
         :return: True if the snake is alive, False other-wise
         """
-        if not is_in_bounds(self.__snake.head):
-            self.__snake_positions.remove(self.__snake.head)
+        if not is_in_bounds(self.__snake.head, self.__width, self.__height):
+            self.__is_head_hidden = True
+            self.__death_cause = 'out_of_bounds'
             return False
-        is_in_bomb_range = any(ligament in self.__bomb_positions for ligament in self.__snake_positions)
+        if self.__profiler is not None:
+            self.__profiler.count('cells_scanned', len(self.__bomb_positions))
+        is_in_bomb_range = any(self.occupant(position) & SNAKE_CELL for position in self.__bomb_positions)
         if is_in_bomb_range:
             if not self.__bomb.exploding:
-                self.__snake_positions.remove(self.__snake.head)
+                self.__is_head_hidden = True
+                self.__death_cause = 'bomb'
+            else:
+                self.__death_cause = 'shock_wave'
             return False
-        has_ate_himself = len(set(self.__snake_positions)) != len(self.__snake_positions)
-        if has_ate_himself:
+        if self.__has_ate_himself:
+            self.__death_cause = 'self_collision'
             return False
         return True
 
     def __eat_apples(self) -> None:
         """
-        Checks if the snake has eaten an apple, if so, enlarges the snake by GROWTH_LENGTH, and updates the number of
-        apples on the board.
+        Checks if the snake has eaten an apple, if so, enlarges the snake by the growth length, and updates the number
+        of apples on the board.
         :return: None.
         """
-        for apple in self.__apples:
-            if self.__snake.head == apple.apple_position():
-                self.__snake.grow_by_x(GROWTH_LENGTH)
-                self.__score += apple.score
-                self.__apples.remove(apple)
-                self.__check_num_of_apples()
-                self.__update_apple_positions()
+        if self.__snake.head not in self.__apples:
+            return None
+        apple = self.__remove_apple(self.__snake.head)
+        self.__snake.grow_by_x(self.__config.growth_length)
+        self.__score += apple.score
+        self.__check_num_of_apples()
         return None
 
     def tick(self, direction: Optional[str]) -> bool:
@@ -163,9 +343,20 @@ class GameManager:
         :param direction: Desired direction of the snake.
         :return: True if the game can be played another round, False if not.
         """
+        if self.__history is not None:
+            return self.__recorded_tick(direction)
+        if self.__profiler is not None:
+            return self.__profiled_tick(direction)
+        return self.__play_tick(direction)
+
+    def __play_tick(self, direction: Optional[str]) -> bool:
+        """
+        Internal: implements one tick(round) of the game, see tick.
+        :param direction: Desired direction of the snake.
+        :return: True if the game can be played another round, False if not.
+        """
         self.__snake.turn(direction)
-        self.__snake.move()
-        self.__update_snake_positions()
+        self.__update_snake_positions(*self.__snake.move())
         self.__bomb.tick()
         self.__update_bomb_positions()
         if not self.__is_snake_alive():
@@ -177,12 +368,345 @@ class GameManager:
         self.__check_num_of_apples()
         return True
 
+    def __profiled_tick(self, direction: Optional[str]) -> bool:
+        """
+        Implements one tick(round) of the game the same way tick does, recording the time every phase takes.
+        :param direction: Desired direction of the snake.
+        :return: True if the game can be played another round, False if not.
+        """
+        profiler = self.__profiler
+        start = lap = time.perf_counter_ns()
+        try:
+            self.__snake.turn(direction)
+            lap = profiler.lap('turn', lap)
+            head, vacated = self.__snake.move()
+            lap = profiler.lap('move', lap)
+            self.__update_snake_positions(head, vacated)
+            lap = profiler.lap('positions', lap)
+            self.__bomb.tick()
+            self.__update_bomb_positions()
+            if self.__bomb.exploding:
+                profiler.count('shock_wave_size', len(self.__bomb_positions))
+            lap = profiler.lap('bomb_tick', lap)
+            is_alive = self.__is_snake_alive()
+            lap = profiler.lap('liveness', lap)
+            if not is_alive:
+                return False
+            has_space = self.__space_left()
+            lap = profiler.lap('space_check', lap)
+            if not has_space:
+                return False
+            self.__eat_apples()
+            lap = profiler.lap('eat_apples', lap)
+            self.__check_bomb()
+            lap = profiler.lap('bomb_respawn', lap)
+            self.__check_num_of_apples()
+            profiler.lap('apple_respawn', lap)
+            return True
+        finally:
+            profiler.end_tick(time.perf_counter_ns() - start)
+
+    def __recorded_tick(self, direction: Optional[str]) -> bool:
+        """
+        Internal: implements one tick(round) of the game, and saves what it changed so it can be rewound.
+        :param direction: Desired direction of the snake.
+        :return: True if the game can be played another round, False if not.
+        """
+        snake, bomb = self.__snake, self.__bomb
+        length, tail, ligaments = snake.target_length, snake.tail, len(snake)
+        undo = TickUndo(snake.direction, length, tail, self.__score, self.__death_cause, self.__has_ate_himself,
+                        self.__is_head_hidden, self.__apples, (*bomb.position, bomb.radius, bomb.time),
+                        self.__bomb_positions, self.__is_bomb_off_board, None)
+        self.__are_apples_shared = True
+        self.__tick_generator_state = None
+        try:
+            if self.__profiler is not None:
+                return self.__profiled_tick(direction)
+            return self.__play_tick(direction)
+        finally:
+            # the snake grew instead of leaving its tail if it had ligaments to grow, see Snake.move.
+            self.__history.append(undo._replace(vacated=tail if ligaments >= length else None,
+                                                generator_state=self.__tick_generator_state))
+
+    def rewind(self, ticks: int = 1) -> int:
+        """
+        Takes back the last ticks of the game, up to the amount that were saved since enable_rewind.
+        :param ticks: The amount of ticks to take back.
+        :return: The amount of ticks that were taken back.
+        """
+        rewound = 0
+        while self.__history and rewound < ticks:
+            self.__undo_tick(self.__history.pop())
+            rewound += 1
+        return rewound
+
+    def __undo_tick(self, undo: TickUndo) -> None:
+        """
+        Internal: sets the game back to the state before a tick. Every owner code is undone separately, since apples
+        never share a cell and there's a single bomb.
+        :param undo: What the tick changed.
+        :return: None.
+        """
+        if undo.apples is not self.__apples:
+            for position in self.__apples:
+                if position not in undo.apples:
+                    self.__unmark(position, APPLE_CELL)
+            for position in undo.apples:
+                if position not in self.__apples:
+                    self.__mark(position, APPLE_CELL)
+            self.__apples, self.__apple_positions = undo.apples, None
+            self.__are_apples_shared = True
+
+        for position in self.__bomb_positions:
+            self.__unmark(position, BOMB_CELL)
+        x, y, radius, bomb_time = undo.bomb
+        self.__bomb = Bomb.from_data((x, y), radius, bomb_time)
+        self.__bomb_positions, self.__is_bomb_off_board = undo.bomb_positions, undo.is_bomb_off_board
+        for position in self.__bomb_positions:
+            self.__mark(position, BOMB_CELL)
+
+        head = self.__snake.head
+        self.__snake.unmove(undo.vacated, undo.direction, undo.length)
+        # the head keeps the cell marked only if it ran into the snake, the tick it ate himself.
+        if not self.__has_ate_himself or undo.has_ate_himself and head not in self.__snake.snake_positions():
+            self.__unmark(head, SNAKE_CELL)
+        if undo.vacated is not None:
+            self.__mark(undo.vacated, SNAKE_CELL)
+
+        self.__score, self.__death_cause = undo.score, undo.death_cause
+        self.__has_ate_himself, self.__is_head_hidden = undo.has_ate_himself, undo.is_head_hidden
+        if undo.generator_state is not None:
+            self.__rng, self.__rng_state = None, undo.generator_state
+
+    def enable_rewind(self, ticks: int) -> None:
+        """
+        Starts saving what every tick changes, so the last ticks can be taken back with rewind. Only the amount of
+        ticks given are kept, and the memory they take doesn't depend on the length of the snake.
+        :param ticks: The amount of ticks that can be taken back.
+        :return: None.
+        """
+        self.__history = deque(maxlen=ticks)
+
+    def disable_rewind(self) -> None:
+        """
+        Stops saving what every tick changes, and forgets the ticks that were saved.
+        :return: None.
+        """
+        self.__history = None
+
+    @property
+    def rewindable_ticks(self) -> int:
+        return 0 if self.__history is None else len(self.__history)
+
+    def enable_profiling(self, profiler: Optional[TickProfiler] = None) -> TickProfiler:
+        """
+        Starts recording the time every phase of a tick takes.
+        :param profiler: The profiler to record into, a new one if None. A profiler can be shared by several games.
+        :return: The profiler.
+        """
+        self.__profiler = profiler or TickProfiler()
+        return self.__profiler
+
+    def disable_profiling(self) -> None:
+        """
+        Stops recording the time every phase of a tick takes.
+        :return: None.
+        """
+        self.__profiler = None
+
+    def __generator(self) -> random.Random:
+        """
+        Returns the random generator of the game, creating it from the saved state if the game has been forked.
+        :return: The random generator.
+        """
+        if self.__rng is None:
+            self.__rng = random.Random.__new__(random.Random)
+            self.__rng.setstate(self.__rng_state)
+            self.__rng_state = None
+        if self.__history is not None and self.__tick_generator_state is None:
+            # the tick is being saved for rewind, and this is its first random value.
+            self.__tick_generator_state = self.__rng.getstate()
+        return self.__rng
+
+    def __generator_state(self) -> tuple:
+        """
+        Returns the state of the random generator. Getting the state is slower than the rest of a fork, so the game
+        keeps only the state until it needs a random value again, and all its forks until then share that state.
+        :return: The state, as returned by random.Random.getstate.
+        """
+        if self.__rng is not None:
+            self.__rng_state = self.__rng.getstate()
+            self.__rng = None
+        return self.__rng_state
+
+    def __copy_from(self, other: 'GameManager', seed: Optional[int]) -> None:
+        """
+        Sets the state of the game to a copy of the state of another game, except for the profiler. The apples
+        are shared until one of the games changes them, and the position lists are replaced rather than changed, so
+        they are shared instead of copied. The board is copied, every tick changes it, so sharing it would only
+        make both games copy it on their next tick.
+        :param other: The game to copy.
+        :param seed: Seed for a new random generator, None to continue the random generator of the other game.
+        :return: None.
+        """
+        if seed is None:
+            self.__seed, self.__rng, self.__rng_state = other.__seed, None, other.__generator_state()
+        else:
+            self.__seed, self.__rng, self.__rng_state = seed, random.Random(seed), None
+        self.__config = other.__config
+        self.__width, self.__height = other.__width, other.__height
+        self.__snake = other.__snake.copy()
+        self.__bomb = other.__bomb.copy()
+        self.__apples = other.__apples
+        self.__are_apples_shared = other.__are_apples_shared = True
+        self.__score = other.__score
+        self.__death_cause = other.__death_cause
+        self.__board = other.__board.copy()
+        self.__changed_cells = dict(other.__changed_cells)
+        self.__has_ate_himself = other.__has_ate_himself
+        self.__is_head_hidden = other.__is_head_hidden
+        self.__bomb_positions = other.__bomb_positions
+        self.__is_bomb_off_board = other.__is_bomb_off_board
+        self.__apple_positions = other.__apple_positions
+
+    def fork(self, seed: Optional[int] = None) -> 'GameManager':
+        """
+        Creates an independent game in the same state, without a profiler. Takes O(width * height) time, for
+        copying the board, a byte per cell, and O(length of the snake) for the rest.
+        :param seed: Seed for the random generator of the new game, None to continue the random generator of this
+        game, so both games spawn the same apples and bombs if they are played the same way.
+        :return: The new game.
+        """
+        game = GameManager.__new__(GameManager)
+        game.__copy_from(self, seed)
+        game.__profiler = None
+        game.__history, game.__tick_generator_state = None, None
+        return game
+
+    def snapshot(self) -> 'GameManager':
+        """
+        Saves the state of the game, to go back to it with restore.
+        :return: The saved state, a fork of the game that must not be played.
+        """
+        return self.fork()
+
+    def restore(self, snapshot: 'GameManager') -> None:
+        """
+        Sets the state of the game back to a saved state. The same state can be restored any amount of times.
+        Ticks saved for rewind are forgotten.
+        :param snapshot: A state returned by snapshot.
+        :return: None.
+        """
+        changed_cells = self.__changed_cells
+        changed_cells.update(dict.fromkeys(self.__occupied_positions()))
+        self.__copy_from(snapshot, None)
+        if self.__history is not None:
+            self.__history.clear()
+        changed_cells.update(dict.fromkeys(self.__occupied_positions()))
+        self.__changed_cells = changed_cells
+
+    def encode(self, include_generator: bool = True) -> bytes:
+        """
+        Encodes the state of the game in a compact binary format, see STATE_HEADER. The profiler and which cells
+        changed since the last pop_changed_cells aren't part of the state.
+        :param include_generator: Include the state of the random generator (2.5KB), so the decoded game spawns the
+        same apples and bombs as this game would.
+        :return: The encoded state.
+        """
+        config = self.__config
+        xs, ys = self.__snake.coordinates()
+        flags = (ATE_HIMSELF_FLAG if self.__has_ate_himself else 0) | \
+            (HEAD_HIDDEN_FLAG if self.__is_head_hidden else 0)
+        generator_state = None
+        if include_generator:
+            generator_state = self.__generator_state()
+            flags |= GENERATOR_FLAG | (GAUSS_NEXT_FLAG if generator_state[2] is not None else 0)
+        apples = array('i')
+        for apple in self.__apples.values():
+            apples.extend((*apple.apple_position(), apple.score))
+        bomb = self.__bomb
+        parts = [
+            STATE_HEADER.pack(
+                STATE_MAGIC, config.width, config.height, config.number_of_apples, config.growth_length,
+                *config.initial_position, config.initial_length, *config.apple_score_range,
+                *config.bomb_radius_range, *config.bomb_time_range, self.__seed, self.__score,
+                -1 if self.__death_cause is None else DEATH_CAUSES.index(self.__death_cause),
+                DIRECTIONS.index(self.__snake.direction), flags, self.__snake.target_length, len(xs),
+                len(self.__apples),
+                *bomb.position, bomb.radius, bomb.time),
+            _little_endian(array('i', xs)), _little_endian(array('i', ys)), _little_endian(apples)]
+        if generator_state is not None:
+            parts.append(_little_endian(array('I', generator_state[1])))
+            if generator_state[2] is not None:
+                parts.append(GAUSS_NEXT.pack(generator_state[2]))
+        return b''.join(parts)
+
+    @staticmethod
+    def decode(data: bytes) -> 'GameManager':
+        """
+        Creates a game from a state encoded by encode. The first pop_changed_cells of the game returns the whole board.
+        :param data: The encoded state.
+        :return: The new game, with a new random generator seeded with the games seed if the state doesn't include the
+        random generator.
+        """
+        data = memoryview(data)
+        if bytes(data[:len(STATE_MAGIC)]) != STATE_MAGIC or len(data) < STATE_HEADER.size:
+            raise ValueError("not an encoded game state")
+        (_, width, height, number_of_apples, growth_length, initial_x, initial_y, initial_length, min_score, max_score,
+         min_radius, max_radius, min_time, max_time, seed, score, death_cause, direction, flags, target_length,
+         ligaments, number_of_apples_left, bomb_x, bomb_y, bomb_radius, bomb_time) = STATE_HEADER.unpack_from(data)
+        size = STATE_HEADER.size + 8 * ligaments + 12 * number_of_apples_left
+        if flags & GENERATOR_FLAG:
+            size += 4 * GENERATOR_STATE_SIZE + (GAUSS_NEXT.size if flags & GAUSS_NEXT_FLAG else 0)
+        if ligaments < 1 or number_of_apples_left < 0 or len(data) != size:
+            raise ValueError("encoded game state of " + str(len(data)) + " bytes, expected " + str(size))
+        offset = STATE_HEADER.size
+        xs = _from_little_endian('i', data[offset:offset + 4 * ligaments])
+        ys = _from_little_endian('i', data[offset + 4 * ligaments:offset + 8 * ligaments])
+        offset += 8 * ligaments
+        apples = _from_little_endian('i', data[offset:offset + 12 * number_of_apples_left])
+        offset += 12 * number_of_apples_left
+
+        game = GameManager.__new__(GameManager)
+        game.__seed = seed
+        if flags & GENERATOR_FLAG:
+            words = _from_little_endian('I', data[offset:offset + 4 * GENERATOR_STATE_SIZE])
+            offset += 4 * GENERATOR_STATE_SIZE
+            gauss_next = GAUSS_NEXT.unpack_from(data, offset)[0] if flags & GAUSS_NEXT_FLAG else None
+            game.__rng, game.__rng_state = None, (3, tuple(words), gauss_next)
+        else:
+            game.__rng, game.__rng_state = random.Random(seed), None
+        game.__config = GameConfig(width, height, number_of_apples, growth_length, (initial_x, initial_y),
+                                   initial_length, (min_score, max_score), (min_radius, max_radius),
+                                   (min_time, max_time))
+        game.__width, game.__height = width, height
+        game.__snake = Snake.from_coordinates(xs, ys, DIRECTIONS[direction], target_length)
+        game.__bomb = Bomb.from_data((bomb_x, bomb_y), bomb_radius, bomb_time)
+        game.__apples = {(apples[i], apples[i + 1]): Apple.from_data((apples[i], apples[i + 1]), apples[i + 2])
+                         for i in range(0, len(apples), 3)}
+        game.__are_apples_shared = False
+        game.__score = score
+        game.__death_cause = None if death_cause == -1 else DEATH_CAUSES[death_cause]
+        game.__has_ate_himself = bool(flags & ATE_HIMSELF_FLAG)
+        game.__is_head_hidden = bool(flags & HEAD_HIDDEN_FLAG)
+        game.__profiler = None
+        game.__history, game.__tick_generator_state = None, None
+        game.__bomb_positions, game.__is_bomb_off_board = game.__bomb.clipped_positions(width, height)
+        game.__apple_positions = None
+        game.__board, game.__changed_cells = Board(width, height), {}
+        for positions, owner in ((zip(xs, ys), SNAKE_CELL), (game.__apples, APPLE_CELL),
+                                 (game.__bomb_positions, BOMB_CELL)):
+            for position in positions:
+                game.__mark(position, owner)
+        return game
+
     def __space_left(self) -> bool:
         """
         Checks if there's any space left on the board.
         :return: False if the board is full i.e not enough place to place a bomb or an apple, True other-wise.
         """
-        if len(self.__snake_positions) == (WIDTH * HEIGHT) - MINIMUM_LENGTH:
+        if len(self.__snake) == (self.__width * self.__height) - self.__config.minimum_length:
+            self.__death_cause = 'board_full'
             return False
         return True
 
@@ -191,12 +715,74 @@ class GameManager:
         Uses all known positions to create a dictionary that is used to colour the board
         :return: Dictionary of colours as keys and positions as values.
         """
+        snake_positions = self.__snake.snake_positions()
+        if self.__is_head_hidden:
+            snake_positions.pop()
         return {
-            'black': self.__snake_positions,
-            'green': self.__apple_positions,
+            'black': snake_positions,
+            'green': self.apple_positions,
             'orange' if self.__bomb.exploding else 'red': self.__bomb_positions
         }
 
+    def __cell_colour(self, position: Tuple[int, int]) -> Optional[Colour]:
+        """
+        Finds the colour a cell is drawn in. The bomb is drawn over apples, and apples over the snake.
+        :param position: Position of the cell, must be in bounds.
+        :return: The colour of the cell, None if the cell is empty.
+        """
+        owners = self.occupant(position)
+        if owners & BOMB_CELL:
+            return 'orange' if self.__bomb.exploding else 'red'
+        if owners & APPLE_CELL:
+            return 'green'
+        if owners & SNAKE_CELL:
+            return 'black'
+        return None
+
+    def pop_changed_cells(self) -> Dict[Tuple[int, int], Optional[Colour]]:
+        """
+        Collects every cell that was added, removed or recoloured since the last call, and starts collecting anew.
+        The first call returns the whole board.
+        :return: Dictionary of positions as keys and their new colour as values, None if the cell is now empty.
+        """
+        changed_cells = {position: self.__cell_colour(position) for position in self.__changed_cells}
+        self.__changed_cells = {}
+        return changed_cells
+
     @property
     def score(self) -> int:
         return self.__score
+
+    @property
+    def config(self) -> GameConfig:
+        return self.__config
+
+    @property
+    def head(self) -> Tuple[int, int]:
+        return self.__snake.head
+
+    @property
+    def direction(self) -> str:
+        return self.__snake.direction
+
+    @property
+    def length(self) -> int:
+        return len(self.__snake)
+
+    @property
+    def apple_positions(self) -> List[Tuple[int, int]]:
+        if self.__apple_positions is None:
+            self.__apple_positions = list(self.__apples)
+        return self.__apple_positions
+
+    @property
+    def bomb(self) -> Bomb:
+        return self.__bomb
+
+    @property
+    def seed(self) -> int:
+        return self.__seed
+
+    @property
+    def death_cause(self) -> Optional[DeathCause]:
+        return self.__death_cause
@@ -1,30 +1,62 @@
 import random
-from typing import Tuple, Any
+from typing import Tuple, Any, NamedTuple, Optional
 
 WIDTH = 40
 HEIGHT = 30
 
 
-def get_random_apple_data() -> Tuple[int, int, int]:
+class GameConfig(NamedTuple):
+    """
+    The parameters of a single game. Ranges include both ends.
+    """
+    width: int = WIDTH
+    height: int = HEIGHT
+    number_of_apples: int = 3
+    growth_length: int = 3
+    initial_position: Tuple[int, int] = (10, 8)
+    initial_length: int = 3
+    apple_score_range: Tuple[int, int] = (1, 5)
+    bomb_radius_range: Tuple[int, int] = (2, 5)
+    bomb_time_range: Tuple[int, int] = (20, 30)
+
+    @property
+    def minimum_length(self) -> int:
+        """
+        The amount of cells left for the apples and the bomb, the board is full when the snake is this much shorter
+        than the amount of cells.
+        """
+        return self.number_of_apples + 1
+
+
+DEFAULT_CONFIG = GameConfig()
+
+
+def get_random_apple_data(rng: Any = random, config: Optional[GameConfig] = None) -> Tuple[int, int, int]:
     """
     This method returns randomly drawn data for the apple
+    :param rng: The random generator to draw from, the random module by default
+    :param config: The parameters of the game, DEFAULT_CONFIG by default
     :return: (x,y,score) - Random location on the board and initial score
     """
-    x = random.randint(0, WIDTH - 1)
-    y = random.randint(0, HEIGHT - 1)
-    score = random.randint(1, 5)
+    config = config or DEFAULT_CONFIG
+    x = rng.randint(0, config.width - 1)
+    y = rng.randint(0, config.height - 1)
+    score = rng.randint(*config.apple_score_range)
 
     return x, y, score
 
 
-def get_random_bomb_data() -> Tuple[int, int, int, int]:
+def get_random_bomb_data(rng: Any = random, config: Optional[GameConfig] = None) -> Tuple[int, int, int, int]:
     """
     This method returns randomly drawn data for the bomb
+    :param rng: The random generator to draw from, the random module by default
+    :param config: The parameters of the game, DEFAULT_CONFIG by default
     :return: (x,y,radius,time) Random location, bomb radius and time to explode
     """
-    x = random.randint(0, WIDTH - 1)
-    y = random.randint(0, HEIGHT - 1)
-    radius = random.randint(2, 5)
-    time = random.randint(20, 30)
+    config = config or DEFAULT_CONFIG
+    x = rng.randint(0, config.width - 1)
+    y = rng.randint(0, config.height - 1)
+    radius = rng.randint(*config.bomb_radius_range)
+    time = rng.randint(*config.bomb_time_range)
 
     return x, y, radius, time
\ No newline at end of file
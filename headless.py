@@ -0,0 +1,114 @@
+##########################################################################################
+# FILE : headless.py
+# WRITER : Yonatan Zhenin , Yonatanzh , 208623397, Yahel Uffenheimer, yahelo, 318377751
+# EXERCISE : intro2cs1 ex10 2021
+# DESCRIPTION: Headless runner that plays the game without a display, as fast as possible.
+##########################################################################################
+import random
+import time
+from typing import Callable, Optional, NamedTuple, List
+
+from game_manager import GameManager, DeathCause
+
+ALLOWED_KEYS = ['Up', 'Down', 'Left', 'Right']
+
+Agent = Callable[[GameManager], Optional[str]]
+
+
+class GameStats(NamedTuple):
+    """
+    Summary of a single headless game.
+    """
+    ticks: int
+    score: int
+    death_cause: Optional[DeathCause]
+    elapsed: float
+
+    @property
+    def ticks_per_second(self) -> float:
+        return self.ticks / self.elapsed if self.elapsed > 0 else float('inf')
+
+
+def idle_agent(game: GameManager) -> Optional[str]:
+    """
+    An agent that never presses a key, the same as a player that does nothing.
+    :param game: The game being played.
+    :return: None.
+    """
+    return None
+
+
+def random_agent(game: GameManager) -> Optional[str]:
+    """
+    An agent that presses a random arrow key every tick.
+    :param game: The game being played.
+    :return: One of ALLOWED_KEYS.
+    """
+    return random.choice(ALLOWED_KEYS)
+
+
+def serpentine_agent(game: GameManager) -> Optional[str]:
+    """
+    An agent that follows a cycle through every cell of the board: up and down the columns above the bottom row,
+    then back left along the bottom row. The snake never hits itself or a wall on the cycle, only bombs.
+    Needs an even board width and a snake that starts on an even column heading up.
+    :param game: The game being played.
+    :return: The key that keeps the snake on the cycle.
+    """
+    x, y = game.head
+    if y == 0:
+        return 'Left' if x > 0 else 'Up'
+    if x % 2 == 0:
+        return 'Up' if y < game.config.height - 1 else 'Right'
+    if y > 1:
+        return 'Down'
+    return 'Right' if x < game.config.width - 1 else 'Down'
+
+
+def run_headless(agent: Agent = idle_agent, max_ticks: Optional[int] = None,
+                 game: Optional[GameManager] = None) -> GameStats:
+    """
+    Plays a single game without a display, with no delay between ticks.
+    :param agent: Function that receives the game and returns the key pressed this tick, or None.
+    :param max_ticks: Maximum amount of ticks to play, None to play until the game ends.
+    :param game: The game to play, a new GameManager is created if None is given.
+    :return: GameStats of the game played.
+    """
+    if game is None:
+        game = GameManager()
+    ticks = 0
+    start = time.perf_counter()
+    while max_ticks is None or ticks < max_ticks:
+        ticks += 1
+        if not game.tick(agent(game)):
+            break
+    elapsed = time.perf_counter() - start
+    return GameStats(ticks, game.score, game.death_cause, elapsed)
+
+
+def summarize(stats: List[GameStats]) -> str:
+    """
+    Creates a human readable summary of several headless games.
+    :param stats: GameStats of the games played.
+    :return: The summary as a string.
+    """
+    total_ticks = sum(s.ticks for s in stats)
+    total_time = sum(s.elapsed for s in stats)
+    causes = {}
+    for s in stats:
+        causes[s.death_cause] = causes.get(s.death_cause, 0) + 1
+    lines = [
+        "Games: " + str(len(stats)),
+        "Ticks: " + str(total_ticks),
+        "Ticks/sec: " + ("%.1f" % (total_ticks / total_time) if total_time > 0 else "inf"),
+        "Mean score: " + "%.2f" % (sum(s.score for s in stats) / len(stats) if stats else 0),
+        "Max score: " + str(max((s.score for s in stats), default=0)),
+        "Death causes: " + ", ".join(str(k) + "=" + str(v) for k, v in causes.items()),
+    ]
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import sys
+    number_of_games = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    print(summarize([run_headless(random_agent) for _ in range(number_of_games)]))
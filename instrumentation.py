@@ -0,0 +1,160 @@
+##########################################################################################
+# FILE : instrumentation.py
+# WRITER : Yonatan Zhenin , Yonatanzh , 208623397, Yahel Uffenheimer, yahelo, 318377751
+# EXERCISE : intro2cs1 ex10 2021
+# DESCRIPTION: Per-phase timings and counters of GameManager ticks.
+##########################################################################################
+import time
+from typing import Dict, List, Any, Optional
+
+PHASES = ('turn', 'move', 'positions', 'bomb_tick', 'liveness', 'space_check', 'eat_apples', 'bomb_respawn',
+          'apple_respawn')
+COUNTERS = ('relocations', 'cells_scanned', 'shock_wave_size')
+MAX_SLOW_TICKS = 100
+
+
+class Histogram:
+    """
+    Histogram of non negative integers, with a bucket for every power of two.
+    """
+    def __init__(self):
+        """
+        Constructor for the Histogram class.
+        """
+        self.__buckets: List[int] = []
+        self.__count = 0
+        self.__total = 0
+        self.__max = 0
+
+    def record(self, value: int) -> None:
+        """
+        Adds a value to the histogram.
+        :param value: The value to add.
+        :return: None.
+        """
+        bucket = value.bit_length()
+        while len(self.__buckets) <= bucket:
+            self.__buckets.append(0)
+        self.__buckets[bucket] += 1
+        self.__count += 1
+        self.__total += value
+        if value > self.__max:
+            self.__max = value
+
+    def percentile(self, fraction: float) -> int:
+        """
+        Estimates a percentile by the upper bound of the bucket it falls in.
+        :param fraction: The percentile, between 0 and 1.
+        :return: The estimate, 0 if the histogram is empty.
+        """
+        remaining = fraction * self.__count
+        for bucket, amount in enumerate(self.__buckets):
+            remaining -= amount
+            if remaining <= 0 and amount:
+                return min(self.__max, (1 << bucket) - 1)
+        return self.__max
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        :return: A dictionary summary of the histogram, with its buckets as the upper bound of every bucket and the
+        amount of values in it.
+        """
+        return {
+            'count': self.__count,
+            'total': self.__total,
+            'mean': self.__total / self.__count if self.__count else 0,
+            'max': self.__max,
+            'p50': self.percentile(0.5),
+            'p99': self.percentile(0.99),
+            'buckets': {(1 << bucket) - 1: amount for bucket, amount in enumerate(self.__buckets) if amount},
+        }
+
+    @property
+    def count(self) -> int:
+        return self.__count
+
+
+class TickProfiler:
+    """
+    Collects the time every phase of GameManager.tick takes, in nanoseconds, and counters of the work done in every
+    tick. Ticks slower than slow_tick_ns are also kept with their phase breakdown.
+    """
+    def __init__(self, slow_tick_ns: int = 1000000):
+        """
+        Constructor for the TickProfiler class.
+        :param slow_tick_ns: Ticks that take at least this long are kept in slow_ticks.
+        """
+        self.__slow_tick_ns = slow_tick_ns
+        self.__phases: Dict[str, Histogram] = {phase: Histogram() for phase in PHASES}
+        self.__counters: Dict[str, Histogram] = {counter: Histogram() for counter in COUNTERS}
+        self.__ticks = Histogram()
+        self.__current_phases: Dict[str, int] = {}
+        self.__current_counters: Dict[str, int] = {}
+        self.__slow_ticks: List[Dict[str, Any]] = []
+        self.__tick_number = 0
+
+    def lap(self, phase: str, since: int) -> int:
+        """
+        Records the time that passed since the previous lap as the duration of a phase.
+        :param phase: One of PHASES.
+        :param since: The time the phase started, from time.perf_counter_ns.
+        :return: The current time, to be passed to the next lap.
+        """
+        now = time.perf_counter_ns()
+        self.__current_phases[phase] = now - since
+        return now
+
+    def count(self, counter: str, amount: int = 1) -> None:
+        """
+        Adds to a counter of the current tick.
+        :param counter: One of COUNTERS.
+        :param amount: The amount to add.
+        :return: None.
+        """
+        self.__current_counters[counter] = self.__current_counters.get(counter, 0) + amount
+
+    def end_tick(self, duration: int) -> None:
+        """
+        Moves the phases and counters of the current tick into the histograms.
+        :param duration: The duration of the whole tick, in nanoseconds.
+        :return: None.
+        """
+        self.__ticks.record(duration)
+        for phase, elapsed in self.__current_phases.items():
+            self.__phases[phase].record(elapsed)
+        for counter in COUNTERS:
+            self.__counters[counter].record(self.__current_counters.get(counter, 0))
+        if duration >= self.__slow_tick_ns and len(self.__slow_ticks) < MAX_SLOW_TICKS:
+            self.__slow_ticks.append({'tick': self.__tick_number, 'duration': duration,
+                                      'phases': self.__current_phases, 'counters': self.__current_counters})
+        self.__tick_number += 1
+        self.__current_phases = {}
+        self.__current_counters = {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        :return: Dictionary with the tick, phase and counter histograms and the slow ticks.
+        """
+        return {
+            'ticks': self.__ticks.to_dict(),
+            'phases_ns': {phase: histogram.to_dict() for phase, histogram in self.__phases.items()},
+            'counters': {counter: histogram.to_dict() for counter, histogram in self.__counters.items()},
+            'slow_ticks': self.__slow_ticks,
+        }
+
+    def to_json(self, path: Optional[str] = None) -> str:
+        """
+        Exports the profile as JSON.
+        :param path: File to write the JSON to, None to only return it.
+        :return: The JSON string.
+        """
+        import json
+        result = json.dumps(self.to_dict(), indent=2)
+        if path is not None:
+            with open(path, 'w') as f:
+                f.write(result)
+        return result
+
+    @property
+    def slow_ticks(self) -> List[Dict[str, Any]]:
+        return self.__slow_ticks
@@ -0,0 +1,394 @@
+##########################################################################################
+# FILE : multi_game.py
+# WRITER : Yonatan Zhenin , Yonatanzh , 208623397, Yahel Uffenheimer, yahelo, 318377751
+# EXERCISE : intro2cs1 ex10 2021
+# DESCRIPTION: Game mode with several snakes on the same board.
+##########################################################################################
+import random
+import time
+from array import array
+from typing import List, Tuple, Optional, Dict, Sequence, NamedTuple
+
+from game_parameters import GameConfig, DEFAULT_CONFIG
+from snake import Snake
+from apple import Apple
+from bomb import Bomb
+from board import Board
+from game_manager import SNAKE_CELL, APPLE_CELL, BOMB_CELL, INITIAL_DIRECTION, DeathCause, spawn_apple, spawn_bomb, \
+    needs_new_bomb
+from headless import Agent
+
+NO_OWNER = -1
+SNAKE_COLOURS = ('black', 'blue', 'purple', 'brown', 'gray', 'cyan', 'magenta', 'navy')
+
+
+class MatchStats(NamedTuple):
+    """
+    Summary of a single game with several snakes.
+    """
+    ticks: int
+    scores: List[int]
+    death_causes: List[Optional[DeathCause]]
+    elapsed: float
+
+
+class MultiGameManager:
+    """
+    A class that's responsible for the rules of a game with several snakes. Every cell of the board keeps the snake
+    that occupies it, so collisions are found by looking up the cells the heads and the shock wave are in, no matter
+    how many snakes there are or how long they are. A snake that dies is removed from the board. The apples and the
+    bomb are spawned by the same rules as in GameManager.
+    """
+    def __init__(self, number_of_snakes: int = 2, seed: Optional[int] = None, config: Optional[GameConfig] = None):
+        """
+        Constructor for the Class. The snakes start on the row of the initial position, evenly spread across the
+        board, heading up.
+        :param number_of_snakes: The amount of snakes.
+        :param seed: Seed for the random generator of the game, a random seed is picked if None.
+        :param config: The parameters of the game, DEFAULT_CONFIG if None.
+        """
+        self.__seed = random.getrandbits(63) if seed is None else seed
+        self.__rng = random.Random(self.__seed)
+        self.__config = config or DEFAULT_CONFIG
+        self.__width, self.__height = self.__config.width, self.__config.height
+        self.__snakes = [Snake(((i + 1) * self.__width // (number_of_snakes + 1), self.__config.initial_position[1]),
+                               INITIAL_DIRECTION, self.__config.initial_length) for i in range(number_of_snakes)]
+        self.__alive = [True] * number_of_snakes
+        self.__scores = [0] * number_of_snakes
+        self.__death_causes: List[Optional[DeathCause]] = [None] * number_of_snakes
+        self.__bomb: Optional[Bomb] = None
+        self.__apples: Dict[Tuple[int, int], Apple] = {}
+        self.__board = Board(self.__width, self.__height)
+        self.__owners = array('h', [NO_OWNER]) * (self.__width * self.__height)
+        self.__bomb_positions: List[Tuple[int, int]] = []
+        self.__is_bomb_off_board = False
+        for i, snake in enumerate(self.__snakes):
+            for position in snake.snake_positions():
+                self.__mark_snake(position, i)
+        self.__check_bomb()
+        self.__check_num_of_apples()
+
+    def __cell(self, position: Tuple[int, int]) -> Optional[int]:
+        """
+        :param position: Position on the board.
+        :return: The index of the cell of the position, None if it's out of bounds.
+        """
+        x, y = position
+        if 0 <= x < self.__width and 0 <= y < self.__height:
+            return y * self.__width + x
+        return None
+
+    def __mark_snake(self, position: Tuple[int, int], snake: int) -> None:
+        """
+        Marks a position as occupied by a snake. Positions out of bounds are ignored.
+        :param position: Position to be marked.
+        :param snake: Index of the snake.
+        :return: None.
+        """
+        cell = self.__cell(position)
+        if cell is not None:
+            self.__board.mark(cell, SNAKE_CELL)
+            self.__owners[cell] = snake
+
+    def __unmark_snake(self, position: Tuple[int, int], snake: int) -> None:
+        """
+        Marks a position as no longer occupied by a snake, unless another snake occupies it.
+        :param position: Position to be unmarked.
+        :param snake: Index of the snake.
+        :return: None.
+        """
+        cell = self.__cell(position)
+        if cell is not None and self.__owners[cell] == snake:
+            self.__board.unmark(cell, SNAKE_CELL)
+            self.__owners[cell] = NO_OWNER
+
+    def __check_num_of_apples(self) -> None:
+        """
+        Removes the apples the bomb is on, and adds apples until there are enough apples on the board.
+        :return: None.
+        """
+        for position in [position for position in self.__bomb_positions if position in self.__apples]:
+            del self.__apples[position]
+            self.__board.unmark(self.__cell(position), APPLE_CELL)
+        while self.__config.number_of_apples > len(self.__apples) and self.__board.free_count:
+            new_apple = spawn_apple(self.__rng, self.__config, self.__board)[0]
+            self.__apples[new_apple.apple_position()] = new_apple
+            self.__board.mark(self.__cell(new_apple.apple_position()), APPLE_CELL)
+
+    def __update_bomb_positions(self) -> None:
+        """
+        Updates the positions of the bomb on the board.
+        :return: None.
+        """
+        for position in self.__bomb_positions:
+            self.__board.unmark(self.__cell(position), BOMB_CELL)
+        self.__bomb_positions, self.__is_bomb_off_board = self.__bomb.clipped_positions(self.__width, self.__height)
+        for position in self.__bomb_positions:
+            self.__board.mark(self.__cell(position), BOMB_CELL)
+
+    def __check_bomb(self) -> None:
+        """
+        Creates a new bomb if there is none, if it finished exploding or if its shock wave reached the edges of the
+        board. If there's no empty cell for the new bomb, the old one is put out, and replaced once there is one.
+        :return: None.
+        """
+        if not needs_new_bomb(self.__bomb, self.__is_bomb_off_board):
+            return
+        if self.__board.free_count:
+            self.__bomb = spawn_bomb(self.__rng, self.__config, self.__board)[0]
+        else:
+            bomb = self.__bomb or Bomb(self.__rng, self.__config)
+            self.__bomb = Bomb.from_data(bomb.position, bomb.radius, -bomb.radius - 1)
+        self.__update_bomb_positions()
+
+    def __find_collisions(self, heads: Dict[Tuple[int, int], List[int]]) -> Dict[int, DeathCause]:
+        """
+        Finds the snakes that die this tick, after the snakes and the bomb have moved and before the heads are
+        marked on the board.
+        :param heads: Dictionary of the new head positions as keys and the snakes whose head is there as values.
+        :return: Dictionary of the dying snakes as keys and the causes of their deaths as values.
+        """
+        causes: Dict[int, DeathCause] = {}
+        for head, snakes in heads.items():
+            cell = self.__cell(head)
+            if cell is None:
+                cause = 'out_of_bounds'
+            elif len(snakes) > 1:
+                cause = 'head_to_head'
+            elif self.__owners[cell] == snakes[0]:
+                cause = 'self_collision'
+            elif self.__owners[cell] != NO_OWNER:
+                cause = 'snake_collision'
+            else:
+                continue
+            for snake in snakes:
+                causes[snake] = cause
+        cause = 'shock_wave' if self.__bomb.exploding else 'bomb'
+        for position in self.__bomb_positions:
+            owner = self.__owners[self.__cell(position)]
+            hit = list(heads.get(position, ())) + ([owner] if owner != NO_OWNER else [])
+            for snake in hit:
+                if causes.get(snake) != 'out_of_bounds':
+                    causes[snake] = cause
+        return causes
+
+    def __kill(self, snake: int, cause: DeathCause) -> None:
+        """
+        Removes a snake from the board.
+        :param snake: Index of the snake.
+        :param cause: The cause of its death.
+        :return: None.
+        """
+        self.__alive[snake] = False
+        self.__death_causes[snake] = cause
+        for position in self.__snakes[snake].snake_positions():
+            self.__unmark_snake(position, snake)
+
+    def __eat_apple(self, snake: int) -> None:
+        """
+        Lets a snake eat the apple its head is on, if there is one.
+        :param snake: Index of the snake.
+        :return: None.
+        """
+        head = self.__snakes[snake].head
+        apple = self.__apples.pop(head, None)
+        if apple is None:
+            return None
+        self.__snakes[snake].grow_by_x(self.__config.growth_length)
+        self.__scores[snake] += apple.score
+        self.__board.unmark(self.__cell(head), APPLE_CELL)
+        return None
+
+    def tick(self, directions: Sequence[Optional[str]]) -> bool:
+        """
+        Implements one tick(round) of the game. All the snakes move at the same time, and the snakes that hit a wall,
+        a snake, the bomb or the shock wave die. Snakes whose heads meet all die.
+        :param directions: Desired direction of every snake, ignored for dead snakes.
+        :return: True if any snake is still alive, False if not.
+        """
+        heads: Dict[Tuple[int, int], List[int]] = {}
+        for i, snake in enumerate(self.__snakes):
+            if self.__alive[i]:
+                snake.turn(directions[i])
+                head, vacated = snake.move()
+                if vacated is not None:
+                    self.__unmark_snake(vacated, i)
+                heads.setdefault(head, []).append(i)
+        self.__bomb.tick()
+        self.__update_bomb_positions()
+
+        causes = self.__find_collisions(heads)
+        for head, snakes in heads.items():
+            if snakes[0] not in causes:
+                self.__mark_snake(head, snakes[0])
+        for snake, cause in causes.items():
+            self.__kill(snake, cause)
+
+        lengths = sum(len(snake) for i, snake in enumerate(self.__snakes) if self.__alive[i])
+        if lengths >= len(self.__board) - self.__config.minimum_length:
+            for i in range(len(self.__snakes)):
+                if self.__alive[i]:
+                    self.__kill(i, 'board_full')
+        for i in range(len(self.__snakes)):
+            if self.__alive[i]:
+                self.__eat_apple(i)
+        self.__check_bomb()
+        self.__check_num_of_apples()
+        return any(self.__alive)
+
+    def occupant(self, position: Tuple[int, int]) -> int:
+        """
+        Returns the owner codes of a cell on the board.
+        :param position: Position to be checked, must be in bounds.
+        :return: A combination of SNAKE_CELL, APPLE_CELL and BOMB_CELL, EMPTY_CELL if nothing is there.
+        """
+        return self.__board.cells[position[1] * self.__width + position[0]]
+
+    def snake_at(self, position: Tuple[int, int]) -> Optional[int]:
+        """
+        Returns the snake that occupies a cell on the board.
+        :param position: Position to be checked, must be in bounds.
+        :return: The index of the snake, None if no snake is there.
+        """
+        owner = self.__owners[position[1] * self.__width + position[0]]
+        return None if owner == NO_OWNER else owner
+
+    def snake_positions(self, snake: int) -> List[Tuple[int, int]]:
+        """
+        :param snake: Index of the snake.
+        :return: The positions of the snake, from the tail to the head.
+        """
+        return self.__snakes[snake].snake_positions()
+
+    def view(self, snake: int) -> 'SnakeView':
+        """
+        :param snake: Index of the snake.
+        :return: The game as seen by one of the snakes, to be passed to single snake agents.
+        """
+        return SnakeView(self, snake)
+
+    def as_colours(self) -> Dict[str, List[Tuple[int, int]]]:
+        """
+        Uses all known positions to create a dictionary that is used to colour the board. Every snake is drawn in a
+        different colour.
+        :return: Dictionary of colours as keys and positions as values.
+        """
+        colours: Dict[str, List[Tuple[int, int]]] = {}
+        for i, snake in enumerate(self.__snakes):
+            if self.__alive[i]:
+                colours.setdefault(SNAKE_COLOURS[i % len(SNAKE_COLOURS)], []).extend(snake.snake_positions())
+        colours['green'] = list(self.__apples)
+        colours['orange' if self.__bomb.exploding else 'red'] = self.__bomb_positions
+        return colours
+
+    @property
+    def number_of_snakes(self) -> int:
+        return len(self.__snakes)
+
+    @property
+    def config(self) -> GameConfig:
+        return self.__config
+
+    @property
+    def seed(self) -> int:
+        return self.__seed
+
+    @property
+    def alive(self) -> List[bool]:
+        return list(self.__alive)
+
+    @property
+    def scores(self) -> List[int]:
+        return list(self.__scores)
+
+    @property
+    def death_causes(self) -> List[Optional[DeathCause]]:
+        return list(self.__death_causes)
+
+    @property
+    def apple_positions(self) -> List[Tuple[int, int]]:
+        return list(self.__apples)
+
+    @property
+    def bomb(self) -> Bomb:
+        return self.__bomb
+
+    def snake(self, snake: int) -> Snake:
+        """
+        :param snake: Index of the snake.
+        :return: The snake, must not be changed.
+        """
+        return self.__snakes[snake]
+
+
+class SnakeView:
+    """
+    The part of the interface of GameManager that agents use, for one of the snakes of a MultiGameManager. Other
+    snakes appear as SNAKE_CELL cells on the board.
+    """
+    def __init__(self, game: MultiGameManager, snake: int):
+        """
+        Constructor for the SnakeView class.
+        :param game: The game.
+        :param snake: Index of the snake.
+        """
+        self.__game = game
+        self.__snake = snake
+
+    def occupant(self, position: Tuple[int, int]) -> int:
+        """
+        :param position: Position to be checked, must be in bounds.
+        :return: The owner codes of the cell, see MultiGameManager.occupant.
+        """
+        return self.__game.occupant(position)
+
+    @property
+    def config(self) -> GameConfig:
+        return self.__game.config
+
+    @property
+    def head(self) -> Tuple[int, int]:
+        return self.__game.snake(self.__snake).head
+
+    @property
+    def direction(self) -> str:
+        return self.__game.snake(self.__snake).direction
+
+    @property
+    def length(self) -> int:
+        return len(self.__game.snake(self.__snake))
+
+    @property
+    def score(self) -> int:
+        return self.__game.scores[self.__snake]
+
+    @property
+    def apple_positions(self) -> List[Tuple[int, int]]:
+        return self.__game.apple_positions
+
+    @property
+    def bomb(self) -> Bomb:
+        return self.__game.bomb
+
+
+def run_match(agents: Sequence[Agent], max_ticks: Optional[int] = None,
+              game: Optional[MultiGameManager] = None) -> MatchStats:
+    """
+    Plays a game with a snake for every agent, without a display.
+    :param agents: Functions that receive the game as seen by their snake and return the key pressed this tick.
+    Agents that keep state between ticks, like Autopilot, need a separate instance for every snake.
+    :param max_ticks: Maximum amount of ticks to play, None to play until all the snakes die.
+    :param game: The game to play, a new MultiGameManager with a snake per agent is created if None is given.
+    :return: MatchStats of the game played.
+    """
+    if game is None:
+        game = MultiGameManager(len(agents))
+    views = [game.view(i) for i in range(len(agents))]
+    ticks = 0
+    start = time.perf_counter()
+    while max_ticks is None or ticks < max_ticks:
+        ticks += 1
+        alive = game.alive
+        if not game.tick([agent(view) if is_alive else None for agent, view, is_alive in zip(agents, views, alive)]):
+            break
+    return MatchStats(ticks, game.scores, game.death_causes, time.perf_counter() - start)
@@ -0,0 +1,149 @@
+##########################################################################################
+# FILE : rasterizer.py
+# WRITER : Yonatan Zhenin , Yonatanzh , 208623397, Yahel Uffenheimer, yahelo, 318377751
+# EXERCISE : intro2cs1 ex10 2021
+# DESCRIPTION: Renders boards of the game into RGB NumPy frames without a display, and writes them to disk.
+##########################################################################################
+import struct
+import zlib
+from typing import Dict, List, Tuple, Optional, Any
+
+import numpy as np
+
+from game_manager import SNAKE_CELL, APPLE_CELL, BOMB_CELL
+
+# colours are drawn the same as their tkinter names.
+COLOURS: Tuple[str, ...] = ('white', 'black', 'green', 'red', 'orange', 'blue', 'purple', 'brown', 'gray', 'cyan',
+                            'magenta', 'navy')
+PALETTE = np.array([
+    (255, 255, 255), (0, 0, 0), (0, 255, 0), (255, 0, 0), (255, 165, 0), (0, 0, 255), (160, 32, 240), (165, 42, 42),
+    (190, 190, 190), (0, 255, 255), (255, 0, 255), (0, 0, 128)], dtype=np.uint8)
+BACKGROUND, SNAKE, APPLE, BOMB, SHOCK_WAVE = range(5)
+DEFAULT_CELL_SIZE = 15
+
+# the colour of every combination of owner codes, the bomb is drawn over apples and apples over the snake.
+_OWNER_COLOURS = np.array([
+    BOMB if owners & BOMB_CELL else APPLE if owners & APPLE_CELL else SNAKE if owners & SNAKE_CELL else BACKGROUND
+    for owners in range(256)], dtype=np.uint8)
+
+NPY_HEADER_SIZE = 128
+
+
+def colour_codes(colours: Dict[str, List[Tuple[int, int]]], width: int, height: int) -> np.ndarray:
+    """
+    Converts the colours of a board, as returned by GameManager.as_colours, to an array of indices into COLOURS.
+    Later colours in the dictionary are drawn over earlier ones, and positions out of the board are left out.
+    :param colours: Dictionary of colours as keys and positions as values.
+    :param width: The width of the board.
+    :param height: The height of the board.
+    :return: Array of shape (height, width), with the y axis pointing down like in the display.
+    """
+    codes = np.zeros((height, width), dtype=np.uint8)
+    for colour, positions in colours.items():
+        if not positions:
+            continue
+        xs, ys = np.array(positions, dtype=np.intp).T
+        on_board = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+        codes[height - 1 - ys[on_board], xs[on_board]] = COLOURS.index(colour)
+    return codes
+
+
+def board_codes(boards: np.ndarray, exploding: np.ndarray, width: int, height: int) -> np.ndarray:
+    """
+    Converts boards of owner codes, like BatchGameManager.boards, to arrays of indices into COLOURS.
+    :param boards: Array of shape (number of boards, width * height), with cells numbered y * width + x.
+    :param exploding: Boolean array of shape (number of boards,), True for boards whose bomb is exploding.
+    :param width: The width of the boards.
+    :param height: The height of the boards.
+    :return: Array of shape (number of boards, height, width), with the y axis pointing down like in the display.
+    """
+    codes = _OWNER_COLOURS[boards].reshape(len(boards), height, width)[:, ::-1]
+    codes[(codes == BOMB) & exploding[:, None, None]] = SHOCK_WAVE
+    return codes
+
+
+def rasterize(codes: np.ndarray, cell_size: int = DEFAULT_CELL_SIZE) -> np.ndarray:
+    """
+    Renders boards of colour indices into RGB frames, every cell as a square of cell_size pixels.
+    :param codes: Array of indices into COLOURS of shape (..., height, width), e.g a batch of boards.
+    :param cell_size: The width and height of a cell in pixels.
+    :return: Array of shape (..., height * cell_size, width * cell_size, 3) and type uint8.
+    """
+    cells = PALETTE[codes]
+    *batch, height, width, _ = cells.shape
+    cells = cells.reshape(*batch, height, 1, width, 1, 3)
+    return np.broadcast_to(cells, (*batch, height, cell_size, width, cell_size, 3)).reshape(
+        *batch, height * cell_size, width * cell_size, 3)
+
+
+class FrameWriter:
+    """
+    Streams frames of the same size to a .npy file, that np.load reads as a single array of shape
+    (number of frames, height, width, 3), also with mmap_mode. The amount of frames is written on close.
+    """
+    def __init__(self, path: str):
+        """
+        Constructor for the FrameWriter class.
+        :param path: The path of the file to create.
+        """
+        self.__file = open(path, 'wb')
+        self.__file.write(b'\0' * NPY_HEADER_SIZE)
+        self.__frame_shape: Optional[Tuple[int, ...]] = None
+        self.__count = 0
+
+    def write(self, frames: np.ndarray) -> None:
+        """
+        Appends frames to the file.
+        :param frames: A frame of shape (height, width, 3) or frames of shape (number of frames, height, width, 3).
+        :return: None.
+        """
+        frames = np.asarray(frames, dtype=np.uint8)
+        if frames.ndim == 3:
+            frames = frames[None]
+        if self.__frame_shape is None:
+            self.__frame_shape = frames.shape[1:]
+        elif frames.shape[1:] != self.__frame_shape:
+            raise ValueError("frame of shape " + str(frames.shape[1:]) + " in a file of " + str(self.__frame_shape))
+        self.__file.write(np.ascontiguousarray(frames).data)
+        self.__count += len(frames)
+
+    def close(self) -> None:
+        """
+        Writes the header with the amount of frames and closes the file.
+        :return: None.
+        """
+        if self.__file.closed:
+            return
+        shape = (self.__count,) + (self.__frame_shape or (0, 0, 3))
+        header = "{'descr': '|u1', 'fortran_order': False, 'shape': %r, }" % (shape,)
+        header = header.ljust(NPY_HEADER_SIZE - 11) + '\n'
+        self.__file.seek(0)
+        self.__file.write(b'\x93NUMPY\x01\x00' + struct.pack('<H', len(header)) + header.encode('latin1'))
+        self.__file.close()
+
+    def __enter__(self) -> 'FrameWriter':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.__count
+
+
+def write_png(path: str, frame: np.ndarray) -> None:
+    """
+    Writes a single frame as a PNG image, e.g for thumbnails.
+    :param path: The path of the file to create.
+    :param frame: Array of shape (height, width, 3) and type uint8.
+    :return: None.
+    """
+    height, width, _ = frame.shape
+    rows = np.zeros((height, 1 + 3 * width), dtype=np.uint8)
+    rows[:, 1:] = frame.reshape(height, 3 * width)
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+    with open(path, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)) +
+                chunk(b'IDAT', zlib.compress(rows.tobytes())) + chunk(b'IEND', b''))
@@ -0,0 +1,396 @@
+##########################################################################################
+# FILE : replay.py
+# WRITER : Yonatan Zhenin , Yonatanzh , 208623397, Yahel Uffenheimer, yahelo, 318377751
+# EXERCISE : intro2cs1 ex10 2021
+# DESCRIPTION: Recording and replaying games, from their seed and the keys pressed or as indexed board diffs.
+##########################################################################################
+import mmap
+import os
+import struct
+import zlib
+from array import array
+from typing import List, Optional, Tuple, Dict, Iterator, Any
+
+from game_manager import GameManager, Colour
+from game_parameters import GameConfig, DEFAULT_CONFIG
+from headless import Agent, GameStats, idle_agent, run_headless
+
+KEYS: Tuple[Optional[str], ...] = (None, 'Up', 'Down', 'Left', 'Right')
+# a replay starts with the magic, the seed, the amount of ticks and the parameters of the game, followed by the
+# compressed keys. replays of the older SNKR format have no parameters, and are of games with DEFAULT_CONFIG.
+REPLAY_MAGIC = b'SNKC'
+REPLAY_HEADER = struct.Struct('<4sQI13i')
+UNCONFIGURED_REPLAY_MAGIC = b'SNKR'
+UNCONFIGURED_REPLAY_HEADER = struct.Struct('<4sQI')
+
+# an indexed replay file starts with the magic, the keyframe interval and the size of the board, followed by a
+# record for every tick: its kind, the key pressed, the score and the size of the data. keyframes hold the encoded
+# game, diffs hold the cells (y * width + x) that changed as little endian 32 bit integers, followed by their
+# colours as indices into CELL_COLOURS. a closed file ends with the offsets of the keyframes and the trailer.
+INDEX_MAGIC = b'SNKI'
+INDEX_HEADER = struct.Struct('<4sIii')
+RECORD_HEADER = struct.Struct('<BBqI')
+INDEX_TRAILER = struct.Struct('<QQQ4s')
+DIFF_RECORD, KEYFRAME_RECORD = 0, 1
+CELL_COLOURS: Tuple[Optional[Colour], ...] = (None, 'black', 'green', 'red', 'orange')
+KEYFRAME_INTERVAL = 1000
+
+
+class Replay:
+    """
+    A game, stored as the seed of its random generator, its parameters and the key pressed in every tick.
+    """
+    def __init__(self, seed: int, keys: Optional[List[Optional[str]]] = None, config: Optional[GameConfig] = None):
+        """
+        Constructor for the Replay class.
+        :param seed: The seed the game was created with.
+        :param keys: The key pressed in every tick, None for ticks where no key was pressed.
+        :param config: The parameters of the game, DEFAULT_CONFIG if None.
+        """
+        self.__seed = seed
+        self.__config = config or DEFAULT_CONFIG
+        self.__codes = bytearray()
+        for key in keys or []:
+            self.record(key)
+
+    def record(self, key: Optional[str]) -> None:
+        """
+        Adds the key pressed in the next tick. Keys the game ignores are stored as None.
+        :param key: The key pressed.
+        :return: None.
+        """
+        self.__codes.append(KEYS.index(key) if key in KEYS else 0)
+
+    def recording(self, agent: Agent) -> Agent:
+        """
+        Wraps an agent so that every key it presses is recorded.
+        :param agent: The agent to wrap.
+        :return: An agent that presses the same keys as the given one.
+        """
+        def wrapped(game: GameManager) -> Optional[str]:
+            key = agent(game)
+            self.record(key)
+            return key
+        return wrapped
+
+    def to_bytes(self) -> bytes:
+        """
+        :return: The replay in a compressed binary format.
+        """
+        config = self.__config
+        return REPLAY_HEADER.pack(REPLAY_MAGIC, self.__seed, len(self.__codes), config.width, config.height,
+                                  config.number_of_apples, config.growth_length, *config.initial_position,
+                                  config.initial_length, *config.apple_score_range, *config.bomb_radius_range,
+                                  *config.bomb_time_range) + zlib.compress(bytes(self.__codes))
+
+    @classmethod
+    def from_bytes(cls, data: bytes):
+        """
+        Reads a replay created by to_bytes, or by the older format without the parameters of the game.
+        :param data: The binary replay.
+        :return: A Replay object.
+        """
+        magic = data[:len(REPLAY_MAGIC)]
+        if magic == REPLAY_MAGIC:
+            (_, seed, ticks, width, height, number_of_apples, growth_length, x, y, initial_length, min_score,
+             max_score, min_radius, max_radius, min_time, max_time) = REPLAY_HEADER.unpack_from(data)
+            config = GameConfig(width, height, number_of_apples, growth_length, (x, y), initial_length,
+                                (min_score, max_score), (min_radius, max_radius), (min_time, max_time))
+            header_size = REPLAY_HEADER.size
+        elif magic == UNCONFIGURED_REPLAY_MAGIC:
+            _, seed, ticks = UNCONFIGURED_REPLAY_HEADER.unpack_from(data)
+            config, header_size = DEFAULT_CONFIG, UNCONFIGURED_REPLAY_HEADER.size
+        else:
+            raise ValueError("not a replay")
+        codes = zlib.decompress(data[header_size:])
+        if len(codes) != ticks:
+            raise ValueError("replay is truncated")
+        replay = cls(seed, config=config)
+        replay.__codes = bytearray(codes)
+        return replay
+
+    def play(self, ticks: Optional[int] = None) -> GameManager:
+        """
+        Reconstructs the game by playing the recorded keys, without a display.
+        :param ticks: The amount of ticks to fast-forward, None to play the whole recording.
+        :return: The game, after the given amount of ticks.
+        """
+        game = GameManager(self.__seed, self.__config)
+        for code in self.__codes[:ticks]:
+            if not game.tick(KEYS[code]):
+                break
+        return game
+
+    @property
+    def seed(self) -> int:
+        return self.__seed
+
+    @property
+    def config(self) -> GameConfig:
+        return self.__config
+
+    @property
+    def keys(self) -> List[Optional[str]]:
+        return [KEYS[code] for code in self.__codes]
+
+    def __len__(self) -> int:
+        return len(self.__codes)
+
+
+def record_headless(agent: Agent = idle_agent, seed: Optional[int] = None, max_ticks: Optional[int] = None,
+                    config: Optional[GameConfig] = None) -> Tuple[Replay, GameStats]:
+    """
+    Plays a single game without a display and records it.
+    :param agent: Function that receives the game and returns the key pressed this tick, or None.
+    :param seed: Seed for the game, a random seed is picked if None.
+    :param max_ticks: Maximum amount of ticks to play, None to play until the game ends.
+    :param config: The parameters of the game, DEFAULT_CONFIG if None.
+    :return: The replay of the game and its GameStats.
+    """
+    game = GameManager(seed, config)
+    replay = Replay(game.seed, config=game.config)
+    return replay, run_headless(replay.recording(agent), max_ticks, game)
+
+
+def _cells(colours: Dict[Colour, List[Tuple[int, int]]], width: int, height: int) -> Dict[int, Colour]:
+    """
+    Internal: converts the colours of a board, as returned by GameManager.as_colours, to the colour of every cell.
+    :param colours: Dictionary of colours as keys and positions as values, later colours are drawn over earlier ones.
+    :param width: The width of the board.
+    :param height: The height of the board.
+    :return: Dictionary of cells (y * width + x) as keys and their colours as values, without positions out of the
+    board.
+    """
+    return {y * width + x: colour for colour, positions in colours.items() for x, y in positions
+            if 0 <= x < width and 0 <= y < height}
+
+
+class ReplayWriter:
+    """
+    Appends a game to an indexed replay file as it's played, a record for every tick. Every keyframe_interval ticks
+    the record is a keyframe with the whole game, and the other records only have the cells that changed, so
+    ReplayReader can go to any tick without playing the game from the start.
+    """
+    def __init__(self, path: str, game: GameManager, keyframe_interval: int = KEYFRAME_INTERVAL):
+        """
+        Constructor for the ReplayWriter class, writes the first keyframe, of the game before its first tick.
+        :param path: The path of the file to create.
+        :param game: The game to record.
+        :param keyframe_interval: The amount of ticks between keyframes, at least 1.
+        """
+        if keyframe_interval <= 0:
+            raise ValueError("keyframe interval of " + str(keyframe_interval) + " ticks")
+        self.__file = open(path, 'wb')
+        self.__game = game
+        self.__width, self.__height = game.config.width, game.config.height
+        self.__keyframe_interval = keyframe_interval
+        self.__cells: Dict[int, Colour] = {}
+        self.__keyframes = array('q')
+        self.__offset = self.__file.write(INDEX_HEADER.pack(INDEX_MAGIC, keyframe_interval, self.__width,
+                                                            self.__height))
+        self.__ticks = 0
+        self.__write_tick(None)
+
+    def record(self, key: Optional[str]) -> None:
+        """
+        Appends the tick the game has just played.
+        :param key: The key pressed in the tick.
+        :return: None.
+        """
+        self.__write_tick(key)
+
+    def __write_tick(self, key: Optional[str]) -> None:
+        """
+        Internal: appends a record of the current state of the game.
+        :param key: The key pressed in the tick.
+        :return: None.
+        """
+        cells = _cells(self.__game.as_colours(), self.__width, self.__height)
+        if self.__ticks % self.__keyframe_interval == 0:
+            kind, data = KEYFRAME_RECORD, self.__game.encode()
+            self.__keyframes.append(self.__offset)
+        else:
+            previous = self.__cells
+            changed = [cell for cell, colour in cells.items() if previous.get(cell) != colour] + \
+                [cell for cell in previous if cell not in cells]
+            kind = DIFF_RECORD
+            data = struct.pack('<%di' % len(changed), *changed) + \
+                bytes(CELL_COLOURS.index(cells.get(cell)) for cell in changed)
+        self.__cells = cells
+        self.__offset += self.__file.write(RECORD_HEADER.pack(kind, KEYS.index(key) if key in KEYS else 0,
+                                                              self.__game.score, len(data)))
+        self.__offset += self.__file.write(data)
+        self.__ticks += 1
+
+    def close(self) -> None:
+        """
+        Writes the index of the keyframes and closes the file. A file that wasn't closed can still be read, but
+        ReplayReader has to find the keyframes first.
+        :return: None.
+        """
+        if self.__file.closed:
+            return
+        self.__file.write(struct.pack('<%dq' % len(self.__keyframes), *self.__keyframes))
+        self.__file.write(INDEX_TRAILER.pack(self.__offset, self.__ticks, len(self.__keyframes), INDEX_MAGIC))
+        self.__file.close()
+
+    def __enter__(self) -> 'ReplayWriter':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.__ticks
+
+
+class ReplayReader:
+    """
+    Reads an indexed replay file created by ReplayWriter. The file is memory mapped, and going to a tick reads only
+    the keyframe before it and the diffs in between, so any tick of a long game is found right away. Tick 0 is the
+    game before its first tick.
+    """
+    def __init__(self, path: str):
+        """
+        Constructor for the ReplayReader class.
+        :param path: The path of the file.
+        """
+        self.__file = open(path, 'rb')
+        try:
+            self.__map_file()
+        except Exception:
+            self.__file.close()
+            raise
+
+    def __map_file(self) -> None:
+        """
+        Internal: checks the size of the file against its header and trailer, maps it and reads its index, the
+        keyframes are found by going over the records if the file wasn't closed. The map is closed on any error.
+        :return: None.
+        """
+        size = os.fstat(self.__file.fileno()).st_size
+        if size < INDEX_HEADER.size:
+            raise ValueError("indexed replay of " + str(size) + " bytes, shorter than its header")
+        self.__map = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, self.__keyframe_interval, self.__width, self.__height = INDEX_HEADER.unpack_from(self.__map)
+            if magic != INDEX_MAGIC or self.__keyframe_interval < 1:
+                raise ValueError("not an indexed replay")
+            trailer_offset = size - INDEX_TRAILER.size
+            if trailer_offset >= INDEX_HEADER.size and self.__map[-len(INDEX_MAGIC):] == INDEX_MAGIC:
+                index_offset, self.__ticks, keyframes, _ = INDEX_TRAILER.unpack_from(self.__map, trailer_offset)
+                if index_offset < INDEX_HEADER.size or index_offset + 8 * keyframes != trailer_offset:
+                    raise ValueError("index of " + str(keyframes) + " keyframes at " + str(index_offset) +
+                                     " doesn't end at the trailer at " + str(trailer_offset))
+                self.__keyframes = array('q', struct.unpack_from('<%dq' % keyframes, self.__map, index_offset))
+            else:
+                self.__find_keyframes()
+        except Exception:
+            self.__map.close()
+            raise
+
+    def __find_keyframes(self) -> None:
+        """
+        Internal: indexes the keyframes of a file that wasn't closed by going over all the records. A record that
+        was only partly written is ignored.
+        :return: None.
+        """
+        self.__keyframes, self.__ticks = array('q'), 0
+        offset, end = INDEX_HEADER.size, len(self.__map)
+        while offset + RECORD_HEADER.size <= end:
+            kind, _, _, size = RECORD_HEADER.unpack_from(self.__map, offset)
+            if offset + RECORD_HEADER.size + size > end:
+                break
+            if kind == KEYFRAME_RECORD:
+                self.__keyframes.append(offset)
+            offset += RECORD_HEADER.size + size
+            self.__ticks += 1
+
+    def __records(self, tick: int) -> Iterator[Tuple[int, int, int, bytes]]:
+        """
+        Internal: reads the records from the keyframe before a tick up to the tick.
+        :param tick: The last tick to read.
+        :return: Iterator of the kind, the key code, the score and the data of every record.
+        """
+        if not 0 <= tick < self.__ticks:
+            raise IndexError("tick " + str(tick) + " of a replay of " + str(self.__ticks) + " ticks")
+        offset = self.__keyframes[tick // self.__keyframe_interval]
+        for _ in range(tick % self.__keyframe_interval + 1):
+            kind, key, score, size = RECORD_HEADER.unpack_from(self.__map, offset)
+            offset += RECORD_HEADER.size
+            yield kind, key, score, self.__map[offset:offset + size]
+            offset += size
+
+    def cells(self, tick: int) -> Dict[Tuple[int, int], Colour]:
+        """
+        :param tick: The tick.
+        :return: Dictionary of the positions on the board that aren't empty after the tick as keys, and their colours
+        as values.
+        """
+        cells: Dict[int, Colour] = {}
+        for kind, _, _, data in self.__records(tick):
+            if kind == KEYFRAME_RECORD:
+                cells = _cells(GameManager.decode(data).as_colours(), self.__width, self.__height)
+                continue
+            count = len(data) // 5
+            for cell, colour in zip(struct.unpack_from('<%di' % count, data), data[4 * count:]):
+                if colour:
+                    cells[cell] = CELL_COLOURS[colour]
+                else:
+                    cells.pop(cell, None)
+        return {(cell % self.__width, cell // self.__width): colour for cell, colour in cells.items()}
+
+    def as_colours(self, tick: int) -> Dict[Colour, List[Tuple[int, int]]]:
+        """
+        :param tick: The tick.
+        :return: Dictionary of colours as keys and the positions on the board drawn in them after the tick as values.
+        """
+        colours: Dict[Colour, List[Tuple[int, int]]] = {}
+        for position, colour in self.cells(tick).items():
+            colours.setdefault(colour, []).append(position)
+        return colours
+
+    def score(self, tick: int) -> int:
+        """
+        :param tick: The tick.
+        :return: The score after the tick.
+        """
+        score = 0
+        for _, _, score, _ in self.__records(tick):
+            pass
+        return score
+
+    def game(self, tick: int) -> GameManager:
+        """
+        Reconstructs the game after a tick, by playing the recorded keys from the keyframe before it.
+        :param tick: The tick.
+        :return: The game.
+        """
+        game = None
+        for kind, key, _, data in self.__records(tick):
+            if kind == KEYFRAME_RECORD:
+                game = GameManager.decode(data)
+            else:
+                game.tick(KEYS[key])
+        return game
+
+    def close(self) -> None:
+        """
+        Closes the file.
+        :return: None.
+        """
+        self.__map.close()
+        self.__file.close()
+
+    def __enter__(self) -> 'ReplayReader':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.__ticks
+
+    @property
+    def keyframe_interval(self) -> int:
+        return self.__keyframe_interval
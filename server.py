@@ -0,0 +1,224 @@
+##########################################################################################
+# FILE : server.py
+# WRITER : Yonatan Zhenin , Yonatanzh , 208623397, Yahel Uffenheimer, yahelo, 318377751
+# EXERCISE : intro2cs1 ex10 2021
+# DESCRIPTION: Server that hosts many games on one asyncio event loop and streams them over TCP.
+##########################################################################################
+import asyncio
+import heapq
+import json
+import random
+from typing import Optional, List, Tuple, Dict, Set, Any
+
+from game_parameters import GameConfig
+from game_manager import GameManager
+from headless import ALLOWED_KEYS
+from instrumentation import Histogram
+
+ROUND_TIME = 0.1
+MAX_WRITE_BUFFER = 1 << 16
+BACKLOG = 1024
+
+
+class _Session:
+    """
+    Internal: a game played by a single client.
+    """
+    def __init__(self, game: GameManager, writer: asyncio.StreamWriter, due: float):
+        self.game = game
+        self.writer = writer
+        self.due = due
+        self.key: Optional[str] = None
+        self.ticks = 0
+        self.is_over = False
+
+
+def encode(message: Dict[str, Any]) -> bytes:
+    """
+    Encodes a message of the protocol, a JSON object per line.
+    :param message: The message.
+    :return: The encoded message.
+    """
+    return json.dumps(message, separators=(',', ':')).encode() + b'\n'
+
+
+class GameServer:
+    """
+    Hosts a game for every client that connects, all on the same event loop.
+    The server sends a JSON object per line: 'start' with the seed and the size of the board, 'tick' with the tick
+    number, the score and the cells that changed as [x, y, colour] lists (colour is null for cells that were cleared),
+    and 'end' with the score and the cause of death, after which the connection is closed. The first tick message
+    has the whole board. The client sends the keys it presses, one per line; the last key before a tick is used.
+    A single scheduler task wakes up when the earliest game is due, and ticks every game that is due by then.
+    """
+    def __init__(self, round_time: float = ROUND_TIME, config: Optional[GameConfig] = None,
+                 seed: Optional[int] = None):
+        """
+        Constructor for the GameServer class.
+        :param round_time: Seconds between the ticks of a game.
+        :param config: The parameters of the games, DEFAULT_CONFIG if None.
+        :param seed: Seed that the seeds of the games are drawn from, None for an unpredictable seed.
+        """
+        self.__round_time = round_time
+        self.__config = config
+        self.__seeds = random.Random(seed)
+        self.__schedule: List[Tuple[float, int, _Session]] = []
+        self.__sessions_created = 0
+        self.__has_sessions = asyncio.Event()
+        self.__server: Optional[asyncio.AbstractServer] = None
+        self.__scheduler: Optional[asyncio.Task] = None
+        self.__handlers: Set[asyncio.Task] = set()
+        self.lateness_us = Histogram()
+        self.wakeup_us = Histogram()
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> Tuple[str, int]:
+        """
+        Starts accepting clients and ticking their games.
+        :param host: The address to listen on.
+        :param port: The port to listen on, 0 for any free port.
+        :return: The address and port the server listens on.
+        """
+        self.__server = await asyncio.start_server(self.__handle_client, host, port, backlog=BACKLOG)
+        self.__scheduler = asyncio.get_running_loop().create_task(self.__run_scheduler())
+        return self.__server.sockets[0].getsockname()[:2]
+
+    async def close(self) -> None:
+        """
+        Stops the server and disconnects all the clients.
+        :return: None.
+        """
+        self.__server.close()
+        self.__scheduler.cancel()
+        for handler in self.__handlers:
+            handler.cancel()
+        await asyncio.gather(self.__scheduler, *self.__handlers, return_exceptions=True)
+        await self.__server.wait_closed()
+        self.__schedule = []
+
+    async def __handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Internal: starts a game for a new client, and reads its keys until it disconnects. The connection is closed
+        when the handler returns, including when it's cancelled by close.
+        :param reader: Stream of the client's messages.
+        :param writer: Stream to the client.
+        :return: None.
+        """
+        loop = asyncio.get_running_loop()
+        handler = asyncio.current_task()
+        self.__handlers.add(handler)
+        game = GameManager(self.__seeds.getrandbits(63), self.__config)
+        session = _Session(game, writer, loop.time())
+        writer.write(encode({'type': 'start', 'seed': game.seed, 'width': game.config.width,
+                             'height': game.config.height}))
+        self.__send_tick(session)
+        self.__sessions_created += 1
+        heapq.heappush(self.__schedule, (session.due + self.__round_time, self.__sessions_created, session))
+        self.__has_sessions.set()
+        try:
+            while not session.is_over:
+                line = await reader.readline()
+                if not line:
+                    break
+                key = line.decode(errors='replace').strip()
+                if key in ALLOWED_KEYS:
+                    session.key = key
+        except ConnectionError:
+            pass
+        finally:
+            session.is_over = True
+            writer.close()
+            self.__handlers.discard(handler)
+
+    @staticmethod
+    def __send_tick(session: _Session) -> None:
+        """
+        Internal: sends the cells that changed in the last tick of a game to its client.
+        :param session: The session of the game.
+        :return: None.
+        """
+        cells = [[x, y, colour] for (x, y), colour in session.game.pop_changed_cells().items()]
+        session.writer.write(encode({'type': 'tick', 'tick': session.ticks, 'score': session.game.score,
+                                     'cells': cells}))
+
+    def __tick_session(self, session: _Session) -> None:
+        """
+        Internal: plays one tick of a game and sends the result to its client. Clients that don't read fast enough
+        are disconnected, so they can't make the server buffer without limit.
+        :param session: The session of the game.
+        :return: None.
+        """
+        key, session.key = session.key, None
+        is_alive = session.game.tick(key)
+        session.ticks += 1
+        self.__send_tick(session)
+        if not is_alive:
+            session.writer.write(encode({'type': 'end', 'score': session.game.score,
+                                         'death_cause': session.game.death_cause}))
+            session.is_over = True
+        if session.is_over or session.writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+            session.is_over = True
+            session.writer.close()
+
+    async def __run_scheduler(self) -> None:
+        """
+        Internal: ticks every game when it's due. Games that fall behind skip the missed rounds instead of ticking
+        several times in a row, their next tick is a round after the late one.
+        :return: None.
+        """
+        loop = asyncio.get_running_loop()
+        schedule = self.__schedule
+        while True:
+            if not schedule:
+                self.__has_sessions.clear()
+                await self.__has_sessions.wait()
+                continue
+            delay = schedule[0][0] - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            now = loop.time()
+            while schedule and schedule[0][0] <= now:
+                due, order, session = heapq.heappop(schedule)
+                if session.is_over:
+                    continue
+                self.lateness_us.record(int((now - due) * 1e6))
+                self.__tick_session(session)
+                if not session.is_over:
+                    due += self.__round_time
+                    heapq.heappush(schedule, (due if due > now else now + self.__round_time, order, session))
+            self.wakeup_us.record(int((loop.time() - now) * 1e6))
+
+    @property
+    def number_of_sessions(self) -> int:
+        return len(self.__schedule)
+
+
+async def play_client(host: str, port: int) -> List[Dict[str, Any]]:
+    """
+    Connects to a GameServer and plays without pressing keys until the game ends.
+    :param host: The address of the server.
+    :param port: The port of the server.
+    :return: Every message received from the server.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    messages = []
+    async for line in reader:
+        messages.append(json.loads(line))
+    writer.close()
+    return messages
+
+
+async def _serve(port: int) -> None:
+    """
+    Internal: runs a GameServer until it's interrupted.
+    :param port: The port to listen on.
+    :return: None.
+    """
+    server = GameServer()
+    host, port = await server.start('0.0.0.0', port)
+    print("Serving on %s:%d" % (host, port))
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    import sys
+    asyncio.run(_serve(int(sys.argv[1]) if len(sys.argv) > 1 else 8765))
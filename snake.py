@@ -2,73 +2,33 @@
 # FILE : snake.py
 # WRITER : Yonatan Zhenin , Yonatanzh , 208623397, Yahel Uffenheimer, yahelo, 318377751
 # EXERCISE : intro2cs1 ex10 2021
-# DESCRIPTION: Ligament and Snake class for the ex10 game.
+# DESCRIPTION: Snake class for the ex10 game.
 ##########################################################################################
-from typing import Tuple, Literal, Dict, Callable, Optional, List
+from array import array
+from typing import Tuple, Literal, Dict, Optional, List
 
 Direction = Literal['Up', 'Down', 'Left', 'Right']
 
-
-class Ligament:
-    """
-    Linked list nodes, to be used by the Snake class.
-    """
-
-    def __init__(self, position: Tuple[int, int], next_node: Optional = None):
-        """
-        A constructor for a Ligament object.
-        :param position: The position of the ligament, represented by a Tuple with an x,y coordinates.
-        :param next_node: The next ligament referenced. If The ligament if the head, the value is None.
-        """
-        self.__next = next_node
-        self.__x, self.__y = position
-
-    @property
-    def x(self):
-        return self.__x
-
-    @property
-    def y(self):
-        return self.__y
-
-    @property
-    def next(self):
-        return self.__next
-
-    def set_next(self, next_ligament):
-        """
-        Sets the __next value to point to another Ligament object.
-        :param next_ligament: A Ligament object.
-        :return: None.
-        """
-        self.__next = next_ligament
-
-    def advance(self):
-        """
-        Advances the Ligament forward in the linked list.
-        :return: Returns the next ligament, or None.
-        """
-        n = self.__next
-        self.__next = None
-        return n
+MINIMUM_CAPACITY = 16
+MOVEMENT_DELTAS: Dict[Direction, Tuple[int, int]] = {
+    'Up': (0, 1),
+    'Down': (0, -1),
+    'Right': (1, 0),
+    'Left': (-1, 0)
+}
+ALLOWED_TURNS: Dict[Direction, List[Direction]] = {
+    'Up': ['Up', 'Right', 'Left'],
+    'Down': ['Down', 'Right', 'Left'],
+    'Right': ['Right', 'Up', 'Down'],
+    'Left': ['Left', 'Up', 'Down'],
+}
 
 
 class Snake:
     """
-    Snake that uses the Ligaments class as its infrastructure.
+    Snake that keeps its ligaments in a ring buffer, ordered from the tail to the head.
     """
-    __movement_handlers: Dict[Direction, Callable] = {
-        'Up': lambda head: Ligament((head.x, head.y + 1)),
-        'Down': lambda head: Ligament((head.x, head.y - 1)),
-        'Right': lambda head: Ligament((head.x + 1, head.y)),
-        'Left': lambda head: Ligament((head.x - 1, head.y))
-    }
-    __allowed_turns: Dict[Direction, List[Direction]] = {
-        'Up': ['Up', 'Right', 'Left'],
-        'Down': ['Down', 'Right', 'Left'],
-        'Right': ['Right', 'Up', 'Down'],
-        'Left': ['Left', 'Up', 'Down'],
-    }
+    __slots__ = ('__direction', '__length', '__current_length', '__capacity', '__tail_index', '__xs', '__ys')
 
     def __init__(self, position: Tuple[int, int], direction: Direction, length: int):
         """
@@ -77,51 +37,80 @@ class Snake:
         :param direction: The direction the snake will face once created.
         :param length: The length of the snake.
         """
-        if direction not in self.__movement_handlers:
+        if direction not in MOVEMENT_DELTAS:
             self.__direction = "Up"
         else:
             self.__direction = direction
         self.__length = length
         self.__current_length = 0
-        self.__tail, self.__head = self.__generate_tail_and_head(position, direction, length)
+        self.__capacity = max(2 * length, MINIMUM_CAPACITY)
+        self.__tail_index = 0
+        self.__xs = array('l', bytes(self.__capacity * array('l').itemsize))
+        self.__ys = array('l', bytes(self.__capacity * array('l').itemsize))
+        self.__generate_ligaments(position, length)
 
-    def __generate_tail_and_head(self, position: Tuple[int, int], direction: Direction, length: int) -> \
-            Tuple[Ligament, Ligament]:
+    def __generate_ligaments(self, position: Tuple[int, int], length: int) -> None:
         """
-        Generates all the Ligaments of the Snake based on values received from the constructor.
+        Generates all the ligaments of the Snake based on values received from the constructor, starting from the
+        tail and going in the direction of the snake.
         :param position: The starting position of the snakes tail.
-        :param direction: The direction of the snake. all the Ligaments will be created based on direction given, using
-        handler functions.
-        :param length: The amount of Ligaments to be created.
-        :return: Returns a tuple for pointer for both the head and tail of the snake.
-        """
-        tail = Ligament(position, None)
-        head = tail
-        for _ in range(length - 1):
-            handler = self.__movement_handlers.get(direction)
-            if handler:
-                new = handler(head)
-                head.set_next(new)
-                head = new
+        :param length: The amount of ligaments to be created.
+        :return: None.
+        """
+        dx, dy = MOVEMENT_DELTAS[self.__direction]
+        x, y = position
+        for i in range(length):
+            self.__xs[i], self.__ys[i] = x + i * dx, y + i * dy
         self.__current_length = length
-        return tail, head
 
-    def move(self):
+    def __grow_capacity(self) -> None:
+        """
+        Doubles the size of the ring buffer, unrolling it so the tail is at index 0.
+        :return: None.
+        """
+        start, count = self.__tail_index, self.__current_length
+        xs = self.__xs[start:] + self.__xs[:start]
+        ys = self.__ys[start:] + self.__ys[:start]
+        padding = array('l', bytes(self.__capacity * xs.itemsize))
+        self.__xs, self.__ys = xs + padding, ys + padding
+        self.__capacity *= 2
+        self.__tail_index = 0
+
+    def move(self) -> Tuple[Tuple[int, int], Optional[Tuple[int, int]]]:
         """
         Moves the Snake one position forward depending on the value of its direction.
+        :return: A tuple of the new head position and the position the tail has left, or None if the snake grew.
+        """
+        dx, dy = MOVEMENT_DELTAS[self.__direction]
+        head_index = (self.__tail_index + self.__current_length - 1) % self.__capacity
+        new_head = (self.__xs[head_index] + dx, self.__ys[head_index] + dy)
+        vacated = None
+        if self.__current_length < self.__length:
+            if self.__current_length == self.__capacity:
+                self.__grow_capacity()
+            self.__current_length += 1
+        else:
+            vacated = (self.__xs[self.__tail_index], self.__ys[self.__tail_index])
+            self.__tail_index = (self.__tail_index + 1) % self.__capacity
+        head_index = (self.__tail_index + self.__current_length - 1) % self.__capacity
+        self.__xs[head_index], self.__ys[head_index] = new_head
+        return new_head, vacated
+
+    def unmove(self, vacated: Optional[Tuple[int, int]], direction: Direction, length: int) -> None:
+        """
+        Takes back the last move of the Snake, and sets its direction and length to what they were before it.
+        :param vacated: The position the tail has left in the move, as returned by move.
+        :param direction: The direction of the snake before the move.
+        :param length: The length the snake grows to before the move.
         :return: None.
         """
-        handler = self.__movement_handlers.get(self.__direction)
-        if not handler:
-            # do something bad input
-            pass
-        new_head = handler(self.__head)
-        self.__head.set_next(new_head)
-        self.__head = new_head
-        self.__current_length += 1
-        if self.__current_length > self.__length:
-            self.__tail = self.__tail.advance()
-            self.__current_length -= 1
+        self.__current_length -= 1
+        if vacated is not None:
+            self.__tail_index = (self.__tail_index - 1) % self.__capacity
+            self.__xs[self.__tail_index], self.__ys[self.__tail_index] = vacated
+            self.__current_length += 1
+        self.__direction = direction
+        self.__length = length
 
     def turn(self, turn_direction: Direction):
         """
@@ -129,7 +118,7 @@ class Snake:
         :param turn_direction: New snake direction.
         :return: None.
         """
-        good_options = self.__allowed_turns.get(self.__direction)
+        good_options = ALLOWED_TURNS.get(self.__direction)
         if turn_direction in good_options:
             self.__direction = turn_direction
 
@@ -141,17 +130,78 @@ class Snake:
         """
         self.__length += amount
 
-    def snake_positions(self):
+    def snake_positions(self) -> List[Tuple[int, int]]:
+        """
+        :return: Returns a list of all the positions of the Snakes Ligaments, from the tail to the head.
+        """
+        start, end = self.__tail_index, self.__tail_index + self.__current_length
+        if end <= self.__capacity:
+            return list(zip(self.__xs[start:end], self.__ys[start:end]))
+        end -= self.__capacity
+        return list(zip(self.__xs[start:], self.__ys[start:])) + list(zip(self.__xs[:end], self.__ys[:end]))
+
+    def coordinates(self) -> Tuple[array, array]:
+        """
+        :return: Arrays of the x and of the y coordinates of the Snakes Ligaments, from the tail to the head.
+        """
+        start, end = self.__tail_index, self.__tail_index + self.__current_length
+        if end <= self.__capacity:
+            return self.__xs[start:end], self.__ys[start:end]
+        end -= self.__capacity
+        return self.__xs[start:] + self.__xs[:end], self.__ys[start:] + self.__ys[:end]
+
+    @staticmethod
+    def from_coordinates(xs: array, ys: array, direction: Direction, length: int) -> 'Snake':
         """
-        :return: Returns a list of all the positions of the Snakes Ligaments.
+        Creates a snake in a given state, e.g one that was saved with coordinates.
+        :param xs: The x coordinates of the Ligaments, from the tail to the head.
+        :param ys: The y coordinates of the Ligaments, from the tail to the head.
+        :param direction: The direction of the snake.
+        :param length: The length the snake grows to, at least the amount of Ligaments.
+        :return: The new Snake.
         """
-        coordinates = []
-        current = self.__tail
-        while current:
-            coordinates.append((current.x, current.y))
-            current = current.next
-        return coordinates
+        snake = Snake.__new__(Snake)
+        snake.__direction = direction
+        snake.__length = length
+        snake.__current_length = len(xs)
+        snake.__capacity = max(2 * len(xs), MINIMUM_CAPACITY)
+        snake.__tail_index = 0
+        padding = array('l', bytes((snake.__capacity - len(xs)) * array('l').itemsize))
+        snake.__xs = array('l', xs) + padding
+        snake.__ys = array('l', ys) + padding
+        return snake
+
+    @property
+    def target_length(self) -> int:
+        return self.__length
+
+    def copy(self) -> 'Snake':
+        """
+        Creates an independent snake in the same state, by copying the ring buffer.
+        :return: The new Snake.
+        """
+        snake = Snake.__new__(Snake)
+        snake.__direction = self.__direction
+        snake.__length = self.__length
+        snake.__current_length = self.__current_length
+        snake.__capacity = self.__capacity
+        snake.__tail_index = self.__tail_index
+        snake.__xs = self.__xs[:]
+        snake.__ys = self.__ys[:]
+        return snake
+
+    def __len__(self) -> int:
+        return self.__current_length
+
+    @property
+    def direction(self) -> Direction:
+        return self.__direction
 
     @property
     def head(self) -> Tuple[int, int]:
-        return self.__head.x, self.__head.y
+        head_index = (self.__tail_index + self.__current_length - 1) % self.__capacity
+        return self.__xs[head_index], self.__ys[head_index]
+
+    @property
+    def tail(self) -> Tuple[int, int]:
+        return self.__xs[self.__tail_index], self.__ys[self.__tail_index]
@@ -4,10 +4,23 @@
 # EXERCISE : intro2cs1 ex10 2021
 # DESCRIPTION: The main loop for the game.
 ##########################################################################################
-from game_display import GameDisplay
+from typing import Optional, TYPE_CHECKING
+
 from game_manager import GameManager
+from game_parameters import GameConfig
+from headless import Agent
+from timestep import FixedTimestep
+
+if TYPE_CHECKING:
+    # only imported for type checking, so the rules can run without loading tkinter.
+    from game_display import GameDisplay
 
 ALLOWED_KEYS = ['Up', 'Down', 'Left', 'Right']
+REWIND_KEY = 'BackSpace'
+# 10 seconds at the default round time.
+REWIND_TICKS = 100
+# 3 seconds at the default round time.
+DEATH_WAIT_TICKS = 30
 
 
 def get_key(gd):
@@ -17,32 +30,61 @@ def get_key(gd):
     :return: Key press, if none were pressed, None.
     """
     raw_key = gd.get_key_clicked()
-    if raw_key in ALLOWED_KEYS:
+    if raw_key in ALLOWED_KEYS or raw_key == REWIND_KEY:
         return raw_key
     return None
 
 
-def main_loop(gd: GameDisplay) -> None:
+def wait_for_rewind(gd: 'GameDisplay', timestep: Optional[FixedTimestep], ticks: int = DEATH_WAIT_TICKS) -> bool:
     """
-    The main loop of the snake game.
+    Waits for the user to press REWIND_KEY after the snake died.
     :param gd: GameDisplay class
+    :param timestep: The timing of the ticks, None to check the keys without waiting.
+    :param ticks: The amount of ticks to wait.
+    :return: Whether REWIND_KEY was pressed.
+    """
+    for _ in range(ticks):
+        if timestep is not None:
+            timestep.wait()
+        if get_key(gd) == REWIND_KEY:
+            return True
+    return False
+
+
+def main_loop(gd: 'GameDisplay', config: Optional[GameConfig] = None, agent: Optional[Agent] = None,
+              tick_rate: Optional[float] = None, rewind_ticks: int = REWIND_TICKS) -> None:
+    """
+    The main loop of the snake game. When drawing a round takes longer than a tick, the ticks that are due are all
+    played before the next round is drawn, so the game keeps time. Pressing REWIND_KEY takes back a tick instead of
+    playing one, and the game goes on from there. After the snake dies the game waits DEATH_WAIT_TICKS ticks for
+    REWIND_KEY before it ends, so a death can be taken back too.
+    :param gd: GameDisplay class
+    :param config: The parameters of the game, DEFAULT_CONFIG if None.
+    :param agent: Agent that chooses the keys instead of the user, e.g an Autopilot, None to play with the keyboard.
+    :param tick_rate: Ticks per second, None to play a single tick every round without waiting.
+    :param rewind_ticks: The amount of ticks that can be taken back.
     :return: None
     """
-    game = GameManager()
-    gd.show_score(game.score)
-    first = True
+    game = GameManager(config=config)
+    game.enable_rewind(rewind_ticks)
+    timestep = None if tick_rate is None else FixedTimestep(tick_rate)
+    is_alive = True
     while True:
-        if first:
-            is_alive = True
-            first = False
-        else:
-            key = get_key(gd)
-            is_alive = game.tick(key)
-        colours = game.as_colours()
-        for pigment, locations in colours.items():
-            for coordinate in locations:
-                gd.draw_cell(coordinate[0], coordinate[1], pigment)
+        for coordinate, pigment in game.pop_changed_cells().items():
+            gd.update_cell(coordinate[0], coordinate[1], pigment)
         gd.show_score(game.score)
         gd.end_round()
         if not is_alive:
-            break
+            if agent is not None or not game.rewindable_ticks or not wait_for_rewind(gd, timestep):
+                break
+            game.rewind()
+            is_alive = True
+            continue
+        for _ in range(1 if timestep is None else timestep.wait()):
+            key = get_key(gd) if agent is None else agent(game)
+            if key == REWIND_KEY:
+                game.rewind()
+                continue
+            is_alive = game.tick(key)
+            if not is_alive:
+                break
@@ -2,12 +2,17 @@ import random
 from unittest import TestCase, mock
 
 import snake_main
+import headless
+import replay
+import tournament
 from bomb import Bomb
-from game_parameters import get_random_bomb_data, get_random_apple_data
+from snake import Snake
+from game_manager import GameManager
+from game_parameters import get_random_bomb_data, get_random_apple_data, GameConfig, DEFAULT_CONFIG
 
 
 def mock_random_bomb_data(seed):
-    def wrapped():
+    def wrapped(rng=None, config=None):
         random.seed(seed)
         return get_random_bomb_data()
     return wrapped
@@ -16,7 +21,7 @@ def mock_random_bomb_data(seed):
 def mock_random_apple_data(seed):
     d = 0
     c = [2, 3, 4]
-    def wrapped():
+    def wrapped(rng=None, config=None):
         nonlocal d
         if d == 3:
             d = 0
@@ -43,19 +48,27 @@ class Test(TestCase):
             return v
         return wrapped
 
-    def mock_draw_cell(self):
-        self.cells = []
+    def mock_update_cell(self):
+        self.board = {}
 
         def wrapped(s, x, y, color):
             nonlocal self
-            if self.counter == len(self.cells):
-                self.cells.append({(x, y): color})
+            if color is None:
+                del self.board[(x, y)]
             else:
-                self.cells[self.counter][(x, y)] = color
+                self.board[(x, y)] = color
+        return wrapped
+
+    def mock_end_round(self):
+        self.cells = []
+
+        def wrapped(s):
+            nonlocal self
+            self.cells.append(dict(self.board))
         return wrapped
 
     def test_bomb_manhattan(self):
-        with mock.patch('bomb.get_random_bomb_data', lambda: (2, 2, 2, 2)):
+        with mock.patch('bomb.get_random_bomb_data', lambda rng=None, config=None: (2, 2, 2, 2)):
             bomb = Bomb()
         self.assertEqual([(2, 2)], bomb.bomb_positions())
         bomb.tick()
@@ -67,11 +80,34 @@ class Test(TestCase):
         bomb.tick()
         self.assertEqual({(0, 2), (1, 1), (2, 0), (3, 1), (4, 2), (3, 3), (2, 4), (1, 3)}, set(bomb.bomb_positions()))
 
+    def test_snake_move_delta(self):
+        snake = Snake((0, 0), 'Right', 2)
+        self.assertEqual(((2, 0), (0, 0)), snake.move())
+        snake.grow_by_x(40)
+        snake.turn('Up')
+        for i in range(40):
+            self.assertEqual(((2, i + 1), None), snake.move())
+        self.assertEqual(((2, 41), (1, 0)), snake.move())
+        self.assertEqual([(2, i) for i in range(42)], snake.snake_positions())
+        self.assertEqual(((2, 0), (2, 41)), (snake.tail, snake.head))
+
+    def test_bomb_clipped_positions(self):
+        with mock.patch('bomb.get_random_bomb_data', lambda rng=None, config=None: (1, 5, 3, 1)):
+            bomb = Bomb()
+        self.assertEqual(([(1, 5)], False), bomb.clipped_positions(40, 30))
+        bomb.tick()
+        bomb.tick()
+        self.assertEqual((bomb.bomb_positions(), False), bomb.clipped_positions(40, 30))
+        bomb.tick()
+        self.assertEqual(([(1, 7), (3, 5), (1, 3), (0, 6), (2, 6), (2, 4), (0, 4)], True),
+                         bomb.clipped_positions(40, 30))
+
     @mock.patch('bomb.get_random_bomb_data', mock_random_bomb_data(567))
     @mock.patch('apple.get_random_apple_data', mock_random_apple_data(30))
     def test_full_game(self):
         class GameMock(mock.Mock):
-            draw_cell = self.mock_draw_cell()
+            update_cell = self.mock_update_cell()
+            end_round = self.mock_end_round()
         gd = GameMock()
 
         with mock.patch('snake_main.get_key', self.mock_key_input(
@@ -110,6 +146,382 @@ Black:: [(7, 11), (7, 10), (7, 9)] |Red:: [] |Orange:: [(8, 10), (9, 11), (10, 1
 Black:: [(7, 9), (7, 8)] |Red:: [] |Orange:: [(7, 10), (9, 12), (11, 10), (9, 8), (8, 11), (10, 11), (10, 9), (8, 9)]""",
                          "\n".join(result))
 
+    @mock.patch('bomb.get_random_bomb_data', mock_random_bomb_data(567))
+    @mock.patch('apple.get_random_apple_data', mock_random_apple_data(30))
+    def test_rewind_death(self):
+        class GameMock(mock.Mock):
+            update_cell = self.mock_update_cell()
+            end_round = self.mock_end_round()
+        gd = GameMock()
+
+        keys = [None] * 9 + ['Left', None, None, 'Down'] + [None] * 10 + ['BackSpace']
+        with mock.patch('snake_main.get_key', self.mock_key_input(keys)):
+            snake_main.main_loop(gd)
+        self.assertEqual(26, len(self.cells))
+        self.assertEqual(self.cells[22], self.cells[24])
+        self.assertEqual(self.cells[23], self.cells[25])
+
+    @mock.patch('bomb.get_random_bomb_data', mock_random_bomb_data(567))
+    @mock.patch('apple.get_random_apple_data', mock_random_apple_data(30))
+    def test_headless(self):
+        stats = headless.run_headless()
+        self.assertEqual((20, 0, 'out_of_bounds'), (stats.ticks, stats.score, stats.death_cause))
+        stats = headless.run_headless(max_ticks=5)
+        self.assertEqual((5, None), (stats.ticks, stats.death_cause))
+
+    def test_replay(self):
+        import zlib
+        recording, stats = replay.record_headless(headless.random_agent, seed=1234)
+        loaded = replay.Replay.from_bytes(recording.to_bytes())
+        self.assertEqual((1234, stats.ticks), (loaded.seed, len(loaded)))
+        game = loaded.play()
+        self.assertEqual((stats.score, stats.death_cause), (game.score, game.death_cause))
+        self.assertEqual(loaded.play(10).as_colours(), recording.play(10).as_colours())
+        config = GameConfig(width=12, height=10, number_of_apples=6, initial_position=(2, 1))
+        recording, stats = replay.record_headless(headless.serpentine_agent, seed=1234, config=config)
+        loaded = replay.Replay.from_bytes(recording.to_bytes())
+        self.assertEqual(config, loaded.config)
+        game = loaded.play()
+        self.assertEqual((stats.score, stats.death_cause, config), (game.score, game.death_cause, game.config))
+        unconfigured = replay.UNCONFIGURED_REPLAY_HEADER.pack(replay.UNCONFIGURED_REPLAY_MAGIC, 1234, 0) + \
+            zlib.compress(b'')
+        self.assertEqual(DEFAULT_CONFIG, replay.Replay.from_bytes(unconfigured).config)
+
+    def test_indexed_replay(self):
+        import os
+        import tempfile
+        game = GameManager(1234)
+        boards, scores = [game.as_colours()], [0]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'game.snki')
+            with replay.ReplayWriter(path, game, keyframe_interval=4) as writer:
+                for key in ['Left', None, 'Down', None, None, 'Right', None, None, 'Up', None]:
+                    game.tick(key)
+                    writer.record(key)
+                    boards.append(game.as_colours())
+                    scores.append(game.score)
+            with replay.ReplayReader(path) as reader:
+                self.assertEqual(11, len(reader))
+                for tick in [10, 0, 5, 8, 3]:
+                    expected = {position: colour for colour, positions in boards[tick].items()
+                                for position in positions}
+                    self.assertEqual(expected, reader.cells(tick))
+                    self.assertEqual(scores[tick], reader.score(tick))
+                self.assertEqual(game.as_colours(), reader.game(10).as_colours())
+                self.assertRaises(IndexError, reader.cells, 11)
+            with open(path, 'rb') as file:
+                data = file.read()
+            for broken in [b'', data[:replay.INDEX_HEADER.size - 1], data[:-8] + data[-4:]]:
+                with open(path, 'wb') as file:
+                    file.write(broken)
+                self.assertRaises(ValueError, replay.ReplayReader, path)
+            self.assertRaises(ValueError, replay.ReplayWriter, path, game, 0)
+
+    def test_indexed_replay_relocations(self):
+        import os
+        import tempfile
+        config = GameConfig(width=12, height=10, number_of_apples=6, initial_position=(2, 1))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'game.snki')
+            for seed in range(20):
+                game = GameManager(seed, config)
+                with replay.ReplayWriter(path, game, keyframe_interval=16) as writer:
+                    for _ in range(150):
+                        key = headless.serpentine_agent(game)
+                        alive = game.tick(key)
+                        writer.record(key)
+                        if not alive:
+                            break
+                with replay.ReplayReader(path) as reader:
+                    for tick in range(len(reader)):
+                        expected = {position: colour for colour, positions in reader.game(tick).as_colours().items()
+                                    for position in positions}
+                        self.assertEqual(expected, reader.cells(tick))
+
+    def test_tournament(self):
+        results = tournament.run_tournament({'idle': headless.idle_agent, 'random': headless.random_agent}, 20,
+                                            processes=2)
+        self.assertEqual({'idle', 'random'}, set(results))
+        self.assertEqual(20, sum(results['idle'].death_causes.values()))
+        self.assertEqual(results, tournament.run_tournament({'idle': headless.idle_agent,
+                                                             'random': headless.random_agent}, 20, processes=3))
+
+    def test_profiling(self):
+        game = GameManager(3)
+        profiler = game.enable_profiling()
+        stats = headless.run_headless(headless.serpentine_agent, max_ticks=50, game=game)
+        profile = profiler.to_dict()
+        self.assertEqual(stats.ticks, profile['ticks']['count'])
+        self.assertEqual(stats.ticks, profile['phases_ns']['move']['count'])
+        self.assertEqual(stats.ticks, profile['counters']['relocations']['count'])
+        game.disable_profiling()
+        game.tick(None)
+        self.assertEqual(stats.ticks, profiler.to_dict()['ticks']['count'])
+
+    def test_batch_engine(self):
+        import numpy as np
+        from batch_engine import BatchGameManager, DIRECTIONS
+        games = BatchGameManager(3, seed=1)
+        self.assertEqual([(10, 8), (10, 9), (10, 10)], games.snake_positions(0))
+        games.step(np.array([DIRECTIONS.index('Left'), -1, DIRECTIONS.index('Down')]))
+        self.assertEqual([(10, 9), (10, 10), (9, 10)], games.snake_positions(0))
+        self.assertEqual([(10, 9), (10, 10), (10, 11)], games.snake_positions(1))
+        self.assertEqual([(10, 9), (10, 10), (10, 11)], games.snake_positions(2))
+        for _ in range(30):
+            games.step()
+        self.assertFalse(games.alive.any())
+        self.assertIn(games.death_cause(1), ('out_of_bounds', 'bomb', 'shock_wave'))
+
+    def test_fork(self):
+        game = GameManager(5)
+        snapshot = game.snapshot()
+        keys = ['Left', None, 'Down', None, 'Right', None, None, 'Up'] * 5
+        fork = game.fork()
+        for key in keys:
+            self.assertEqual(game.tick(key), fork.tick(key))
+        self.assertEqual(game.as_colours(), fork.as_colours())
+        self.assertNotEqual(snapshot.as_colours(), game.as_colours())
+        for _ in range(2):
+            game.restore(snapshot)
+            self.assertEqual(snapshot.as_colours(), game.as_colours())
+            self.assertEqual(0, game.score)
+            self.assertTrue(game.tick(None))
+
+    def test_many_apples(self):
+        from game_manager import APPLE_CELL
+        game = GameManager(5, GameConfig(width=60, height=40, number_of_apples=1000, initial_position=(0, 1)))
+        for _ in range(300):
+            if not game.tick(headless.serpentine_agent(game)):
+                break
+        self.assertGreater(game.score, 0)
+        self.assertEqual(1000, len(set(game.apple_positions)))
+        self.assertEqual(game.apple_positions, game.as_colours()['green'])
+        self.assertTrue(all(game.occupant(position) & APPLE_CELL for position in game.apple_positions))
+
+    def test_encode(self):
+        game = GameManager(11, GameConfig(width=12, height=9, number_of_apples=4, initial_position=(2, 1)))
+        for direction in ['Right', None, None, 'Up', 'Left', None]:
+            game.tick(direction)
+        for data in [game.encode(), game.encode(False)]:
+            decoded = GameManager.decode(data)
+            self.assertEqual(game.as_colours(), decoded.as_colours())
+            self.assertEqual((game.score, game.length, game.config), (decoded.score, decoded.length, decoded.config))
+        decoded = GameManager.decode(game.encode())
+        for _ in range(50):
+            self.assertEqual(game.tick(None), decoded.tick(None))
+            self.assertEqual(game.as_colours(), decoded.as_colours())
+        self.assertEqual(game.death_cause, decoded.death_cause)
+        self.assertRaises(ValueError, GameManager.decode, b'not a game')
+        for data in [game.encode(), game.encode(False)]:
+            for size in [4, len(data) - 12, len(data) - 1]:
+                self.assertRaises(ValueError, GameManager.decode, data[:size])
+            self.assertRaises(ValueError, GameManager.decode, data + b'\0')
+
+    def test_encode_relocations(self):
+        config = GameConfig(width=12, height=10, number_of_apples=6, initial_position=(2, 1))
+        for seed in range(20):
+            game = GameManager(seed, config)
+            for _ in range(40):
+                game.tick(headless.serpentine_agent(game))
+            games = [game, game.fork(), GameManager.decode(game.encode())]
+            for _ in range(100):
+                alive = [each.tick(headless.serpentine_agent(each)) for each in games]
+                self.assertEqual(1, len(set(alive)))
+                self.assertEqual(1, len({str(each.as_colours()) for each in games}))
+                if not alive[0]:
+                    break
+
+    def test_board(self):
+        from board import Board, EMPTY_CELL
+        rng = random.Random(4)
+        board = Board(70, 65)
+        for _ in range(6000):
+            (board.mark if rng.random() < 0.6 else board.unmark)(rng.randrange(len(board)), rng.choice([1, 2, 4]))
+        free = [cell for cell, owners in enumerate(board.cells) if owners == EMPTY_CELL]
+        self.assertEqual(len(free), board.free_count)
+        for k in [0, 1, len(free) // 2, len(free) - 1]:
+            with mock.patch.object(rng, 'randrange', return_value=k):
+                self.assertEqual(free[k], board.random_free_cell(rng))
+        copy = board.copy()
+        copy.mark(free[0], 1)
+        self.assertEqual((len(free), len(free) - 1), (board.free_count, copy.free_count))
+
+    def test_rewind(self):
+        game = GameManager(11, GameConfig(width=12, height=9, number_of_apples=4, initial_position=(2, 1)))
+        game.enable_rewind(5)
+        states = []
+        for direction in ['Right', None, None, 'Up', 'Left', None, 'Down']:
+            states.append((game.as_colours(), game.score, game.length))
+            game.tick(direction)
+        game.pop_changed_cells()
+        self.assertEqual(2, game.rewind(2))
+        self.assertEqual(states[-2], (game.as_colours(), game.score, game.length))
+        changes = game.pop_changed_cells()
+        self.assertIn(states[-1][0]['black'][0], changes)
+        self.assertEqual(3, game.rewind(10))
+        self.assertEqual(0, game.rewindable_ticks)
+        replayed = GameManager(11, game.config)
+        replayed.tick('Right')
+        replayed.tick(None)
+        self.assertEqual(replayed.as_colours(), game.as_colours())
+        game.tick(None)
+        replayed.tick(None)
+        self.assertEqual(replayed.as_colours(), game.as_colours())
+
+    def test_rewind_relocations(self):
+        config = GameConfig(width=12, height=10, number_of_apples=6, initial_position=(2, 1))
+        for seed in range(20):
+            game = GameManager(seed, config)
+            game.enable_rewind(50)
+            keys, boards = [], []
+            for _ in range(80):
+                keys.append(headless.serpentine_agent(game))
+                alive = game.tick(keys[-1])
+                boards.append(game.as_colours())
+                if not alive:
+                    break
+            first = len(boards) - game.rewind(len(boards) // 2)
+            for key, board in zip(keys[first:], boards[first:]):
+                game.tick(key)
+                self.assertEqual(board, game.as_colours())
+
+    def test_autopilot(self):
+        from autopilot import Autopilot
+        stats = [headless.run_headless(Autopilot(), 500, GameManager(seed)) for seed in range(5)]
+        self.assertGreater(sum(s.score for s in stats), 5 * 20)
+        self.assertNotIn('out_of_bounds', [s.death_cause for s in stats])
+
+    def test_multi_game(self):
+        from multi_game import MultiGameManager, run_match
+        from autopilot import Autopilot
+        game = MultiGameManager(2, 1, GameConfig(width=12, bomb_time_range=(50, 50)))
+        self.assertEqual([(8, 8), (8, 9), (8, 10)], game.snake_positions(1))
+        self.assertTrue(game.tick(['Right', 'Left']))
+        self.assertEqual((0, 1), (game.snake_at((5, 10)), game.snake_at((8, 10))))
+        self.assertFalse(game.tick([None, None]))
+        self.assertEqual(['head_to_head', 'head_to_head'], game.death_causes)
+        self.assertIsNone(game.snake_at((5, 10)))
+        full = MultiGameManager(3, 1, GameConfig(width=3, height=3, number_of_apples=1, initial_position=(0, 0)))
+        self.assertEqual([], full.as_colours()['red'])
+        self.assertFalse(full.tick([None, None, None]))
+        stats = run_match([Autopilot(), Autopilot(), Autopilot()], 100, MultiGameManager(3, 2))
+        self.assertEqual(3, len(stats.scores))
+
+    def test_server(self):
+        import asyncio
+        import json
+        from server import GameServer, play_client
+
+        async def play():
+            server = GameServer(round_time=0.005, seed=3)
+            host, port = await server.start()
+            results = await asyncio.gather(*[play_client(host, port) for _ in range(20)])
+            reader, writer = await asyncio.open_connection(host, port)
+            self.assertEqual('start', json.loads(await reader.readline())['type'])
+            await asyncio.wait_for(server.close(), 5)
+            await asyncio.wait_for(reader.read(), 5)
+            self.assertTrue(reader.at_eof())
+            writer.close()
+            return results
+        for messages in asyncio.run(play()):
+            self.assertEqual(['start', 'tick'], [m['type'] for m in messages[:2]])
+            self.assertEqual('end', messages[-1]['type'])
+            self.assertEqual(len(messages) - 3, messages[-2]['tick'])
+            game = GameManager(messages[0]['seed'])
+            self.assertEqual(sum(len(positions) for positions in game.as_colours().values()),
+                             len(messages[1]['cells']))
+
+    def test_timestep(self):
+        from timestep import FixedTimestep
+        now = [0.0]
+
+        def sleep(seconds):
+            now[0] += seconds
+        timestep = FixedTimestep(4, 5, lambda: now[0], sleep)
+        self.assertEqual(1, timestep.wait())
+        self.assertEqual(0.25, now[0])
+        now[0] += 0.6
+        self.assertEqual(2, timestep.wait())
+        self.assertEqual(1, timestep.wait())
+        self.assertEqual(1.0, now[0])
+        now[0] += 5
+        self.assertEqual((5, 15), (timestep.wait(), timestep.dropped_ticks))
+        self.assertEqual(1, timestep.wait())
+        self.assertEqual(6.25, now[0])
+
+    def test_rasterizer(self):
+        import os
+        import tempfile
+        import numpy as np
+        from rasterizer import colour_codes, board_codes, rasterize, FrameWriter, PALETTE, SNAKE, BOMB
+        from batch_engine import BatchGameManager
+        frame = rasterize(colour_codes(GameManager(1).as_colours(), 40, 30), 2)
+        self.assertEqual((60, 80, 3), frame.shape)
+        self.assertEqual(list(PALETTE[SNAKE]), list(frame[2 * (29 - 10), 2 * 10 + 1]))
+        games = BatchGameManager(3, seed=1)
+        codes = board_codes(games.boards, games.bomb_time <= 0, 40, 30)
+        self.assertEqual((3, 30, 40), codes.shape)
+        self.assertEqual(BOMB, codes[0, 29 - games.bomb_y[0], games.bomb_x[0]])
+        path = os.path.join(tempfile.mkdtemp(), 'frames.npy')
+        with FrameWriter(path) as writer:
+            writer.write(rasterize(codes, 3))
+            writer.write(rasterize(codes[0], 3))
+        frames = np.load(path)
+        self.assertEqual((4, 90, 120, 3), frames.shape)
+        self.assertTrue((frames[:3] == rasterize(codes, 3)).all() and (frames[3] == frames[0]).all())
+
+    def test_config(self):
+        config = GameConfig(width=2000, height=2000, number_of_apples=50, initial_position=(0, 1))
+        game = GameManager(3, config)
+        self.assertEqual(config, game.config)
+        for _ in range(1000):
+            self.assertTrue(game.tick(headless.serpentine_agent(game)))
+        self.assertEqual(50, len(game.as_colours()['green']))
+        self.assertEqual(51, config.minimum_length)
+        small = GameManager(3, GameConfig(width=4, height=4, number_of_apples=1, initial_position=(0, 0),
+                                          initial_length=1, bomb_radius_range=(0, 0)))
+        self.assertIsNotNone(headless.run_headless(headless.serpentine_agent, 100, small).death_cause)
+
+    def test_environment(self):
+        from environment import SnakeEnv, HEAD_CHANNEL, BODY_CHANNEL
+        env = SnakeEnv(max_ticks=3)
+        observation = env.reset(seed=7)
+        self.assertEqual(1, observation[HEAD_CHANNEL, 10, 10])
+        self.assertEqual(3, observation[BODY_CHANNEL].sum())
+        result, reward, done, truncated, info = env.step(-1)
+        self.assertIs(observation, result)
+        self.assertEqual((1, 0), (observation[HEAD_CHANNEL, 11, 10], observation[HEAD_CHANNEL, 10, 10]))
+        self.assertEqual((0, 0), (observation[BODY_CHANNEL, 8, 10], observation[BODY_CHANNEL].sum() - 3))
+        self.assertEqual((0.0, False, False, 1), (reward, done, truncated, info['ticks']))
+        env.step(-1)
+        self.assertTrue(env.step(-1)[3])
+
+    def test_vector_env(self):
+        import multiprocessing
+        from vector_env import VectorEnv
+        from environment import SnakeEnv
+        with VectorEnv(3, processes=2, seed=5, max_ticks=4) as env:
+            observations = env.reset().copy()
+            single = SnakeEnv(random.Random(5).getrandbits(63), max_ticks=4)
+            self.assertTrue((single.reset() == observations[0]).all())
+            for _ in range(4):
+                observations, rewards, terminated, truncated, info = env.step([0, 0, 0])
+            self.assertEqual([True] * 3, list(truncated))
+            self.assertEqual([4] * 3, list(info['ticks']))
+            self.assertTrue((single.reset() == observations[0]).all())
+        with VectorEnv(2, processes=2) as env:
+            self.assertRaises(RuntimeError, env.step)
+            for worker in multiprocessing.active_children():
+                worker.kill()
+                worker.join()
+
+    def test_lazy_imports(self):
+        import subprocess
+        import sys
+        code = "import sys, snake_main, headless, replay, tournament; print('tkinter' in sys.modules)"
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+        self.assertEqual('False', output.strip())
+
     def test_ex(self):
         a = [(0, {(10, 8): 'black', (10, 9): 'black', (10, 10): 'black', (2, 19): 'green', (7, 10): 'green', (7, 2): 'green', (28, 14): 'red'}), (0, {(10, 9): 'black', (10, 10): 'black', (10, 11): 'black', (2, 19): 'green', (7, 10): 'green', (7, 2): 'green', (28, 14): 'red'}), (0, {(10, 10): 'black', (10, 11): 'black', (10, 12): 'black', (2, 19): 'green', (7, 10): 'green', (7, 2): 'green', (28, 14): 'red'}), (0, {(10, 11): 'black', (10, 12): 'black', (10, 13): 'black', (2, 19): 'green', (7, 10): 'green', (7, 2): 'green', (28, 14): 'red'}), (0, {(10, 12): 'black', (10, 13): 'black', (11, 13): 'black', (2, 19): 'green', (7, 10): 'green', (7, 2): 'green', (28, 14): 'red'}), (0, {(10, 13): 'black', (11, 13): 'black', (12, 13): 'black', (2, 19): 'green', (7, 10): 'green', (7, 2): 'green', (28, 14): 'red'}), (0, {(11, 13): 'black', (12, 13): 'black', (12, 14): 'black', (2, 19): 'green', (7, 10): 'green', (7, 2): 'green', (28, 14): 'red'}), (0, {(12, 13): 'black', (12, 14): 'black', (11, 14): 'black', (2, 19): 'green', (7, 10): 'green', (7, 2): 'green', (28, 14): 'red'}), (0, {(12, 14): 'black', (11, 14): 'black', (10, 14): 'black', (2, 19): 'green', (7, 10): 'green', (7, 2): 'green', (28, 14): 'red'}), (0, {(11, 14): 'black', (10, 14): 'black', (9, 14): 'black', (2, 19): 'green', (7, 10): 'green', (7, 2): 'green', (28, 14): 'red'}), (0, {(10, 14): 'black', (9, 14): 'black', (8, 14): 'black', (2, 19): 'green', (7, 10): 'green', (7, 2): 'green', (28, 14): 'red'}), (0, {(9, 14): 'black', (8, 14): 'black', (8, 15): 'black', (2, 19): 'green', (7, 10): 'green', (7, 2): 'green', (28, 14): 'red'}), (0, {(8, 14): 'black', (8, 15): 'black', (9, 15): 'black', (2, 19): 'green', (7, 10): 'green', (7, 2): 'green', (28, 14): 'red'}), (0, {(8, 15): 'black', (9, 15): 'black', (9, 14): 'black', (2, 19): 'green', (7, 10): 'green', (7, 2): 'green', (28, 14): 'red'}), (0, {(9, 15): 'black', (9, 14): 'black', (9, 13): 'black', (2, 19): 'green', (7, 10): 'green', (7, 2): 'green', (28, 14): 'red'}), (0, {(9, 14): 'black', (9, 13): 'black', (9, 12): 'black', (2, 19): 'green', (7, 10): 'green', (7, 2): 'green', (28, 14): 'red'}), (0, {(9, 13): 'black', (9, 12): 'black', (9, 11): 'black', (2, 19): 'green', (7, 10): 'green', (7, 2): 'green', (28, 14): 'red'}), (0, {(9, 12): 'black', (9, 11): 'black', (9, 10): 'black', (2, 19): 'green', (7, 10): 'green', (7, 2): 'green', (28, 14): 'red'}), (0, {(9, 11): 'black', (9, 10): 'black', (9, 9): 'black', (2, 19): 'green', (7, 10): 'green', (7, 2): 'green', (28, 14): 'red'}), (0, {(9, 10): 'black', (9, 9): 'black', (9, 8): 'black', (2, 19): 'green', (7, 10): 'green', (7, 2): 'green', (28, 14): 'red'}), (0, {(9, 9): 'black', (9, 8): 'black', (9, 7): 'black', (2, 19): 'green', (7, 10): 'green', (7, 2): 'green', (28, 14): 'red'}), (0, {(9, 8): 'black', (9, 7): 'black', (9, 6): 'black', (2, 19): 'green', (7, 10): 'green', (7, 2): 'green', (28, 14): 'red'}), (0, {(9, 7): 'black', (9, 6): 'black', (9, 5): 'black', (2, 19): 'green', (7, 10): 'green', (7, 2): 'green', (28, 14): 'red'}), (0, {(9, 6): 'black', (9, 5): 'black', (9, 4): 'black', (2, 19): 'green', (7, 10): 'green', (7, 2): 'green', (28, 14): 'red'}), (0, {(9, 5): 'black', (9, 4): 'black', (9, 3): 'black', (2, 19): 'green', (7, 10): 'green', (7, 2): 'green', (28, 14): 'red'}), (0, {(9, 4): 'black', (9, 3): 'black', (9, 2): 'black', (2, 19): 'green', (7, 10): 'green', (7, 2): 'green', (28, 14): 'red'}), (0, {(9, 3): 'black', (9, 2): 'black', (9, 1): 'black', (2, 19): 'green', (7, 10): 'green', (7, 2): 'green', (28, 14): 'red'}), (0, {(9, 2): 'black', (9, 1): 'black', (9, 0): 'black', (2, 19): 'green', (7, 10): 'green', (7, 2): 'green', (28, 14): 'orange'}), (0, {(9, 1): 'black', (9, 0): 'black', (2, 19): 'green', (7, 10): 'green', (7, 2): 'green', (27, 14): 'orange', (28, 15): 'orange', (29, 14): 'orange', (28, 13): 'orange'})]
         x = [(0, {(10, 10): 'black', (10, 9): 'black', (10, 8): 'black', (28, 14): 'red', (2, 19): 'green', (7, 10): 'green', (7, 2): 'green'}), (0, {(2, 19): 'green', (7, 10): 'green', (7, 2): 'green', (9, 10): 'black', (10, 10): 'black', (10, 9): 'black', (28, 14): 'red'}), (0, {(2, 19): 'green', (7, 10): 'green', (7, 2): 'green', (8, 10): 'black', (9, 10): 'black', (10, 10): 'black', (28, 14): 'red'}), (4, {(2, 19): 'green', (7, 2): 'green', (29, 1): 'green', (7, 10): 'black', (8, 10): 'black', (9, 10): 'black', (28, 14): 'red'}), (4, {(2, 19): 'green', (7, 2): 'green', (29, 1): 'green', (7, 9): 'black', (7, 10): 'black', (8, 10): 'black', (9, 10): 'black', (28, 14): 'red'}), (4, {(2, 19): 'green', (7, 2): 'green', (29, 1): 'green', (8, 9): 'black', (7, 9): 'black', (7, 10): 'black', (8, 10): 'black', (9, 10): 'black', (28, 14): 'red'}), (4, {(2, 19): 'green', (7, 2): 'green', (29, 1): 'green', (9, 9): 'black', (8, 9): 'black', (7, 9): 'black', (7, 10): 'black', (8, 10): 'black', (9, 10): 'black', (28, 14): 'red'}), (4, {(2, 19): 'green', (7, 2): 'green', (29, 1): 'green', (9, 10): 'black', (9, 9): 'black', (8, 9): 'black', (7, 9): 'black', (7, 10): 'black', (8, 10): 'black', (28, 14): 'red'}), (4, {(2, 19): 'green', (7, 2): 'green', (29, 1): 'green', (8, 10): 'black', (9, 10): 'black', (9, 9): 'black', (8, 9): 'black', (7, 9): 'black', (7, 10): 'black', (28, 14): 'red'}), (4, {(2, 19): 'green', (7, 2): 'green', (29, 1): 'green', (7, 10): 'black', (8, 10): 'black', (9, 10): 'black', (9, 9): 'black', (8, 9): 'black', (7, 9): 'black', (28, 14): 'red'}), (4, {(2, 19): 'green', (7, 2): 'green', (29, 1): 'green', (6, 10): 'black', (7, 10): 'black', (8, 10): 'black', (9, 10): 'black', (9, 9): 'black', (8, 9): 'black', (28, 14): 'red'}), (4, {(2, 19): 'green', (7, 2): 'green', (29, 1): 'green', (5, 10): 'black', (6, 10): 'black', (7, 10): 'black', (8, 10): 'black', (9, 10): 'black', (9, 9): 'black', (28, 14): 'red'}), (4, {(2, 19): 'green', (7, 2): 'green', (29, 1): 'green', (5, 11): 'black', (5, 10): 'black', (6, 10): 'black', (7, 10): 'black', (8, 10): 'black', (9, 10): 'black', (28, 14): 'red'}), (4, {(2, 19): 'green', (7, 2): 'green', (29, 1): 'green', (6, 11): 'black', (5, 11): 'black', (5, 10): 'black', (6, 10): 'black', (7, 10): 'black', (8, 10): 'black', (28, 14): 'red'}), (4, {(2, 19): 'green', (7, 2): 'green', (29, 1): 'green', (6, 10): 'black', (6, 11): 'black', (5, 11): 'black', (5, 10): 'black', (7, 10): 'black', (28, 14): 'red'})]
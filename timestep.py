@@ -0,0 +1,58 @@
+##########################################################################################
+# FILE : timestep.py
+# WRITER : Yonatan Zhenin , Yonatanzh , 208623397, Yahel Uffenheimer, yahelo, 318377751
+# EXERCISE : intro2cs1 ex10 2021
+# DESCRIPTION: Fixed timestep scheduler that keeps the game clock when drawing falls behind.
+##########################################################################################
+import time
+from typing import Callable
+
+MAX_CATCH_UP = 5
+
+
+class FixedTimestep:
+    """
+    Schedules ticks at a fixed rate. The tick times are counted from the start, so they don't drift, and when the
+    caller falls behind (e.g a slow redraw) the missed ticks are all reported at once, so the game keeps time and
+    the frames in between are skipped. Only when it falls behind by more than max_catch_up ticks is the rest of the
+    time dropped, so a long stall doesn't make the game run in a burst afterwards.
+    """
+    def __init__(self, tick_rate: float, max_catch_up: int = MAX_CATCH_UP,
+                 clock: Callable[[], float] = time.perf_counter, sleep: Callable[[float], None] = time.sleep):
+        """
+        Constructor for the FixedTimestep class. The first tick is due one period after it's created.
+        :param tick_rate: Ticks per second.
+        :param max_catch_up: The maximum amount of ticks wait returns.
+        :param clock: Function that returns the current time in seconds.
+        :param sleep: Function that sleeps for the given amount of seconds.
+        """
+        self.__period = 1 / tick_rate
+        self.__max_catch_up = max_catch_up
+        self.__clock = clock
+        self.__sleep = sleep
+        self.__next_tick = clock() + self.__period
+        self.__dropped_ticks = 0
+
+    def wait(self) -> int:
+        """
+        Sleeps until the next tick is due.
+        :return: The amount of ticks that are due, at least 1 and at most max_catch_up.
+        """
+        now = self.__clock()
+        while now < self.__next_tick:
+            self.__sleep(self.__next_tick - now)
+            now = self.__clock()
+        due = int((now - self.__next_tick) / self.__period) + 1
+        self.__next_tick += due * self.__period
+        if due > self.__max_catch_up:
+            self.__dropped_ticks += due - self.__max_catch_up
+            due = self.__max_catch_up
+        return due
+
+    @property
+    def period(self) -> float:
+        return self.__period
+
+    @property
+    def dropped_ticks(self) -> int:
+        return self.__dropped_ticks
@@ -0,0 +1,119 @@
+##########################################################################################
+# FILE : tournament.py
+# WRITER : Yonatan Zhenin , Yonatanzh , 208623397, Yahel Uffenheimer, yahelo, 318377751
+# EXERCISE : intro2cs1 ex10 2021
+# DESCRIPTION: Runs many seeded headless games per agent on all cores and compares the results.
+##########################################################################################
+import multiprocessing
+import random
+import statistics
+from typing import Dict, List, Optional, Tuple, NamedTuple
+
+from game_manager import GameManager
+from headless import Agent, GameStats, run_headless, idle_agent, random_agent
+from autopilot import Autopilot
+
+
+class AgentResults(NamedTuple):
+    """
+    Aggregated results of all the games an agent played.
+    """
+    games: int
+    mean_score: float
+    score_stdev: float
+    score_percentiles: Tuple[float, float, float]
+    max_score: int
+    mean_ticks: float
+    tick_percentiles: Tuple[float, float, float]
+    death_causes: Dict[Optional[str], int]
+
+
+def _play_games(task: Tuple[str, Agent, List[int], Optional[int]]) -> Tuple[str, List[GameStats]]:
+    """
+    Internal: plays a chunk of games of a single agent, runs inside a worker process.
+    :param task: The agents name, the agent, the seeds of the games and the maximum amount of ticks per game.
+    :return: The agents name and the GameStats of every game played.
+    """
+    name, agent, seeds, max_ticks = task
+    stats = []
+    for seed in seeds:
+        # agents that use the random module get the same stream for the same game in every run.
+        random.seed(name + ":" + str(seed))
+        stats.append(run_headless(agent, max_ticks, GameManager(seed)))
+    return name, stats
+
+
+def _quartiles(values: List[float]) -> Tuple[float, float, float]:
+    """
+    Internal: calculates the 25th, 50th and 75th percentiles of the values.
+    :param values: The values, at least one.
+    :return: The three percentiles.
+    """
+    if len(values) == 1:
+        return values[0], values[0], values[0]
+    q1, q2, q3 = statistics.quantiles(values, n=4)
+    return q1, q2, q3
+
+
+def aggregate(stats: List[GameStats]) -> AgentResults:
+    """
+    Aggregates the results of several games.
+    :param stats: GameStats of the games, at least one.
+    :return: AgentResults of the games.
+    """
+    scores = [s.score for s in stats]
+    ticks = [s.ticks for s in stats]
+    causes: Dict[Optional[str], int] = {}
+    for s in stats:
+        causes[s.death_cause] = causes.get(s.death_cause, 0) + 1
+    return AgentResults(
+        len(stats), statistics.fmean(scores), statistics.pstdev(scores), _quartiles(scores), max(scores),
+        statistics.fmean(ticks), _quartiles(ticks), causes)
+
+
+def run_tournament(agents: Dict[str, Agent], games_per_agent: int, first_seed: int = 0,
+                   max_ticks: Optional[int] = None, processes: Optional[int] = None) -> Dict[str, AgentResults]:
+    """
+    Plays games_per_agent games with every agent, using a pool of processes. Every agent plays the games with the
+    same seeds, first_seed to first_seed + games_per_agent - 1, so agents are compared on the same boards.
+    :param agents: Dictionary of names as keys and agents as values. Agents must be picklable, i.e defined at the
+    top level of a module.
+    :param games_per_agent: The amount of games every agent plays.
+    :param first_seed: The seed of the first game.
+    :param max_ticks: Maximum amount of ticks per game, None to play until the game ends.
+    :param processes: The amount of worker processes, all cores if None.
+    :return: Dictionary of agent names as keys and their AgentResults as values.
+    """
+    processes = processes or multiprocessing.cpu_count()
+    chunk_size = max(1, games_per_agent // (processes * 4))
+    seeds = list(range(first_seed, first_seed + games_per_agent))
+    tasks = [(name, agent, seeds[i:i + chunk_size], max_ticks)
+             for name, agent in agents.items() for i in range(0, games_per_agent, chunk_size)]
+    stats: Dict[str, List[GameStats]] = {name: [] for name in agents}
+    with multiprocessing.Pool(processes) as pool:
+        for name, chunk in pool.imap_unordered(_play_games, tasks):
+            stats[name].extend(chunk)
+    return {name: aggregate(agent_stats) for name, agent_stats in stats.items()}
+
+
+def format_results(results: Dict[str, AgentResults]) -> str:
+    """
+    Creates a human readable table of the tournament results.
+    :param results: The results returned by run_tournament.
+    :return: The table as a string.
+    """
+    lines = ["%-12s %7s %8s %8s %22s %10s %10s" % (
+        "agent", "games", "mean", "stdev", "score q1/q2/q3", "max", "mean ticks")]
+    for name, r in results.items():
+        lines.append("%-12s %7d %8.2f %8.2f %22s %10d %10.1f" % (
+            name, r.games, r.mean_score, r.score_stdev, "/".join("%.1f" % q for q in r.score_percentiles),
+            r.max_score, r.mean_ticks))
+        lines.append("%-12s deaths: %s" % ("", ", ".join(str(k) + "=" + str(v) for k, v in r.death_causes.items())))
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import sys
+    number_of_games = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    print(format_results(run_tournament({'idle': idle_agent, 'random': random_agent, 'autopilot': Autopilot()},
+                                        number_of_games)))
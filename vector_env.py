@@ -0,0 +1,219 @@
+##########################################################################################
+# FILE : vector_env.py
+# WRITER : Yonatan Zhenin , Yonatanzh , 208623397, Yahel Uffenheimer, yahelo, 318377751
+# EXERCISE : intro2cs1 ex10 2021
+# DESCRIPTION: Vector environment that steps many games in worker processes through shared memory.
+##########################################################################################
+import multiprocessing
+import random
+from multiprocessing import shared_memory
+from multiprocessing.connection import Connection
+from typing import Optional, Tuple, List, Dict, Any
+
+import numpy as np
+
+from game_parameters import GameConfig, DEFAULT_CONFIG
+from environment import SnakeEnv, NUMBER_OF_CHANNELS
+from batch_engine import NO_ACTION
+
+STEP, RESET, CLOSE = 'step', 'reset', 'close'
+# the arrays in the shared memory, in order. the observations are added in front of them.
+_FIELDS: Tuple[Tuple[str, Any], ...] = (
+    ('rewards', np.float32),
+    ('scores', np.int32),
+    ('ticks', np.int32),
+    ('actions', np.int8),
+    ('terminated', np.bool_),
+    ('truncated', np.bool_),
+)
+
+
+def _layout(number_of_envs: int, config: GameConfig) -> Tuple[Dict[str, Tuple[Tuple[int, ...], Any, int]], int]:
+    """
+    Internal: places the arrays of a vector environment in a block of shared memory.
+    :param number_of_envs: The amount of environments.
+    :param config: The parameters of the games.
+    :return: Dictionary of array names as keys and their shapes, types and offsets as values, and the size of the
+    block in bytes.
+    """
+    fields = (('observations', np.uint8, (number_of_envs, NUMBER_OF_CHANNELS, config.height, config.width)),) + \
+        tuple((name, dtype, (number_of_envs,)) for name, dtype in _FIELDS)
+    layout, offset = {}, 0
+    for name, dtype, shape in fields:
+        layout[name] = (shape, dtype, offset)
+        offset += -(-int(np.prod(shape)) * np.dtype(dtype).itemsize // 8) * 8
+    return layout, offset
+
+
+def _arrays(block: shared_memory.SharedMemory, number_of_envs: int, config: GameConfig) -> Dict[str, np.ndarray]:
+    """
+    Internal: creates the arrays of a vector environment over a block of shared memory.
+    :param block: The shared memory.
+    :param number_of_envs: The amount of environments.
+    :param config: The parameters of the games.
+    :return: Dictionary of array names as keys and arrays as values.
+    """
+    return {name: np.ndarray(shape, dtype, block.buf, offset)
+            for name, (shape, dtype, offset) in _layout(number_of_envs, config)[0].items()}
+
+
+def _run_worker(connection: Connection, block_name: str, number_of_envs: int, first: int, seeds: List[int],
+                max_ticks: Optional[int], death_penalty: float, config: GameConfig) -> None:
+    """
+    Internal: steps a slice of the environments, runs inside a worker process until it's told to close.
+    Environments whose game ended are reset right away, so their observation is already of the next game.
+    :param connection: Pipe to the VectorEnv, that sends a command and waits for None every step.
+    :param block_name: The name of the shared memory.
+    :param number_of_envs: The amount of environments of the VectorEnv.
+    :param first: The index of the first environment of the slice.
+    :param seeds: The seeds of the environments of the slice.
+    :param max_ticks: Maximum amount of ticks per game, None to play until the game ends.
+    :param death_penalty: Value subtracted from the reward of the tick the snake died in.
+    :param config: The parameters of the games.
+    :return: None.
+    """
+    block = shared_memory.SharedMemory(block_name)
+    arrays = _arrays(block, number_of_envs, config)
+    observations, actions, rewards = arrays['observations'], arrays['actions'], arrays['rewards']
+    terminated, truncated, scores, ticks = arrays['terminated'], arrays['truncated'], arrays['scores'], arrays['ticks']
+    envs = [SnakeEnv(seed, max_ticks, death_penalty, config=config, observation=observations[first + i])
+            for i, seed in enumerate(seeds)]
+    try:
+        while True:
+            command = connection.recv()
+            if command == STEP:
+                for i, env in enumerate(envs, first):
+                    _, rewards[i], terminated[i], truncated[i], info = env.step(int(actions[i]))
+                    scores[i], ticks[i] = info['score'], info['ticks']
+                    if terminated[i] or truncated[i]:
+                        env.reset()
+            elif command == RESET:
+                for i, env in enumerate(envs, first):
+                    env.reset()
+                rewards[first:first + len(envs)] = 0
+                terminated[first:first + len(envs)] = truncated[first:first + len(envs)] = False
+                scores[first:first + len(envs)] = ticks[first:first + len(envs)] = 0
+            else:
+                break
+            connection.send(None)
+    finally:
+        del observations, actions, rewards, terminated, truncated, scores, ticks, arrays, envs
+        block.close()
+
+
+class VectorEnv:
+    """
+    Steps number_of_envs SnakeEnv environments, split between worker processes. The actions, observations, rewards
+    and flags are all in shared memory, so a step only sends a short command to every worker, and the returned
+    arrays are views of the shared memory that the next step overwrites. Copy them if they need to outlive it.
+    Environments whose game ended are reset within the same step: the observation returned for them is the first of
+    the next game, and scores and ticks are those of the game that ended.
+    """
+    def __init__(self, number_of_envs: int, processes: Optional[int] = None, seed: Optional[int] = None,
+                 max_ticks: Optional[int] = None, death_penalty: float = 0.0, config: Optional[GameConfig] = None):
+        """
+        Constructor for the VectorEnv class, starts the worker processes.
+        :param number_of_envs: The amount of environments.
+        :param processes: The amount of worker processes, all cores if None.
+        :param seed: Seed that the seeds of the environments are drawn from, None for an unpredictable seed. The
+        games don't depend on the amount of processes.
+        :param max_ticks: Maximum amount of ticks per game, None to play until the game ends.
+        :param death_penalty: Value subtracted from the reward of the tick the snake died in.
+        :param config: The parameters of the games, DEFAULT_CONFIG if None.
+        """
+        self.__config = config or DEFAULT_CONFIG
+        self.__number_of_envs = number_of_envs
+        self.__block = shared_memory.SharedMemory(create=True, size=_layout(number_of_envs, self.__config)[1])
+        self.__arrays = _arrays(self.__block, number_of_envs, self.__config)
+        seeds = random.Random(seed)
+        env_seeds = [seeds.getrandbits(63) for _ in range(number_of_envs)]
+        processes = max(1, min(processes or multiprocessing.cpu_count(), number_of_envs))
+        bounds = [number_of_envs * i // processes for i in range(processes + 1)]
+        self.__connections: List[Connection] = []
+        self.__workers: List[multiprocessing.Process] = []
+        self.__is_reset = False
+        for first, stop in zip(bounds, bounds[1:]):
+            connection, worker_connection = multiprocessing.Pipe()
+            worker = multiprocessing.Process(target=_run_worker, daemon=True, args=(
+                worker_connection, self.__block.name, number_of_envs, first, env_seeds[first:stop], max_ticks,
+                death_penalty, self.__config))
+            worker.start()
+            worker_connection.close()
+            self.__connections.append(connection)
+            self.__workers.append(worker)
+
+    def __command(self, command: str) -> None:
+        """
+        Internal: sends a command to every worker, and waits for all of them to carry it out.
+        :param command: The command.
+        :return: None.
+        """
+        for connection in self.__connections:
+            connection.send(command)
+        for connection in self.__connections:
+            connection.recv()
+
+    def reset(self) -> np.ndarray:
+        """
+        Starts a new game in every environment.
+        :return: The observations, of shape (number_of_envs, NUMBER_OF_CHANNELS, height, width).
+        """
+        self.__command(RESET)
+        self.__is_reset = True
+        return self.__arrays['observations']
+
+    def step(self, actions: Optional[np.ndarray] = None) -> \
+            Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Plays one tick in every environment.
+        :param actions: Index into DIRECTIONS of the key pressed in every environment, NO_ACTION for no key. None
+        if no key is pressed in any of them.
+        :return: The observations, the rewards, whether each game ended, whether each game was cut short by
+        max_ticks, and a dictionary with the scores and ticks of every game.
+        """
+        if not self.__is_reset:
+            raise RuntimeError("reset must be called before step")
+        self.__arrays['actions'][:] = NO_ACTION if actions is None else actions
+        self.__command(STEP)
+        arrays = self.__arrays
+        return arrays['observations'], arrays['rewards'], arrays['terminated'], arrays['truncated'], \
+            {'score': arrays['scores'], 'ticks': arrays['ticks']}
+
+    def close(self) -> None:
+        """
+        Stops the worker processes and frees the shared memory, also if some of the workers already died.
+        :return: None.
+        """
+        if not self.__workers:
+            return
+        try:
+            for connection in self.__connections:
+                try:
+                    connection.send(CLOSE)
+                except OSError:
+                    pass
+                connection.close()
+            for worker in self.__workers:
+                worker.join()
+        finally:
+            self.__workers, self.__connections = [], []
+            self.__arrays = {}
+            self.__block.close()
+            self.__block.unlink()
+
+    def __enter__(self) -> 'VectorEnv':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.__number_of_envs
+
+    @property
+    def config(self) -> GameConfig:
+        return self.__config
+
+    @property
+    def number_of_processes(self) -> int:
+        return len(self.__workers)